@@ -0,0 +1,95 @@
+#
+# Benchmark dependency analysis of a module by parsing versus scanning.  For
+# each line count, we generate a module with a few imports followed by that
+# many lines of table data, track it, and time analyses of its source.
+#
+
+from argparse import ArgumentParser
+import statistics
+import sys
+import tempfile
+import time
+import liveimport
+
+
+_HEADER = '''"""
+Generated table module.
+"""
+import math
+import os.path as osp
+from collections import (OrderedDict,
+                         defaultdict)
+
+'''
+
+#
+# Create a module with lines lines of table data under root, and return its
+# name.
+#
+
+def _generate(root:str, lines:int) -> str:
+    name = f"table{lines}"
+    with open(f"{root}/{name}.py","w") as f:
+        f.write(_HEADER)
+        f.write("TABLE = [\n")
+        for i in range(lines):
+            f.write(f"    ({i}, {i * 0.5!r}, 'label{i}', [{i}, {i+1}]),\n")
+        f.write("]\n")
+    return name
+
+
+def _time_analysis(info:liveimport._core._ModuleInfo, source:bytes,
+                   repeat:int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        info.analyze_dependencies(source)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+
+    parser = ArgumentParser(
+        description="Benchmark dependency analysis by parsing and scanning")
+
+    parser.add_argument("-lines", type=int, nargs='+',
+        default=[100, 1000, 10000, 100000],
+        help="Lines of table data (default: 100 1000 10000 100000)")
+
+    parser.add_argument("-repeat", type=int, default=10,
+        help="Analyses to time for each configuration (default: 10)")
+
+    args = parser.parse_args()
+
+    print()
+    print("Median milliseconds per analysis")
+    print()
+    print("lines".rjust(8) + "parse".rjust(10) + "scan".rjust(10))
+
+    with tempfile.TemporaryDirectory(prefix="liveimport-bench-") as root:
+
+        sys.path.insert(0,root)
+
+        for lines in args.lines:
+            name = _generate(root,lines)
+            namespace = dict()
+            exec(f"import {name}",namespace)
+            liveimport._clear_all_state()
+            liveimport.workspace(root)
+            liveimport.register(namespace,f"import {name}")
+            info = liveimport._MODULE_TABLE[name]
+            assert info.file is not None
+            with open(info.file,'rb') as f:
+                source = f.read()
+            row = str(lines).rjust(8)
+            for scan in (False, True):
+                liveimport.configure(scan=scan)
+                row += f"{_time_analysis(info,source,args.repeat):10.3f}"
+            print(row)
+
+    print()
+
+
+if __name__ == '__main__':
+    main()
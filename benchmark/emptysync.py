@@ -0,0 +1,98 @@
+#
+# Benchmark the cost of a sync when no tracked module has changed.  For each
+# module count, we generate that many modules in packages of 100 modules each,
+# track them all, and time syncs using each change detection method.
+#
+
+from argparse import ArgumentParser
+import os
+import statistics
+import sys
+import tempfile
+import time
+import liveimport
+
+
+_PACKAGE_SIZE = 100
+
+#
+# Create count modules under root plus a hub module importing all of them, and
+# return the name of the hub module.
+#
+
+def _generate(root:str, count:int) -> str:
+    prefix = f"bench{count}"
+    imports = []
+    for i in range(count):
+        package = f"{prefix}_p{i // _PACKAGE_SIZE}"
+        if i % _PACKAGE_SIZE == 0:
+            packagedir = f"{root}/{package}"
+            os.mkdir(packagedir)
+            open(f"{packagedir}/__init__.py","w").close()
+        with open(f"{root}/{package}/m{i}.py","w") as f:
+            f.write(f"import math\nvalue = {i}\n")
+        imports.append(f"import {package}.m{i}")
+    hub = f"{prefix}_hub"
+    with open(f"{root}/{hub}.py","w") as f:
+        f.write('\n'.join(imports) + '\n')
+    return hub
+
+
+def _time_syncs(repeat:int) -> float:
+    liveimport.sync()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        liveimport.sync()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+
+    parser = ArgumentParser(
+        description="Benchmark syncs when no tracked module has changed")
+
+    parser.add_argument("-counts", type=int, nargs='+',
+        default=[100, 1000, 10000],
+        help="Numbers of tracked modules (default: 100 1000 10000)")
+
+    parser.add_argument("-repeat", type=int, default=20,
+        help="Syncs to time for each configuration (default: 20)")
+
+    args = parser.parse_args()
+
+    methods = {
+        "stat"    : dict(watch=False, scandir=False),
+        "scandir" : dict(watch=False, scandir=True),
+        "watch"   : dict(watch=True,  scandir=False),
+    }
+
+    print()
+    print("Median milliseconds per sync")
+    print()
+    print("modules".rjust(8) + ''.join(name.rjust(10) for name in methods))
+
+    with tempfile.TemporaryDirectory(prefix="liveimport-bench-") as root:
+
+        sys.path.insert(0,root)
+
+        for count in args.counts:
+            hub = _generate(root,count)
+            namespace = dict()
+            exec(f"import {hub}",namespace)
+            liveimport._clear_all_state()
+            liveimport.workspace(root)
+            liveimport.register(namespace,f"import {hub}")
+            assert len(liveimport._MODULE_TABLE) > count
+            row = str(count).rjust(8)
+            for options in methods.values():
+                liveimport.configure(**options)
+                row += f"{_time_syncs(args.repeat):10.3f}"
+            print(row)
+
+    print()
+
+
+if __name__ == '__main__':
+    main()
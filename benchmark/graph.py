@@ -0,0 +1,129 @@
+#
+# Benchmark the memory and time taken by the module dependency graph sync()
+# uses to schedule reloads.  For each module count, we generate that many
+# modules in packages of 100 modules each, each importing a few random
+# earlier modules, plus a hub module importing all of them.  We track them
+# all and measure the memory retained by tracking, the time to build the
+# graph, and the time to schedule reloads when the first module changes, so
+# every module that transitively depends on it must reload.
+#
+
+from argparse import ArgumentParser
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import liveimport
+import liveimport._core as core
+
+
+_PACKAGE_SIZE = 100
+_IMPORTS = 4
+
+#
+# Create count modules under root plus a hub module importing all of them, and
+# return the name of the hub module and the names of the modules.
+#
+
+def _generate(root:str, count:int) -> tuple[str,list[str]]:
+    rng = random.Random(count)
+    prefix = f"bench{count}"
+    names = []
+    for i in range(count):
+        package = f"{prefix}_p{i // _PACKAGE_SIZE}"
+        if i % _PACKAGE_SIZE == 0:
+            packagedir = f"{root}/{package}"
+            os.mkdir(packagedir)
+            open(f"{packagedir}/__init__.py","w").close()
+        imports = [ f"import {names[j]}"
+                    for j in rng.sample(range(i),min(i,_IMPORTS)) ]
+        with open(f"{root}/{package}/m{i}.py","w") as f:
+            f.write('\n'.join(imports) + f"\nvalue = {i}\n")
+        names.append(f"{package}.m{i}")
+    hub = f"{prefix}_hub"
+    with open(f"{root}/{hub}.py","w") as f:
+        f.write(''.join(f"import {name}\n" for name in names))
+    return hub, names
+
+
+def _median_ms(fn, repeat:int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def _rebuild():
+    core._GRAPH = None
+    core._schedule()
+
+
+#
+# Schedule reloads as if the source of a module had changed.
+#
+
+def _schedule_change(name:str) -> int:
+    info = core._MODULE_TABLE[name]
+    stamp = info.stamp
+    info.stamp = None
+    core._OUTDATED[name] = info
+    try:
+        return len(core._schedule())
+    finally:
+        info.stamp = stamp
+        del core._OUTDATED[name]
+
+
+def main():
+
+    parser = ArgumentParser(
+        description="Benchmark the dependency graph used to schedule reloads")
+
+    parser.add_argument("-counts", type=int, nargs='+',
+        default=[100, 1000, 10000],
+        help="Numbers of tracked modules (default: 100 1000 10000)")
+
+    parser.add_argument("-repeat", type=int, default=20,
+        help="Times to repeat each measurement (default: 20)")
+
+    args = parser.parse_args()
+
+    print()
+    print("Retained kilobytes and median milliseconds")
+    print()
+    print("modules".rjust(8) + "memory".rjust(10) + "build".rjust(10) +
+          "schedule".rjust(10) + "reloads".rjust(10))
+
+    with tempfile.TemporaryDirectory(prefix="liveimport-bench-") as root:
+
+        sys.path.insert(0,root)
+
+        for count in args.counts:
+            hub, names = _generate(root,count)
+            namespace = dict()
+            exec(f"import {hub}",namespace)
+            liveimport._clear_all_state()
+            liveimport.workspace(root)
+            tracemalloc.start()
+            liveimport.register(namespace,f"import {hub}")
+            _rebuild()
+            memory = tracemalloc.get_traced_memory()[0] / 1024
+            tracemalloc.stop()
+            assert len(liveimport._MODULE_TABLE) > count
+            build = _median_ms(_rebuild,args.repeat)
+            schedule = _median_ms(lambda: _schedule_change(names[0]),
+                                  args.repeat)
+            reloads = _schedule_change(names[0])
+            print(str(count).rjust(8) + f"{memory:10.0f}{build:10.3f}"
+                  f"{schedule:10.3f}{reloads:10d}")
+
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -8,10 +8,10 @@ from __future__ import annotations
 
 __version__ = "1.2.6dev1"
 
-__all__ = ("register", "sync", "auto_sync", "hidden_cell_magic",
-           "ReloadEvent", "ModuleError", "workspace")
+__all__ = ("register", "sync", "plan", "auto_sync", "hidden_cell_magic",
+           "ReloadEvent", "ModuleError", "workspace", "configure")
 
-from ._core import register, sync, ReloadEvent, ModuleError
+from ._core import register, sync, plan, configure, ReloadEvent, ModuleError
 from ._nbi import auto_sync, hidden_cell_magic
 from ._workspace import workspace
 
@@ -0,0 +1,119 @@
+from __future__ import annotations
+import ast
+
+
+##############################################################################
+#                            ANNOTATION-ONLY NAMES
+##############################################################################
+
+#
+# _annotation_only_names() returns the global names a module references only
+# in annotations that are never evaluated when the module executes, and not in
+# any code that runs.  Imports that bind only such names are needed only for
+# type checking.
+#
+# Function parameter and return annotations, and annotations of assignments
+# at module or class level, are evaluated unless the module has "from
+# __future__ import annotations".  Annotations of assignments in functions are
+# never evaluated.  Names in string annotations count as annotation
+# references, since they are only resolved by tools such as type checkers.
+# Names listed in a top level assignment to __all__ (including augmented and
+# annotated assignments) count as runtime references since "from module
+# import *" binds them.  Names referenced nowhere are not
+# annotation-only; their imports may be deliberate re-exports.
+#
+
+class _NameCollector(ast.NodeVisitor):
+
+    def __init__(self, postponed:bool):
+        self.postponed  = postponed
+        self.runtime:set[str] = set()
+        self.annotation:set[str] = set()
+        self.in_function = False
+
+    def annotate(self, node:ast.expr|None, evaluated:bool) -> None:
+        if node is None:
+            return
+        if evaluated:
+            self.visit(node)
+        for sub in ast.walk(node):
+            if isinstance(sub,ast.Name):
+                if not evaluated:
+                    self.annotation.add(sub.id)
+            elif isinstance(sub,ast.Constant) and isinstance(sub.value,str):
+                try:
+                    parsed = ast.parse(sub.value,mode='eval')
+                except SyntaxError:
+                    continue
+                for name in ast.walk(parsed):
+                    if isinstance(name,ast.Name):
+                        self.annotation.add(name.id)
+
+    def visit_Name(self, node:ast.Name) -> None:
+        if isinstance(node.ctx,ast.Load):
+            self.runtime.add(node.id)
+
+    def visit_FunctionDef(self, node:ast.FunctionDef|ast.AsyncFunctionDef
+                          ) -> None:
+        evaluated = not self.postponed
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+        args = node.args
+        for default in (*args.defaults, *args.kw_defaults):
+            if default is not None:
+                self.visit(default)
+        for arg in (*args.posonlyargs, *args.args, args.vararg,
+                    *args.kwonlyargs, args.kwarg):
+            if arg is not None:
+                self.annotate(arg.annotation,evaluated)
+        self.annotate(node.returns,evaluated)
+        save, self.in_function = self.in_function, True
+        for stmt in node.body:
+            self.visit(stmt)
+        self.in_function = save
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Lambda(self, node:ast.Lambda) -> None:
+        save, self.in_function = self.in_function, True
+        self.generic_visit(node)
+        self.in_function = save
+
+    def visit_ClassDef(self, node:ast.ClassDef) -> None:
+        save, self.in_function = self.in_function, False
+        self.generic_visit(node)
+        self.in_function = save
+
+    def visit_AnnAssign(self, node:ast.AnnAssign) -> None:
+        self.visit(node.target)
+        if node.value is not None:
+            self.visit(node.value)
+        self.annotate(node.annotation,
+                      not self.postponed and not self.in_function)
+
+
+def _annotation_only_names(tree:ast.Module) -> set[str]:
+
+    postponed = any(
+        isinstance(stmt,ast.ImportFrom) and stmt.module == '__future__' and
+        any(alias.name == 'annotations' for alias in stmt.names)
+        for stmt in tree.body)
+
+    collector = _NameCollector(postponed)
+    collector.visit(tree)
+
+    for stmt in tree.body:
+        if isinstance(stmt,ast.Assign):
+            targets = stmt.targets
+        elif isinstance(stmt,(ast.AugAssign,ast.AnnAssign)):
+            targets = [ stmt.target ]
+        else:
+            continue
+        if (any(isinstance(target,ast.Name) and target.id == '__all__'
+                for target in targets) and
+                isinstance(stmt.value,(ast.List,ast.Tuple))):
+            for elt in stmt.value.elts:
+                if isinstance(elt,ast.Constant) and isinstance(elt.value,str):
+                    collector.runtime.add(elt.value)
+
+    return collector.annotation - collector.runtime
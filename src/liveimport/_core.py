@@ -1,16 +1,31 @@
 from __future__ import annotations
-import math
+import os
 import sys
 import ast
 import time
+import hashlib
+import select
 import textwrap
-from os.path import exists, getmtime
+import threading
+import multiprocessing
+from array import array
+from concurrent.futures import (
+    BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor)
+from functools import wraps
+from os import PathLike, stat, stat_result
+from os.path import exists
 from importlib import reload
-from importlib.machinery import ModuleSpec
+from importlib.machinery import ModuleSpec, SourceFileLoader
 from types import ModuleType
-from typing import Any, Callable, NoReturn
+from typing import Any, Callable, Container, Iterable, NoReturn, TypeVar
 
 from ._workspace import _in_workspace
+from ._watch import _Watcher
+from ._diskcache import _DiskCache
+from ._scan import _scan_imports
+from ._record import _Recorder
+from ._annotations import _annotation_only_names
+from ._graph import _strong_components, _Adjacency
 
 
 ##############################################################################
@@ -41,19 +56,143 @@ def _nice_list(strs:list[str]) -> str:
     return ", ".join(strs[:-1]) + ", and " + strs[-1]
 
 #
-# Return a file's modification time if it exists, otherwise return None.
+# Calls to functions decorated with _synchronized() are serialized with each
+# other and with background change detection.  The lock is reentrant so
+# synchronized functions can call each other.
 #
 
-def _mtime_if_exists(file:str|None) -> float|None:
+_LOCK = threading.RLock()
+
+_F = TypeVar('_F', bound=Callable[..., Any])
+_T = TypeVar('_T')
+_R = TypeVar('_R')
+
+def _synchronized(fn:_F) -> _F:
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        with _LOCK:
+            return fn(*args, **kwargs)
+    return wrapper  #type:ignore
+
+#
+# A stamp identifies a version of a source file by its modification time in
+# nanoseconds, size, and inode number, all taken from a single stat.  Unlike
+# a floating point modification time alone, a stamp distinguishes saves made
+# in rapid succession and files replaced by renaming.  _NO_STAMP never equals
+# the stamp of an existing file.
+#
+
+_Stamp = tuple[int,int,int]
+
+_NO_STAMP:_Stamp = (-1, -1, -1)
+
+def _stamp(st:stat_result) -> _Stamp:
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+#
+# Return the modification time in seconds recorded by a stamp.
+#
+
+def _stamp_time(stamp:_Stamp) -> float:
+    return stamp[0] / 1e9
+
+#
+# Return [ fn(item) for item in items ], calling fn using pool's threads if
+# pool is not None.  Either way, results are in item order, and the exception
+# raised for the earliest failing item propagates.
+#
+
+def _map(fn:Callable[[_T],_R], items:Iterable[_T],
+         pool:Executor|None) -> list[_R]:
+    if pool is None:
+        return [ fn(item) for item in items ]
+    return list(pool.map(fn,items))
+
+#
+# Return a file's stamp if it exists, otherwise return None.
+#
+
+def _stamp_if_exists(file:str|None) -> _Stamp|None:
     if file is None:
         return None
     try:
-        return getmtime(file)
+        return _stamp(stat(file))
     except Exception as ex:
         if not exists(file):
             return None
         raise
 
+#
+# Return the content of a source file.  We read bytes rather than text so the
+# parser, like the import system, honors encoding declarations.
+#
+
+def _read_source(file:str) -> bytes:
+    with open(file,'rb') as f:
+        return f.read()
+
+#
+# A source fingerprint is a source size and content hash.
+#
+
+_Fingerprint = tuple[int,bytes]
+
+def _fingerprint(source:bytes) -> _Fingerprint:
+    return len(source), hashlib.blake2b(source,digest_size=16).digest()
+
+#
+# Return the stamps of files as _stamp_if_exists() would.  If
+# batch is true, files sharing a directory with other files are checked by
+# reading the directory once with os.scandir() instead of checking each file
+# separately.  Any files a directory read doesn't find are checked separately
+# so that differences in name case or normalization aren't mistaken for
+# deletions.  (DirEntry.stat() does not report inode numbers on Windows, so we
+# ask the entry separately when needed.)  If pool is not None, files or
+# directories are checked concurrently using its threads.
+#
+
+def _stamps(files:list[str|None], batch:bool=False,
+            pool:Executor|None=None) -> list[_Stamp|None]:
+
+    if not batch:
+        return _map(_stamp_if_exists,files,pool)
+
+    result:list[_Stamp|None] = [ None ] * len(files)
+    bydir:dict[str,dict[str,list[int]]] = dict()
+
+    for i, file in enumerate(files):
+        if file is not None:
+            dir, name = os.path.split(file)
+            bydir.setdefault(dir,dict()).setdefault(name,[]).append(i)
+
+    def check_dir(item:tuple[str,dict[str,list[int]]]) -> None:
+        dir, names = item
+        if len(names) > 1:
+            try:
+                with os.scandir(dir or '.') as entries:
+                    for entry in entries:
+                        if (indices := names.get(entry.name)) is None:
+                            continue
+                        try:
+                            st = entry.stat()
+                            stamp = (st.st_mtime_ns, st.st_size,
+                                     st.st_ino or entry.inode())
+                        except FileNotFoundError:
+                            continue
+                        for i in indices:
+                            result[i] = stamp
+                        del names[entry.name]
+            except (FileNotFoundError, NotADirectoryError):
+                pass
+        for indices in names.values():
+            stamp = _stamp_if_exists(files[indices[0]])
+            for i in indices:
+                result[i] = stamp
+
+    _map(check_dir,bydir.items(),pool)
+
+    return result
+
 #
 # Return an absolute module reference for "from ... import ..." statements.
 # _absolute_module() embeds functionality equivalent to importlib's
@@ -92,6 +231,83 @@ def _absolute_module(node:ast.ImportFrom, parent:str,
 
     raise ImportError(message)
 
+#
+# Return the names of modules possibly referenced by the top level import
+# statements of a module's source, in order of first reference, the names
+# among them only needed for type checking if classify is true (otherwise
+# None), and the syntax tree if we parsed the entire source.  parent is the
+# module's parent package, and file is its source file name.  If scan is true
+# and classify is false, we try scanning for import statements before parsing
+# the entire source.  See _ModuleInfo.analyze_dependencies().
+#
+# A dependency is only needed for type checking if every import statement
+# referencing it binds only names the module references only in unevaluated
+# annotations.  See _annotations.py.  Names a package's __init__ imports are
+# typically re-exports that other modules use at runtime, so no dependency of
+# a package is only needed for type checking.
+#
+
+def _analyze(source:bytes, parent:str, file:str, scan:bool, classify:bool
+             ) -> tuple[list[str],list[str]|None,ast.Module|None]:
+
+    result:dict[str,None] = dict()
+    runtime:set[str] = set()
+    tree:ast.Module|None = None
+
+    stmts:Iterable[ast.stmt]|None = None
+    if scan and not classify:
+        stmts = _scan_imports(source)
+    if stmts is None:
+        tree = ast.parse(source,file)
+        stmts = tree.body
+
+    typing = (_annotation_only_names(tree)
+              if (tree and classify and
+                  os.path.basename(file) != "__init__.py") else set())
+
+    for stmt in stmts:
+        if isinstance(stmt,ast.Import):
+            for alias in stmt.names:
+                result[alias.name] = None
+                bound = alias.asname or alias.name.partition('.')[0]
+                if bound not in typing:
+                    runtime.add(alias.name)
+        elif isinstance(stmt,ast.ImportFrom):
+            module = _absolute_module(stmt,parent,file)
+            result[module] = None
+            for alias in stmt.names:
+                result[module + '.' + alias.name] = None
+                if (alias.asname or alias.name) not in typing:
+                    runtime.add(module)
+                    runtime.add(module + '.' + alias.name)
+
+    typing_only = ([ name for name in result if name not in runtime ]
+                   if classify else None)
+
+    return list(result), typing_only, tree
+
+#
+# Analyze a source file for _track_new_indirects(), possibly in another
+# process.  The argument is (file, parent, scan, classify, fingerprint).
+# Return the dependencies, those only needed for type checking if classify is
+# true, and, if fingerprint is true, the fingerprint of the source, or None if
+# analysis fails for any reason, in which case the caller should analyze again
+# to raise the appropriate exception.
+#
+
+_Analysis = tuple[list[str],list[str]|None,_Fingerprint|None]
+
+def _analyze_file(job:tuple[str,str,bool,bool,bool]) -> _Analysis|None:
+    file, parent, scan, classify, fingerprint = job
+    try:
+        source = _read_source(file)
+        dependencies, typing_only, _ = _analyze(
+            source,parent,file,scan,classify)
+    except BaseException:
+        return None
+    return (dependencies, typing_only,
+            _fingerprint(source) if fingerprint else None)
+
 #
 # Return true iff the given module spec has a source file.
 #
@@ -226,10 +442,23 @@ class _NamespaceInfo:
 
 _NAMESPACE_TABLE:dict[int,_NamespaceInfo] = dict()
 
+#
+# Parsed source is a module's source and the syntax tree parsed from it.
+#
+
+_Parsed = tuple[bytes,ast.Module]
+
+#
+# A failure is a key describing the circumstances under which an analysis or
+# reload of a module failed, and the exception raised.  See _cached_failure().
+#
+
+_Failure = tuple[tuple[Any,...],BaseException]
+
 #
 # Information LiveImport tracks about a module in _MODULE_TABLE.  We never
 # delete _ModuleInfo objects from _MODULE_TABLE, except in testing.  That means
-# we can maintain what we know about module source file modification times if
+# we can maintain what we know about module source file versions if
 # registrations are cleared.
 #
 # A module is directly imported iff it is attached to a namespace.
@@ -237,100 +466,1044 @@ _NAMESPACE_TABLE:dict[int,_NamespaceInfo] = dict()
 
 class _ModuleInfo:
     __slots__ = ("module", "file", "parent",
-                 "mtime", "attachedto", "dependencies",
-                 "next_mtime", "mark")
-
-    module       : ModuleType  # loaded module instance
-    file         : str|None    # source file name or None if no file
-    parent       : str         # parent package or ''
-    mtime        : float       # last known modification time
-    attachedto   : set[int]    # imported into these namespaces
-    next_mtime   : float       # see sync()
-    mark         : int         # see sync()
-    dependencies : list[str]   # known to depend on these named modules
-
-    def __init__(self, module:ModuleType):
+                 "stamp", "attachedto", "dependencies",
+                 "next_stamp", "analyzed_stamp", "order", "indexed",
+                 "position",
+                 "fingerprint", "next_fingerprint", "reloaded", "failure",
+                 "failed_stamp", "parsed", "typing_only", "edges", "edges_of",
+                 "edges_count")
+
+    module           : ModuleType          # loaded module instance
+    file             : str|None            # source file name or None
+    parent           : str                 # parent package or ''
+    stamp            : _Stamp              # of loaded version if known
+    attachedto       : set[int]            # imported into these namespaces
+    next_stamp       : _Stamp|None         # see _detect_changes()
+    analyzed_stamp   : _Stamp              # dependencies reflect this version
+    order            : int                 # position in _MODULE_TABLE
+    indexed          : list[str]           # dependencies _GRAPH reflects
+    position         : int                 # in _GRAPH or -1
+    dependencies     : list[str]           # known to depend on these modules
+    fingerprint      : _Fingerprint|None   # of loaded version if known
+    next_fingerprint : _Fingerprint|None   # see _detect_changes()
+    reloaded         : int                 # _RELOAD_COUNT at last reload
+    failure          : _Failure|None       # see _cached_failure()
+    failed_stamp     : _Stamp|None         # version analysis last failed on
+    parsed           : _Parsed|None        # see _reload()
+    typing_only      : set[str]            # dependencies only for typing
+    edges            : list[_ModuleInfo]   # see tracked_dependencies()
+    edges_of         : list[str]|None      # dependencies edges resolve
+    edges_count      : int                 # _TRACKED_COUNT edges reflect
+
+    def __init__(self, module:ModuleType, analyze:bool=True):
 
         spec = module.__spec__
         if spec is None:
             raise ValueError(f"Module {module.__name__} has no spec")
 
-        self.module       = module
-        self.parent       = '' if spec.parent is None else spec.parent
-        self.attachedto   = set()
-        self.mark         = 0
-        self.mtime        = -math.inf
-        self.next_mtime   = -math.inf
-        self.dependencies = []
+        self.module           = module
+        self.parent           = '' if spec.parent is None else spec.parent
+        self.attachedto       = set()
+        self.order            = -1
+        self.indexed          = []
+        self.position         = -1
+        self.stamp            = _NO_STAMP
+        self.next_stamp       = _NO_STAMP
+        self.analyzed_stamp   = _NO_STAMP
+        self.dependencies     = []
+        self.fingerprint      = None
+        self.next_fingerprint = None
+        self.reloaded         = 0
+        self.failure          = None
+        self.failed_stamp     = None
+        self.parsed           = None
+        self.typing_only      = set()
+        self.edges            = []
+        self.edges_of         = None
+        self.edges_count      = -1
 
         if _has_source_file(spec, must_exist=False):
             assert (file := spec.origin) is not None
             self.file = file
-            if (mtime := _mtime_if_exists(file)) is not None:
-                self.mtime      = mtime
-                self.next_mtime = mtime
-                self.analyze_dependencies()
+            if (stamp := _stamp_if_exists(file)) is not None:
+                self.stamp      = stamp
+                self.next_stamp = stamp
+                if self.load_record() or self.load_analysis(stamp):
+                    self.analyzed_stamp = stamp
+                elif analyze:
+                    self.analyze_file()
         else:
             self.file = None
 
+    #
+    # Analyze the version of the source file with stamp self.stamp.  (That is
+    # only called when tracking starts.  Later versions are analyzed by
+    # _detect_changes().)  If analysis is given, it is the result of
+    # _analyze_file() for that version.
+    #
+
+    def analyze_file(self, analysis:_Analysis|None=None) -> None:
+        assert self.file
+        if analysis is None:
+            source = _read_source(self.file)
+            self.analyze_dependencies(source)
+            if _FINGERPRINT:
+                self.fingerprint = _fingerprint(source)
+        else:
+            self.dependencies, typing_only, self.fingerprint = analysis
+            self.typing_only = set(typing_only or ())
+        self.store_analysis(self.stamp,self.fingerprint)
+        self.analyzed_stamp = self.stamp
+
+    #
+    # If imports are recorded and there is a recording for the module, assign
+    # the recorded imports to self.dependencies, and return true.
+    #
+
+    def load_record(self) -> bool:
+        assert self.file
+        if _RECORDER is None:
+            return False
+        if (recorded := _RECORDER.get(self.module.__name__)) is None:
+            return False
+        self.dependencies = recorded
+        self.typing_only  = set()
+        if _FINGERPRINT:
+            self.fingerprint = _fingerprint(_read_source(self.file))
+        return True
+
+    #
+    # If the persistent cache is enabled and has the dependencies of the
+    # version of the source file with the given stamp, assign them to
+    # self.dependencies, assign any classification and fingerprint also
+    # cached, and return true.  A cache entry without a fingerprint is useless
+    # when fingerprinting, and one without a classification of dependencies
+    # only needed for type checking is useless when ignoring those.
+    #
+
+    def load_analysis(self, stamp:_Stamp) -> bool:
+        assert self.file
+        if _DISKCACHE is None:
+            return False
+        if (cached := _DISKCACHE.load(self.file,stamp,self.parent)) is None:
+            return False
+        dependencies, typing_only, fingerprint = cached
+        if _FINGERPRINT and fingerprint is None:
+            return False
+        if _IGNORE_TYPING and typing_only is None:
+            return False
+        self.dependencies = dependencies
+        self.typing_only  = set(typing_only or ())
+        self.fingerprint  = fingerprint
+        return True
+
+    #
+    # Record self.dependencies (and self.typing_only if dependencies were
+    # classified) for the version of the source file with the given stamp in
+    # the persistent cache if it is enabled.
+    #
+
+    def store_analysis(self, stamp:_Stamp,
+                       fingerprint:_Fingerprint|None) -> None:
+        assert self.file
+        if _DISKCACHE is not None:
+            typing_only = ([ name for name in self.dependencies
+                             if name in self.typing_only ]
+                           if _IGNORE_TYPING else None)
+            _DISKCACHE.store(self.file,stamp,self.parent,
+                             self.dependencies,typing_only,fingerprint)
+
     #
     # Assign to self.dependencies the names of modules possibly referenced by
-    # top level import statements of the given module file. "Possibly" because
+    # top level import statements of the module's source. "Possibly" because
     # in the case of "from A import B", we include "A.B".  Often, of course,
     # A.B is not a module -- but that doesn't matter because we only act on an
     # "A.B" dependency when A.B turns out to be a tracked module.  Returning
     # possibly instead of definitely referenced module names is an
     # implementation necessity: it enables the depedency graph to evolve
-    # naturally as imports are registered and cleared.
+    # naturally as imports are registered and cleared.  If _IGNORE_TYPING is
+    # true, assign to self.typing_only the dependencies only needed for type
+    # checking.  Otherwise, if _SCAN is true, we try scanning for import
+    # statements before parsing the entire source.  Return the syntax tree if
+    # we parsed the entire source.
     #
 
-    def analyze_dependencies(self) -> None:
+    def analyze_dependencies(self, source:bytes) -> ast.Module|None:
 
         assert self.file
 
-        with open(self.file) as f:
-            source = f.read()
-
-        result:set[str] = set()
-
         try:
-            for stmt in ast.parse(source,self.file).body:
-                if isinstance(stmt,ast.Import):
-                    for alias in stmt.names:
-                        result.add(alias.name)
-                elif isinstance(stmt,ast.ImportFrom):
-                    module = _absolute_module(stmt,self.parent,self.file)
-                    result.add(module)
-                    for alias in stmt.names:
-                        result.add(module + '.' + alias.name)
+            self.dependencies, typing_only, tree = _analyze(
+                source,self.parent,self.file,_SCAN,_IGNORE_TYPING)
         except BaseException as ex:
             raise ModuleError(self.module.__name__,"analysis") from ex
 
-        self.dependencies = list(result)
+        self.typing_only = set(typing_only or ())
+
+        return tree
+
+    #
+    # Return the tracked modules among self.dependencies, in order.  Most
+    # dependencies are not tracked modules, either because they are outside
+    # the workspace or because they are the speculative "A.B" of "from A
+    # import B", so graph traversals use this instead.  The result is
+    # resolved again only when self.dependencies is replaced or more modules
+    # are tracked.
+    #
+
+    def tracked_dependencies(self) -> list[_ModuleInfo]:
+        if (self.edges_of is not self.dependencies or
+                self.edges_count != _TRACKED_COUNT):
+            self.edges = [ otherinfo for modulename in self.dependencies
+                           if (otherinfo := _MODULE_TABLE.get(modulename))
+                              is not None ]
+            self.edges_of    = self.dependencies
+            self.edges_count = _TRACKED_COUNT
+        return self.edges
 
 _MODULE_TABLE:dict[str,_ModuleInfo] = dict()
 
+#
+# _TRACKED_COUNT counts additions to _MODULE_TABLE.  See
+# _ModuleInfo.tracked_dependencies().
+#
+
+_TRACKED_COUNT = 0
+
+#
+# _index() must be called whenever a tracked module's dependencies are
+# replaced, so that _GRAPH (see below) is rebuilt if they changed.
+#
+
+def _index(info:_ModuleInfo) -> None:
+    if info.indexed != info.dependencies:
+        _invalidate_graph()
+    info.indexed = info.dependencies
+
+#
+# Change detection state.  _OUTDATED holds the tracked modules whose source
+# files were last seen with a stamp different from that of the loaded
+# version.  When watching is enabled, _WATCHER reports which source
+# files may have changed, and _DIRTY holds the tracked modules whose source
+# files we must check during the next sync.  Otherwise, _WATCHER is None and
+# every sync checks every tracked module.
+#
+
+_OUTDATED:dict[str,_ModuleInfo] = dict()
+_DIRTY:dict[str,_ModuleInfo] = dict()
+
+#
+# _PENDING holds the tracked modules a scoped sync left out of date because
+# they depend on modules it reloaded, mapping each to the names of those
+# modules.  The next sync including them reloads them.  Modules that leave the
+# dependency graph, for example because no namespace imports them any more,
+# are dropped when the graph is rebuilt, since no sync can reload them.
+#
+
+_PENDING:dict[str,dict[str,None]] = dict()
+
+#
+# _UNCHECKED holds the tracked modules whose dependencies
+# _track_new_indirects() has not checked since the modules were tracked or
+# last analyzed.  Outdated modules stay until they reload, since the modules
+# they newly import are not loaded before then.
+#
+
+_UNCHECKED:dict[str,_ModuleInfo] = dict()
+_WATCHER:_Watcher|None = None
+
+#
+# If _SCANDIR is true, we check modification times using directory reads when
+# possible.  See _stamps().
+#
+
+_SCANDIR = False
+
+#
+# If _FINGERPRINT is true, we only consider modules with changed stamps
+# outdated if their source fingerprints also changed.
+#
+
+_FINGERPRINT = False
+
+#
+# If _SETTLE is positive, sync() waits until the source files of outdated
+# modules have been unmodified for _SETTLE seconds before analyzing and
+# reloading them, but waits no more than _SETTLE_LIMIT seconds in total, since
+# it holds _LOCK while waiting.  configure() rejects settle windows longer than
+# _SETTLE_LIMIT, so the limit only cuts short waits for files that keep
+# changing.
+#
+
+_SETTLE = 0.0
+_SETTLE_LIMIT = 5.0
+
+#
+# If _POOL is not None, change detection checks stamps and reads source files
+# concurrently using its _THREADS threads.
+#
+
+_THREADS = 0
+_POOL:ThreadPoolExecutor|None = None
+
+#
+# If _PROCESSES is greater than 1, newly tracked modules are analyzed using a
+# pool of _PROCESSES worker processes when there are enough of them.  See
+# _track_cohort().  We start the pool when first needed, since starting
+# processes is expensive.  Worker processes are spawned rather than forked
+# because forking a process with other threads running is unsafe.  A spawned
+# worker runs the main module again if it has a source file, which repeats
+# the work of any script not guarded by a __name__ == "__main__" test, so we
+# only use the pool when the main module has none, as in notebooks.
+#
+
+_PROCESSES = 0
+_PROCESS_POOL:ProcessPoolExecutor|None = None
+
+def _process_pool() -> ProcessPoolExecutor|None:
+    global _PROCESS_POOL
+    if (_PROCESS_POOL is None and _PROCESSES > 1 and
+            getattr(sys.modules.get("__main__"),"__file__",None) is None):
+        _PROCESS_POOL = ProcessPoolExecutor(
+            _PROCESSES, mp_context=multiprocessing.get_context('spawn'))
+    return _PROCESS_POOL
+
+#
+# If _CACHE_FAILURES is true, we do not repeat analyses and reloads that failed
+# under the same circumstances.  See _cached_failure().  _RELOAD_COUNT counts
+# successful reloads.
+#
+
+_CACHE_FAILURES = False
+_RELOAD_COUNT = 0
+
+#
+# If _DISKCACHE is not None, dependency analyses persist across processes.
+# See _diskcache.py.
+#
+
+_DISKCACHE:_DiskCache|None = None
+
+#
+# If _SCAN is true, dependency analysis scans for import statements instead of
+# parsing entire modules when possible.  See _scan.py.
+#
+
+_SCAN = False
+
+#
+# If _IGNORE_TYPING is true, dependency analysis classifies the dependencies
+# only needed for type checking, and reloading a module does not cause modules
+# depending on it only for type checking to reload.
+#
+
+_IGNORE_TYPING = False
+
+#
+# If _ISOLATE_FAILURES is true, a failed reload only prevents the modules
+# depending on the failed module from reloading, and sync() continues with
+# the rest of the schedule, raising a ModuleError listing every failure at
+# the end.
+#
+
+_ISOLATE_FAILURES = False
+
+#
+# If _RECORDER is not None, it records the imports modules execute, and those
+# replace dependency analysis for modules with recordings.  See _record.py.
+#
+
+_RECORDER:_Recorder|None = None
+
+#
+# Return true iff _RECORDER should record the imports of a module with the
+# given name and source file.
+#
+
+def _record_importer(modulename:str, file:str|None) -> bool:
+    return (modulename in _MODULE_TABLE or
+            (file is not None and _in_workspace(file)))
+
+#
+# _CHANGE_COUNT counts changes in observed stamps.  _SYNCED_COUNT
+# is the value of _CHANGE_COUNT when a sync last left no module outdated, or
+# -1 if the dependency graph or attachments changed since.
+#
+
+_CHANGE_COUNT = 0
+_SYNCED_COUNT = 0
+
+#
+# Stop watching, falling back to checking every tracked module on every sync.
+#
+
+def _stop_watching() -> None:
+    global _WATCHER
+    if _WATCHER is not None:
+        _WATCHER.close()
+        _WATCHER = None
+        _DIRTY.clear()
+        if _BACKGROUND is not None:
+            _BACKGROUND.wake()
+
+#
+# Start watching the source file of a tracked module.  The module is also made
+# dirty in case its source file changed before the watch began.
+#
+
+def _watch(info:_ModuleInfo) -> None:
+    if _WATCHER is not None and info.file is not None:
+        try:
+            _WATCHER.watch(info.file,info)
+        except OSError:
+            _stop_watching()
+            return
+        _DIRTY[info.module.__name__] = info
+
+#
+# Add a newly tracked module to _MODULE_TABLE.
+#
+
+def _insert(modulename:str, info:_ModuleInfo) -> None:
+    global _TRACKED_COUNT
+    _MODULE_TABLE[modulename] = info
+    _invalidate_graph()
+    info.order = _TRACKED_COUNT
+    _TRACKED_COUNT += 1
+    _index(info)
+    _UNCHECKED[modulename] = info
+    _watch(info)
+
+#
+# Record the current stamp of a module's source file as info.next_stamp (None
+# if the file is missing), and update _OUTDATED accordingly.
+#
+
+def _refresh(info:_ModuleInfo, current_stamp:_Stamp|None) -> None:
+    global _CHANGE_COUNT
+    modulename = info.module.__name__
+    if current_stamp != info.next_stamp:
+        if (current_stamp is None) != (info.next_stamp is None):
+            _invalidate_graph()
+        info.next_stamp = current_stamp
+        _CHANGE_COUNT += 1
+    if current_stamp is None or current_stamp == info.stamp:
+        _OUTDATED.pop(modulename,None)
+    else:
+        _OUTDATED[modulename] = info
+
+#
+# Bring info.next_stamp and _OUTDATED up to date.  Without a watcher, that
+# means checking every tracked module.  With one, we only check modules with
+# source files that may have changed, so the cost of a sync with no changes is
+# independent of the number of tracked modules.  We do not clear modules from
+# _DIRTY until they are checked, so exceptions don't lose changes.
+#
+
+def _refresh_stamps() -> None:
+
+    infos:list[_ModuleInfo]|None = None
+
+    if _WATCHER is not None:
+        try:
+            changed = _WATCHER.changes()
+        except OSError:
+            _stop_watching()
+            changed = None
+        if changed is not None:
+            for info in changed:
+                _DIRTY[info.module.__name__] = info
+            infos = list(_DIRTY.values())
+
+    if infos is None:
+        infos = list(_MODULE_TABLE.values())
+
+    stamps = _stamps([ info.file for info in infos ], _SCANDIR, _POOL)
+
+    for info, stamp in zip(infos,stamps):
+        _refresh(info,stamp)
+        _DIRTY.pop(info.module.__name__,None)
+
+#
+# Return how long to wait before every outdated module's source file will have
+# been unmodified for settle seconds.  Modification times in the future count
+# as settled since we can't know when they were really written.
+#
+
+def _settle_wait(settle:float) -> float:
+    now = time.time()
+    wait = 0.0
+    for info in _OUTDATED.values():
+        assert (stamp := info.next_stamp) is not None
+        age = now - _stamp_time(stamp)
+        if 0 <= age < settle:
+            wait = max(wait, settle - age)
+    return wait
+
+#
+# Return keys describing the circumstances of an analysis or a reload of a
+# module.  Analysis depends only on the source version.  A reload also depends
+# on the modules the module depends on, so a change to one of those (which
+# reloads it) may fix a failure.
+#
+
+def _analysis_key(info:_ModuleInfo) -> tuple[Any,...]:
+    return ("analysis", info.next_stamp)
+
+def _reload_key(info:_ModuleInfo) -> tuple[Any,...]:
+    reloaded = [ (otherinfo.module.__name__, otherinfo.reloaded)
+                 for otherinfo in info.tracked_dependencies() ]
+    return ("reload", info.next_stamp, tuple(reloaded))
+
+#
+# Return the exception raised by the failed analysis or reload of a module
+# under the circumstances keyfn(info) describes, or None if there was no such
+# failure or failure caching is disabled.
+#
+
+def _cached_failure(info:_ModuleInfo,
+                    keyfn:Callable[[_ModuleInfo],Any]) -> BaseException|None:
+    if (_CACHE_FAILURES and (failure := info.failure) is not None and
+            failure[0] == keyfn(info)):
+        return failure[1]
+    return None
+
+#
+# Record the failure of an analysis or reload of a module for _cached_failure()
+# if failure caching is enabled.  Otherwise we clear any failure, so we don't
+# keep the exception, its traceback, and the frames it references alive.
+#
+
+def _record_failure(info:_ModuleInfo, key:tuple[Any,...],
+                    exception:BaseException) -> None:
+    info.failure = (key, exception) if _CACHE_FAILURES else None
+
+#
+# Bring info.next_stamp and _OUTDATED up to date, and refresh the dependencies
+# of outdated modules so they are current for scheduling.  If settle is
+# positive, we first wait for outdated source files to stop changing (see
+# _SETTLE), so we don't analyze a file an editor or tool is still writing, and
+# so a burst of changes is handled at once.  When fingerprinting, modules with
+# unchanged content are not outdated, no matter their stamps.  We read all
+# the sources to analyze before analyzing any so reads can be concurrent.
+# Sources whose analysis already failed are not read again if failures are
+# cached.  Modules with recorded imports are not analyzed, since their
+# recordings are replaced when they reload, so their sources are only read to
+# fingerprint them.
+#
+# With preview, modules with unchanged content are returned rather than made
+# up to date, leaving info.stamp and _OUTDATED as they are for the next sync,
+# and reverted modules are not analyzed again.  Otherwise the result is empty.
+#
+# With scope, only outdated modules in the _cone() of the scope are analyzed,
+# so a limited sync neither analyzes nor fails on modules outside it.  Since
+# analysis can add dependencies to the cone, we repeat until the cone has no
+# outdated modules left to analyze.
+#
+# Without retry, modules whose analysis failed are not analyzed again until
+# their source files change, whether or not failures are cached.  The
+# background thread uses that so it doesn't repeat a failed analysis every
+# interval; the next sync reports the failure.
+#
+
+def _detect_changes(settle:float=0.0, preview:bool=False,
+                    scope:list[_ModuleInfo]|None=None,
+                    retry:bool=True) -> set[str]:
+
+    _refresh_stamps()
+
+    if settle > 0:
+        deadline = time.monotonic() + _SETTLE_LIMIT
+        while (wait := _settle_wait(settle)) > 0:
+            if (remaining := deadline - time.monotonic()) <= 0:
+                break
+            time.sleep(min(wait,remaining))
+            _refresh_stamps()
+
+    unchanged:set[str] = set()
+
+    while True:
+        cone = None if scope is None else _cone(scope)
+        pending = [ info for info in _OUTDATED.values()
+                    if (info.analyzed_stamp != info.next_stamp and
+                        info.module.__name__ not in unchanged and
+                        (retry or info.failed_stamp != info.next_stamp) and
+                        (cone is None or info.position in cone)) ]
+        if not pending:
+            return unchanged
+        _analyze_outdated(pending,preview,unchanged)
+
+#
+# Analyze the given outdated modules for _detect_changes(), adding those with
+# unchanged content to unchanged if preview is true.
+#
+
+def _analyze_outdated(pending:list[_ModuleInfo], preview:bool,
+                      unchanged:set[str]) -> None:
+
+    recorded:set[str] = set()
+    if _RECORDER is not None:
+        recorded = { info.module.__name__ for info in pending
+                     if _RECORDER.get(info.module.__name__) is not None }
+
+    files:list[str] = []
+    for info in pending:
+        assert info.file is not None
+        if _cached_failure(info,_analysis_key) is not None:
+            continue
+        if _FINGERPRINT or info.module.__name__ not in recorded:
+            files.append(info.file)
+
+    sources = iter(_map(_read_source,files,_POOL))
+
+    for info in pending:
+        assert (next_stamp := info.next_stamp) is not None
+        if (cause := _cached_failure(info,_analysis_key)) is not None:
+            raise ModuleError(info.module.__name__,"analysis") from cause
+        analyze = info.module.__name__ not in recorded
+        source = next(sources) if _FINGERPRINT or analyze else b''
+        fingerprint = _fingerprint(source) if _FINGERPRINT else None
+        info.next_fingerprint = fingerprint
+        if fingerprint is not None and fingerprint == info.fingerprint:
+            if preview:
+                unchanged.add(info.module.__name__)
+                continue
+            #
+            # Only the stamp changed.  Act as if the loaded version has the
+            # new stamp.  If the dependencies were analyzed from a different
+            # version since (the module was reverted), analyze again to
+            # restore those of the loaded version.
+            #
+            reverted = info.analyzed_stamp != info.stamp
+            info.stamp = next_stamp
+            info.parsed = None
+            del _OUTDATED[info.module.__name__]
+            if not reverted:
+                continue
+        if not analyze:
+            info.parsed = None
+            info.analyzed_stamp = next_stamp
+            continue
+        try:
+            tree = info.analyze_dependencies(source)
+        except ModuleError as ex:
+            assert ex.__cause__ is not None
+            _record_failure(info,_analysis_key(info),ex.__cause__)
+            info.failed_stamp = next_stamp
+            info.parsed = None
+            raise
+        info.parsed = None if tree is None else (source, tree)
+        info.analyzed_stamp = next_stamp
+        _index(info)
+        info.store_analysis(next_stamp,fingerprint)
+        _UNCHECKED[info.module.__name__] = info
+
+#
+# _GRAPH caches the dependency graph of the tracked modules that can reload,
+# or is None if that must be computed again because dependencies, tracked
+# modules, attachments, or which source files are missing have changed.
+# Modules are numbered by their position in a topological order, which is
+# info.position, or -1 if the module is not in the graph.  Edges are stored
+# in _Adjacency arrays indexed by position, so scheduling reloads compares
+# small integers rather than hashing module names.
+#
+# The order comes from the strongly connected components of the dependency
+# graph, found by a depth first search whose roots are the directly imported
+# modules, in the order they were tracked.  That way we don't reload indirect
+# modules if they no longer have dependants.  The search does not visit
+# modules with missing source files, since those cannot reload.  Modules in
+# an import cycle form one component, which occupies consecutive positions
+# starting at components[position], ordered by ignoring imports by more
+# recently tracked modules.  Every dependency of a module outside its
+# component precedes it in the order.
+#
+
+class _Graph:
+    __slots__ = "modules", "dependencies", "dependents", "components"
+
+    modules      : list[_ModuleInfo]   # in topological order
+    dependencies : _Adjacency          # position -> dependency positions
+    dependents   : _Adjacency          # position -> dependent positions
+    components   : array[int]          # position -> first in component
+
+    def __init__(self):
+
+        def successors(info:_ModuleInfo) -> list[_ModuleInfo]:
+            return [ otherinfo for otherinfo in info.tracked_dependencies()
+                     if otherinfo.next_stamp is not None ]
+
+        roots = [ info for info in _MODULE_TABLE.values()
+                  if info.attachedto and info.next_stamp is not None ]
+
+        for info in _MODULE_TABLE.values():
+            info.position = -1
+
+        self.modules    = []
+        self.components = array('I')
+        for component in _strong_components(roots,successors):
+            first = len(self.modules)
+            for info in component:
+                info.position = len(self.modules)
+                self.modules.append(info)
+                self.components.append(first)
+
+        self.dependencies = _Adjacency(
+            [ otherinfo.position for otherinfo in info.tracked_dependencies()
+              if otherinfo.position >= 0 ]
+            for info in self.modules)
+        self.dependents = self.dependencies.reverse()
+
+_GRAPH:_Graph|None = None
+
+def _graph() -> _Graph:
+    global _GRAPH
+    if _GRAPH is None:
+        _GRAPH = _Graph()
+        for modulename in [ modulename for modulename in _PENDING
+                            if _MODULE_TABLE[modulename].position < 0 ]:
+            del _PENDING[modulename]
+    return _GRAPH
+
+#
+# Discard _GRAPH after a change to dependencies, attachments, or missing
+# files.  A module that could not be reloaded before may now need to be, so
+# the next sync must not assume nothing changed since the last one.
+#
+
+def _invalidate_graph() -> None:
+    global _GRAPH, _SYNCED_COUNT
+    _GRAPH = None
+    _SYNCED_COUNT = -1
+
+#
+# Return the positions in _graph() of the modules that are outdated or
+# pending, or transitively depend on such modules, in increasing order.
+# Modules with missing source files are not in the graph, so neither are
+# their dependents unless they depend on outdated modules some other way,
+# since such modules cannot reload.  Modules named in unchanged (see
+# _detect_changes()) count as up to date.
+#
+
+def _affected(unchanged:Container[str]=()) -> list[int]:
+    dependents = _graph().dependents
+    affected:set[int] = set()
+    stack = [ info.position for modulename, info in _OUTDATED.items()
+              if info.position >= 0 and modulename not in unchanged ]
+    stack.extend(position for modulename in _PENDING
+                 if (position := _MODULE_TABLE[modulename].position) >= 0)
+    while stack:
+        position = stack.pop()
+        if position in affected:
+            continue
+        affected.add(position)
+        stack.extend(other for other in dependents[position]
+                     if other not in affected)
+    return sorted(affected)
+
+#
+# Return the positions in _graph() of the given modules and the modules they
+# transitively depend on.  That is the scope of a scoped sync.
+#
+
+def _cone(scope:Iterable[_ModuleInfo]) -> set[int]:
+    dependencies = _graph().dependencies
+    cone:set[int] = set()
+    stack = [ info.position for info in scope if info.position >= 0 ]
+    while stack:
+        position = stack.pop()
+        if position in cone:
+            continue
+        cone.add(position)
+        stack.extend(other for other in dependencies[position]
+                     if other not in cone)
+    return cone
+
+#
+# Schedule reloads of outdated modules ordered topologically by module
+# dependency, including reloads of modules that haven't changed but depend on
+# modules that will reload.  Return a list of modules to reload paired with
+# the names of the modules they depend on that will reload, or that reloaded
+# during scoped syncs if the modules are pending.  We take the _affected()
+# modules, the only ones that can reload, within the cone if given, one
+# component at a time.  A module reloads if it is outdated, pending, or
+# depends on a reloading module, so if one module in an import cycle
+# reloads, the whole cycle does, as a unit in component order.  Dependencies
+# only needed for type checking can break that when ignored, so we propagate
+# reloads within a component along dependents.  A cone includes every
+# module in the components of its modules, since they depend on each other.
+# Modules named in unchanged count as up to date.
+#
+
+def _schedule(cone:set[int]|None=None, unchanged:Container[str]=()
+              ) -> list[tuple[_ModuleInfo,list[str]]]:
+
+    graph = _graph()
+    modules, components = graph.modules, graph.components
+    dependencies, dependents = graph.dependencies, graph.dependents
+
+    affected = _affected(unchanged)
+    if cone is not None:
+        affected = [ position for position in affected if position in cone ]
+
+    schedule:list[tuple[_ModuleInfo,list[str]]] = []
+    reloading:set[int] = set()
+
+    def reloading_dependencies(position:int) -> list[str]:
+        if not _PENDING or (pending := _PENDING.get(
+                modules[position].module.__name__)) is None:
+            names = [ modules[other].module.__name__
+                      for other in dependencies[position]
+                      if other in reloading ]
+        else:
+            names = [ name for other in dependencies[position]
+                      if ((name := modules[other].module.__name__)
+                          in pending or other in reloading) ]
+            names.extend(name for name in pending if name not in names)
+        if _IGNORE_TYPING and names:
+            typing_only = modules[position].typing_only
+            names = [ name for name in names if name not in typing_only ]
+        return names
+
+    start = 0
+    while start < len(affected):
+        component = components[affected[start]]
+        end = start + 1
+        while end < len(affected) and components[affected[end]] == component:
+            end += 1
+        members = affected[start:end]
+        start = end
+
+        if len(members) == 1:
+            info = modules[position := members[0]]
+            dependent_reload = reloading_dependencies(position)
+            if dependent_reload or _modified(info,unchanged):
+                reloading.add(position)
+                schedule.append((info,dependent_reload))
+            continue
+
+        pending = [ position for position in members
+                    if (_modified(modules[position],unchanged) or
+                        reloading_dependencies(position)) ]
+        reloading.update(pending)
+        while pending:
+            position = pending.pop()
+            modulename = modules[position].module.__name__
+            for other in dependents[position]:
+                if (components[other] == component and
+                        other not in reloading and
+                        not (_IGNORE_TYPING and
+                             modulename in modules[other].typing_only)):
+                    reloading.add(other)
+                    pending.append(other)
+
+        for position in members:
+            if position in reloading:
+                schedule.append((modules[position],
+                                 reloading_dependencies(position)))
+
+    return schedule
+
+#
+# Return true iff a module will reload because its source file changed.
+#
+
+def _modified(info:_ModuleInfo, unchanged:Container[str]=()) -> bool:
+    return (info.next_stamp != info.stamp and
+            info.module.__name__ not in unchanged)
+
+#
+# Add to blocked the positions in _graph() of the modules transitively
+# depending on a module whose reload failed, since they cannot reload
+# correctly until it does.
+#
+
+def _block_dependents(info:_ModuleInfo, blocked:set[int]) -> None:
+    graph = _graph()
+    stack = [ info.position ]
+    while stack:
+        position = stack.pop()
+        modulename = graph.modules[position].module.__name__
+        for other in graph.dependents[position]:
+            if other in blocked:
+                continue
+            if (_IGNORE_TYPING and
+                    modulename in graph.modules[other].typing_only):
+                continue
+            blocked.add(other)
+            stack.append(other)
+
+#
+# Record that a module reloaded during a scoped sync, making the modules
+# outside the cone that depend on it pending.
+#
+
+def _defer_dependents(info:_ModuleInfo, cone:set[int]) -> None:
+    graph = _graph()
+    modulename = info.module.__name__
+    for other in graph.dependents[info.position]:
+        if other in cone:
+            continue
+        otherinfo = graph.modules[other]
+        if _IGNORE_TYPING and modulename in otherinfo.typing_only:
+            continue
+        othername = otherinfo.module.__name__
+        if (pending := _PENDING.get(othername)) is None:
+            pending = _PENDING[othername] = dict()
+        pending[modulename] = None
+
+#
+# Return the tracked modules attached to a namespace or named by modules, or
+# None if both are None, meaning no scope.
+#
+
+def _scope(namespace:dict[str,Any]|None,
+           modules:Iterable[str]|None) -> list[_ModuleInfo]|None:
+
+    if namespace is None and modules is None:
+        return None
+
+    scope = []
+
+    if namespace is not None:
+        nsid = id(namespace)
+        scope.extend(info for info in _MODULE_TABLE.values()
+                     if nsid in info.attachedto)
+
+    if modules is not None:
+        if isinstance(modules,str):
+            raise ValueError("Argument modules must be an iterable of "
+                             "module names, not a string")
+        for modulename in modules:
+            if (info := _MODULE_TABLE.get(modulename)) is None:
+                raise ValueError(f"Module {modulename} is not tracked")
+            scope.append(info)
+
+    return scope
+
+#
+# Return true iff no module can have changed since the last sync that left no
+# module outdated.  That is only knowable without checking files when a
+# background thread maintains change information from watcher reports.
+#
+
+def _unchanged_since_sync() -> bool:
+    return (_BACKGROUND is not None and _WATCHER is not None and
+            _CHANGE_COUNT == _SYNCED_COUNT and not _DIRTY and
+            not _PENDING and _WATCHER.idle() and
+            (_RECORDER is None or not _RECORDER.recorded))
+
+#
+# A _Background instance runs a daemon thread that performs change detection
+# between syncs, so that syncs find source files already checked and the
+# dependencies of modified modules already analyzed.  When watching, the
+# thread detects changes as soon as the watcher reports them.  Otherwise, it
+# checks every tracked module each _BACKGROUND_INTERVAL seconds.  Exceptions
+# are ignored because the next sync will encounter and report the same issue.
+#
+
+_BACKGROUND_INTERVAL = 1.0
+
+class _Background:
+    __slots__ = "thread", "stopped", "wake_r", "wake_w"
+
+    thread  : threading.Thread
+    stopped : threading.Event
+    wake_r  : int               # wake pipe read end
+    wake_w  : int               # wake pipe write end
+
+    def __init__(self):
+        self.stopped = threading.Event()
+        self.wake_r, self.wake_w = os.pipe()
+        self.thread = threading.Thread(
+            target=self.run, name="liveimport-background", daemon=True)
+        self.thread.start()
+
+    def run(self):
+        stopped = self.stopped
+        while not stopped.is_set():
+            if (watcher := _WATCHER) is not None:
+                try:
+                    select.select([ watcher.fileno(), self.wake_r ], [], [],
+                                  _BACKGROUND_INTERVAL)
+                except (OSError, ValueError):
+                    pass
+            else:
+                stopped.wait(_BACKGROUND_INTERVAL)
+            if stopped.is_set():
+                break
+            with _LOCK:
+                try:
+                    _detect_changes(retry=False)
+                except Exception:
+                    pass
+                self.drain()
+
+    def wake(self):
+        os.write(self.wake_w, b'\0')
+
+    def drain(self):
+        if os.name != 'nt':
+            while select.select([ self.wake_r ], [], [], 0)[0]:
+                os.read(self.wake_r, 512)
+
+    def stop(self):
+        self.stopped.set()
+        self.wake()
+        self.thread.join()
+        os.close(self.wake_r)
+        os.close(self.wake_w)
+
+_BACKGROUND:_Background|None = None
+
+#
+# Replace the dependencies of tracked modules whose import recordings changed
+# since the last call with the recorded imports.
+#
+
+def _apply_records() -> None:
+    if _RECORDER is None:
+        return
+    for modulename in _RECORDER.take():
+        if (info := _MODULE_TABLE.get(modulename)) is None: continue
+        if (recorded := _RECORDER.get(modulename)) is None: continue
+        info.dependencies = recorded
+        info.typing_only  = set()
+        _index(info)
+        _UNCHECKED[modulename] = info
+
 #
 # Make sure all tracked module dependencies are themselves tracked if they have
 # source files in the workspace.  _track_new_indirects() should be called after
-# imports are registered, and after modules are reloaded.
+# imports are registered, and after modules are reloaded.  Only the
+# dependencies of modules in _UNCHECKED can have changed, so we check just
+# those unless everything is true, as when the workspace changes.
 #
 
-def _track_new_indirects() -> None:
+def _track_new_indirects(everything:bool=False) -> None:
 
     #
     # We perform a breadth-first traveral of the dependency graph.  The initial
-    # cohort is all currently tracked modules.  Subsequent cohorts are modules
-    # tracked because of emergent dependencies in the prior cohort.  Note that
-    # added is implicitly a set, since a named module isn't added to
-    # _MODULE_TABLE more than once.
+    # cohort is the unchecked modules.  Subsequent cohorts are modules tracked
+    # because of emergent dependencies in the prior cohort, which
+    # _track_cohort() adds to _UNCHECKED.  Note that added is implicitly a
+    # set, since a named module isn't added to _MODULE_TABLE more than once.
+    # We only remove a cohort from _UNCHECKED once its dependencies are
+    # tracked, so exceptions don't lose dependencies, and we keep outdated
+    # modules for after they reload.
     #
 
-    cohort:list[_ModuleInfo] = list(_MODULE_TABLE.values())
+    _apply_records()
 
-    while True:
-        added:list[_ModuleInfo] = []
-        for info in cohort:
+    if everything:
+        _UNCHECKED.update(_MODULE_TABLE)
+
+    checked:set[str] = set()
+
+    while cohort := [ (modulename, info)
+                      for modulename, info in _UNCHECKED.items()
+                      if modulename not in checked ]:
+        added:dict[str,ModuleType] = dict()
+        for _, info in cohort:
             for modulename in info.dependencies:
                 #
                 # A dependee should be added if it isn't already tracked, is
@@ -338,20 +1511,73 @@ def _track_new_indirects() -> None:
                 # workspace.
                 #
                 if modulename in _MODULE_TABLE: continue
+                if modulename in added: continue
                 if (module := sys.modules.get(modulename)) is None: continue
                 if (spec := module.__spec__) is None: continue
                 if not _has_source_file(spec): continue
                 assert (file := spec.origin) is not None
                 if not _in_workspace(file): continue
-                #
-                # Start tracking the dependee.
-                #
-                newinfo = _ModuleInfo(module)
                 assert modulename == module.__name__
-                _MODULE_TABLE[modulename] = newinfo
-                added.append(newinfo)
-        if not added: break
-        cohort = added
+                added[modulename] = module
+        if added:
+            _track_cohort(added)
+        for modulename, info in cohort:
+            checked.add(modulename)
+            if (_UNCHECKED.get(modulename) is info and
+                    modulename not in _OUTDATED):
+                del _UNCHECKED[modulename]
+
+#
+# Start tracking a cohort of modules for _track_new_indirects(), adding them
+# to _MODULE_TABLE in order.  If the cohort is large enough and a process or
+# thread pool is available, we analyze the modules concurrently, but still
+# add them in order.  A failed concurrent analysis is repeated in this process
+# to raise the usual exception, so the modules added before the failure are
+# the same as if we analyzed sequentially.
+#
+
+_PARALLEL_MIN = 8
+
+def _track_cohort(modules:dict[str,ModuleType]) -> None:
+
+    global _PROCESS_POOL
+
+    pool:Executor|None = _process_pool() or _POOL
+
+    if pool is None or len(modules) < _PARALLEL_MIN:
+        for modulename, module in modules.items():
+            _insert(modulename,_ModuleInfo(module))
+        return
+
+    infos = [ _ModuleInfo(module,analyze=False)
+              for module in modules.values() ]
+
+    jobs:list[tuple[str,str,bool,bool,bool]] = []
+    for info in infos:
+        if info.analyzed_stamp != info.stamp:
+            assert info.file is not None
+            jobs.append((info.file, info.parent, _SCAN, _IGNORE_TYPING,
+                         _FINGERPRINT))
+
+    analyses:list[_Analysis|None]
+    try:
+        if isinstance(pool,ProcessPoolExecutor):
+            chunksize = max(1, len(jobs) // (_PROCESSES * 4))
+            analyses = list(pool.map(_analyze_file,jobs,chunksize=chunksize))
+        else:
+            analyses = list(pool.map(_analyze_file,jobs))
+    except BrokenExecutor:
+        if pool is _PROCESS_POOL:
+            _PROCESS_POOL.shutdown(wait=False)
+            _PROCESS_POOL = None
+        analyses = [ None ] * len(jobs)
+
+    pending = iter(analyses)
+
+    for modulename, info in zip(modules,infos):
+        if info.analyzed_stamp != info.stamp:
+            info.analyze_file(next(pending))
+        _insert(modulename,info)
 
 #
 # Ensure module is tracked.
@@ -361,9 +1587,84 @@ def _track(module:ModuleType) -> _ModuleInfo:
     modulename = module.__name__
     if (info := _MODULE_TABLE.get(modulename)) is None:
         info = _ModuleInfo(module)
-        _MODULE_TABLE[modulename] = info
+        _insert(modulename,info)
     return info
 
+#
+# Reload a tracked module.  If analysis parsed the module's source, we avoid
+# parsing it again by temporarily installing a _ParsedFinder at the front of
+# sys.meta_path.  The finder finds the module's spec as usual, but replaces a
+# standard source file loader with a _ParsedLoader that compiles the syntax
+# tree analysis produced, provided the loader reads exactly the source that
+# analysis parsed.  Otherwise, the reload proceeds exactly as usual, and
+# either way the import system still writes bytecode files and initializes
+# the module from its spec.  Afterward, we put a standard loader back so no
+# syntax tree lingers.
+#
+
+class _ParsedLoader(SourceFileLoader):
+
+    def __init__(self, fullname:str, path:str, parsed:_Parsed):
+        super().__init__(fullname,path)
+        self.parsed:_Parsed|None = parsed
+
+    def source_to_code(self, data, path, *, _optimize=-1):  #type:ignore
+        parsed, self.parsed = self.parsed, None
+        if parsed is not None and _optimize == -1 and data == parsed[0]:
+            return compile(parsed[1], path, 'exec', dont_inherit=True)
+        return super().source_to_code(data,path,_optimize=_optimize)
+
+
+class _ParsedFinder:
+    __slots__ = "info", "parsed"
+
+    info   : _ModuleInfo
+    parsed : _Parsed
+
+    def __init__(self, info:_ModuleInfo, parsed:_Parsed):
+        self.info   = info
+        self.parsed = parsed
+
+    def find_spec(self, fullname:str, path:Any, target:Any=None) -> Any:
+        if fullname != self.info.module.__name__:
+            return None
+        for finder in sys.meta_path:
+            if finder is self: continue
+            if (find_spec := getattr(finder,'find_spec',None)) is None:
+                continue
+            if (spec := find_spec(fullname,path,target)) is not None:
+                break
+        else:
+            return None
+        if (type(spec.loader) is SourceFileLoader and
+                spec.origin == self.info.file):
+            spec.loader = _ParsedLoader(fullname,spec.origin,self.parsed)
+        return spec
+
+
+def _reload(info:_ModuleInfo) -> None:
+
+    if (parsed := info.parsed) is None:
+        reload(info.module)
+        return
+
+    info.parsed = None
+    finder = _ParsedFinder(info,parsed)
+    sys.meta_path.insert(0,finder)
+
+    try:
+        reload(info.module)
+    finally:
+        if finder in sys.meta_path:
+            sys.meta_path.remove(finder)
+        module = info.module
+        if (spec := module.__spec__) is not None:
+            if isinstance(loader := spec.loader,_ParsedLoader):
+                loader = SourceFileLoader(loader.name,loader.path)
+                spec.loader = loader
+                if isinstance(module.__loader__,_ParsedLoader):
+                    module.__loader__ = loader
+
 #
 # Register a piece of an import statement.  _register_piece() also verifies
 # there is evidence that an encompassing import statement was actually
@@ -417,6 +1718,7 @@ def _register_piece(namespace:dict[str,Any], journal:_Journal,
 #                               PUBLIC API
 ##############################################################################
 
+@_synchronized
 def register(namespace:dict[str,Any], importstmts:str,
              *, package:str='', clear:bool=False,
              allow_other_statements:bool=False) -> None:
@@ -518,6 +1820,7 @@ def register(namespace:dict[str,Any], importstmts:str,
 
     are perfectly fine.
     """
+
     #
     # Extract the import directives from Python source, construct an equivalent
     # journal, and start tracking referenced modules.  Non-import statements
@@ -605,6 +1908,7 @@ def register(namespace:dict[str,Any], importstmts:str,
         for info in _MODULE_TABLE.values():
             if nsid in info.attachedto:
                 info.attachedto.remove(nsid)
+                _invalidate_graph()
         nsinfo.journal = []
 
     if not journal:
@@ -622,7 +1926,9 @@ def register(namespace:dict[str,Any], importstmts:str,
     #
 
     for info in attachments:
-        info.attachedto.add(nsid)
+        if nsid not in info.attachedto:
+            info.attachedto.add(nsid)
+            _invalidate_graph()
 
     (combined := nsinfo.journal).extend(journal)
     nsinfo.journal = _journal_compact(combined)
@@ -634,7 +1940,10 @@ def register(namespace:dict[str,Any], importstmts:str,
     _track_new_indirects()
 
 
-def sync(*, observer:Callable[[ReloadEvent],None]|None=None) -> None:
+@_synchronized
+def sync(*, observer:Callable[[ReloadEvent],None]|None=None,
+         namespace:dict[str,Any]|None=None,
+         modules:Iterable[str]|None=None) -> None:
     """
     Bring all registered imports up to date.  This includes reloading
     out-of-date tracked modules and rebinding imported names.  A tracked
@@ -644,118 +1953,129 @@ def sync(*, observer:Callable[[ReloadEvent],None]|None=None) -> None:
     "Depends on" is a strict partial order LiveImport computes between tracked
     modules based on the top level import statements in those modules.  In most
     cases, those imports naturally define a strict partial order.  If they do
-    not (meaning there is an import cycle), LiveImport ignores the imports by
-    more recently tracked modules that prevent it.
+    not (meaning there is an import cycle), LiveImport treats the modules in
+    the cycle as a unit: if any of them reloads, all of them do, ordered by
+    ignoring the imports by more recently tracked modules in the cycle.
 
     :func:`sync()` guarantees that reload order is consistent with the "depends
     on" partial order, so if A depends on B, then B will reload before A.
 
-    :func:`sync()` uses source file modification times to determine if a module
-    has changed.  Any change triggers a reload, including being reset to an
-    older time.  (So reverted modules reload.)
+    :func:`sync()` uses source file modification times (to the nanosecond),
+    sizes, and inode numbers to determine if a module has changed.  Any change
+    triggers a reload, including being reset to an older time or replaced by
+    a file with the same time.  (So reverted modules reload.)  If
+    fingerprinting is enabled (see :func:`configure()`), a module whose
+    modification time changed does not reload if its content is identical to
+    the version last loaded.  Reverted modules still reload if their content
+    differs from the version last loaded.
 
     :param observer: If given, :func:`sync()` calls `observer` with a
       :class:`ReloadEvent` describing each successful reload.
 
+    :param namespace: If given, limit the sync to the modules imported into
+      `namespace` by registered imports and the modules they depend on.
+
+    :param modules: If given, limit the sync to the named tracked modules and
+      the modules they depend on.  If both `namespace` and `modules` are
+      given, the sync includes the modules of both.  A limited sync leaves
+      other out-of-date modules as they are, including modules that depend on
+      modules it reloads, for a later sync to reload.
+
     :raises ModuleError: The content of a tracked module is erronous or raised
         an exception when executed during a reload.
 
+    :raises ValueError: A module named by `modules` is not tracked.
+
     .. note::
         Unless automatic syncing is disabled, calling :func:`sync()` in a
         notebook should not be necessary.
     """
+    global _SYNCED_COUNT, _RELOAD_COUNT
+
     #
-    # Determine if any modules have been updated, preparing to schedule
-    # topologically by clearing marks.  We refresh dependencies of modified
-    # modules to make the dependency information current for the topological
-    # sort.  We defer adjusting info.mtime so that reload() exceptions will
-    # leave modules in an out-of-date state.
+    # Determine if any modules have been updated, and if so, schedule reloads
+    # with _schedule().  _detect_changes() refreshes dependencies of
+    # modified modules to make the dependency information current for the
+    # topological sort, after waiting for modified source
+    # files to settle if so configured.  We defer adjusting info.stamp so that
+    # reload() exceptions will leave modules in an out-of-date state.  If a
+    # background thread is maintaining change information, we may be able to
+    # skip all of that.  A scoped sync only analyzes modules within its scope
+    # and can leave modules outdated or pending, so only an unscoped sync
+    # updates _SYNCED_COUNT.
     #
 
-    any_updates = False
-
-    for info in _MODULE_TABLE.values():
-        info.mark = 0
-        current_mtime = _mtime_if_exists(info.file)
-        if current_mtime is None:
-            #
-            # The module source file is missing.  Pre-mark the module as "Visit
-            # complete; will not reload".  (See below).  That prevents the
-            # topological sort from visiting the module, and ensures the module
-            # will not be added to the reload schedule.
-            #
-            info.mark = 2
-        elif current_mtime != info.mtime:
-            info.next_mtime = current_mtime
-            info.analyze_dependencies()
-            any_updates = True
+    scope = _scope(namespace,modules)
 
-    if not any_updates:
+    if _unchanged_since_sync():
         return
 
-    #
-    # At least one module is out of date.  Schedule reloads ordered
-    # topologically by module dependency, including reloads of modules that
-    # haven't changed but depend on modules that will reload.
-    #
-    # Mark intepretation:
-    #
-    #   0 - Unvisited
-    #   1 - On current depth first traversal path
-    #   2 - Visit complete; will not reload
-    #   3 - Visit complete; will reload
-    #
-    # The roots of the depth first search are the directly imported modules.
-    # That way we don't reload indirect modules if they no longer have
-    # dependants.
-    #
+    _detect_changes(_SETTLE,scope=scope)
+    _apply_records()
 
-    schedule:list[tuple[_ModuleInfo,list[str]]] = []
-
-    def visit(info:_ModuleInfo):
-        info.mark = 1
-        dependent_reload = []
-        for othername in info.dependencies:
-            if (otherinfo := _MODULE_TABLE.get(othername)) is not None:
-                if otherinfo.mark == 1: continue
-                if otherinfo.mark == 0: visit(otherinfo)
-                if otherinfo.mark == 3: dependent_reload.append(othername)
-        if dependent_reload or info.next_mtime != info.mtime:
-            info.mark = 3
-            schedule.append((info,dependent_reload))
-        else:
-            info.mark = 2
+    if not _OUTDATED and not _PENDING:
+        _SYNCED_COUNT = _CHANGE_COUNT
+        _track_new_indirects()
+        return
 
-    for info in _MODULE_TABLE.values():
-        if info.mark == 0 and info.attachedto:
-            visit(info)
+    cone = None if scope is None else _cone(scope)
+    schedule = _schedule(cone)
 
     if not schedule:
+        if scope is None:
+            _SYNCED_COUNT = _CHANGE_COUNT
+        _track_new_indirects()
         return
 
     #
-    # Execute the reloads.  Because we defer updating info.mtime, if there is a
+    # Execute the reloads.  Because we defer updating info.stamp, if there is a
     # reload error, sync() will try again after the user fixes the issue.  We
     # break the loop and re-raise further down on error since some modules may
     # have successfully reloaded, so we need to apply the journal to maintain
-    # consistency.
+    # consistency.  If failures are cached, we don't repeat a failed reload
+    # unless the module or a module it depends on has changed since.  If
+    # failures are isolated, we instead block the modules depending on the
+    # failed module and carry on, unless the reload was interrupted.
     #
 
-    reload_error = None
+    failures:list[ModuleError] = []
+    blocked:set[int] = set()
 
     for info, dependent_reload in schedule:
-        module = info.module
-        try:
-            reload(module)
-        except BaseException as ex:
-            reload_error = ex
-            break
+        if info.position in blocked:
+            continue
+        if (cause := _cached_failure(info,_reload_key)) is None:
+            prior = (None if _RECORDER is None else
+                     _RECORDER.begin(info.module.__name__))
+            try:
+                _reload(info)
+            except BaseException as ex:
+                if _RECORDER is not None:
+                    _RECORDER.restore(info.module.__name__,prior)
+                _record_failure(info,_reload_key(info),ex)
+                cause = ex
+        if cause is not None:
+            failures.append(error := ModuleError(info.module.__name__,
+                                                 "reload"))
+            error.__cause__ = cause
+            if not (_ISOLATE_FAILURES and isinstance(cause,Exception)):
+                break
+            _block_dependents(info,blocked)
+            continue
+        _RELOAD_COUNT += 1
+        info.reloaded = _RELOAD_COUNT
+        info.failure = None
+        assert (next_stamp := info.next_stamp) is not None
+        modified = next_stamp != info.stamp
         if observer is not None:
-            observer(ReloadEvent(
-                info.module.__name__,
-                "modified" if info.next_mtime != info.mtime else "dependent",
-                info.next_mtime, list(dependent_reload)))
-        info.mtime = info.next_mtime
+            observer(_reload_event(info,dependent_reload))
+        if modified:
+            info.stamp = next_stamp
+            info.fingerprint = info.next_fingerprint
+        _OUTDATED.pop(info.module.__name__,None)
+        _PENDING.pop(info.module.__name__,None)
+        if cone is not None:
+            _defer_dependents(info,cone)
 
     #
     # Apply rebind journals related to reloaded modules.
@@ -769,8 +2089,13 @@ def sync(*, observer:Callable[[ReloadEvent],None]|None=None) -> None:
         nsinfo = _NAMESPACE_TABLE[nsid]
         _journal_apply(nsinfo.journal,nsinfo.namespace)
 
-    if reload_error is not None:
-        raise ModuleError(info.module.__name__,"reload") from reload_error
+    if failures:
+        error = failures[0]
+        error.failures = failures
+        raise error from error.__cause__
+
+    if scope is None:
+        _SYNCED_COUNT = _CHANGE_COUNT
 
     #
     # We check for new indirects after reloads since we need new indirects to
@@ -780,6 +2105,291 @@ def sync(*, observer:Callable[[ReloadEvent],None]|None=None) -> None:
     _track_new_indirects()
 
 
+@_synchronized
+def plan(*, namespace:dict[str,Any]|None=None,
+         modules:Iterable[str]|None=None) -> list[ReloadEvent]:
+    """
+    Return the reloads :func:`sync()` would perform if called now, in order,
+    without reloading modules or rebinding names.  :func:`plan()` detects
+    changes and orders reloads exactly as :func:`sync()` does, so the
+    :class:`ReloadEvent` objects it returns are those :func:`sync()` would
+    pass to its observer if every reload succeeded and no module changed in
+    the meantime.  The result is empty if no tracked module is out-of-date.
+    Unlike :func:`sync()`, :func:`plan()` does not wait for modified source
+    files to settle (see :func:`configure()`), and it leaves modules it finds
+    unchanged by fingerprint for the next sync to bring up to date.
+
+    Use :func:`plan()` to estimate the cost of a sync before it runs, for
+    example to warn about or defer syncs that would reload many modules.
+
+    :param namespace: If given, plan a sync limited to `namespace` as
+      described for :func:`sync()`.
+
+    :param modules: If given, plan a sync limited to `modules` as described
+      for :func:`sync()`.
+
+    :raises ModuleError: The content of a modified tracked module is erroneous.
+
+    :raises ValueError: A module named by `modules` is not tracked.
+    """
+
+    scope = _scope(namespace,modules)
+
+    if _unchanged_since_sync():
+        return []
+
+    unchanged = _detect_changes(0,preview=True,scope=scope)
+    _apply_records()
+
+    if not _OUTDATED and not _PENDING:
+        return []
+
+    cone = None if scope is None else _cone(scope)
+    return [ _reload_event(info,dependent_reload,unchanged)
+             for info, dependent_reload in _schedule(cone,unchanged) ]
+
+
+#
+# Return a ReloadEvent describing a reload of info scheduled by _schedule().
+#
+
+def _reload_event(info:_ModuleInfo, dependent_reload:list[str],
+                  unchanged:Container[str]=()) -> ReloadEvent:
+    assert (next_stamp := info.next_stamp) is not None
+    return ReloadEvent(
+        info.module.__name__,
+        "modified" if _modified(info,unchanged) else "dependent",
+        _stamp_time(next_stamp), list(dependent_reload))
+
+
+def configure(*, watch:bool|None=None,
+              background:bool|None=None,
+              scandir:bool|None=None,
+              fingerprint:bool|None=None,
+              settle:float|None=None,
+              threads:int|None=None,
+              cache_failures:bool|None=None,
+              diskcache:bool|str|PathLike|None=None,
+              scan:bool|None=None,
+              processes:int|None=None,
+              record_imports:bool|None=None,
+              ignore_typing:bool|None=None,
+              isolate_failures:bool|None=None) -> None:
+    """
+    Configure how LiveImport detects and processes module changes.  The
+    defaults suit most projects; the options exist for projects with many
+    tracked modules or slow file systems.  Options that are not given (or are
+    ``None``) are unchanged.
+
+    :param watch: If true, LiveImport asks the operating system to report
+        changes to the directories containing tracked source files, and a sync
+        only checks the modification times of source files in which changes
+        were reported.  Otherwise, every sync checks the modification time of
+        every tracked source file.  Watching is only available on Linux, where
+        it uses inotify.  If watching is unavailable, or the system limit on
+        watches is exhausted, LiveImport silently reverts to checking every
+        file.  Watching is disabled by default.
+
+    :param background: If true, a background thread detects changes between
+        syncs, including analyzing the imports of modified modules, leaving
+        less work for syncs to do.  With watching also enabled, the thread
+        handles changes as they are reported, and a sync when nothing has
+        changed returns immediately.  Background change detection is disabled
+        by default.
+
+    :param scandir: If true, LiveImport checks the modification times of
+        source files sharing a directory by reading the directory once rather
+        than checking each file separately.  That is most effective on
+        Windows, where directory reads include modification times, and on
+        network file systems that prefetch file attributes during directory
+        reads.  Directory reads are disabled by default.
+
+    :param fingerprint: If true, when the modification time of a tracked
+        source file changes, LiveImport compares the file's size and a hash of
+        its content with those of the version last loaded, and only reloads
+        the module if they differ.  That avoids reloads when tools such as
+        ``git checkout`` or code formatters rewrite files without changing
+        them.  Fingerprinting is disabled by default.
+
+    :param settle: If positive, a sync waits until the source files of
+        modified modules have gone unmodified for `settle` seconds before
+        reloading them.  That avoids reloading files that editors, code
+        generators, or tools like ``git rebase`` are still writing, and
+        reloads a burst of changes all at once.  `settle` may be at most 5
+        seconds, and a sync waits no more than 5 seconds in total, so files
+        that keep changing longer than that are reloaded anyway.  The default
+        is 0 (no waiting).
+
+    :param threads: If greater than 1, LiveImport checks source files and
+        reads modified source files using a pool of `threads` threads.  That
+        can make syncs much faster on network file systems with high latency.
+        Reloads still happen one at a time in the same order.  The default is
+        0 (no thread pool).
+
+    :param cache_failures: If true, when the analysis or reload of a modified
+        module fails, later syncs raise the same :exc:`ModuleError` without
+        repeating the analysis or reload until the module's source file or a
+        module it depends on changes.  That avoids repeatedly executing a
+        broken module and its dependents, but means a reload that failed for
+        reasons outside the tracked modules (such as a missing data file) is
+        not retried until the module is modified or touched.  Failure caching
+        is disabled by default.
+
+    :param diskcache: If true, LiveImport saves the results of analyzing the
+        imports of source files in a per-user cache directory, so that after a
+        kernel restart, only source files that changed are analyzed again.  If
+        a path string or path-like object, LiveImport uses that directory
+        instead.  Disk caching is disabled by default.
+
+    :param scan: If true, LiveImport finds the top level imports of a module
+        by scanning its source for import statements rather than parsing the
+        entire module, falling back to parsing if the scan is inconclusive.
+        That is much faster for large modules.  However, syntax errors outside
+        import statements are then reported when the module reloads rather
+        than beforehand.  Scanning is disabled by default.
+
+    :param processes: If greater than 1, when LiveImport starts tracking many
+        modules at once, such as when a notebook first registers an import of
+        a large package, it analyzes their imports using a pool of
+        `processes` worker processes.  Otherwise, if `threads` is greater
+        than 1, it uses the thread pool.  The worker processes start when
+        first needed.  They are only used in notebooks and other interactive
+        sessions, since in a script they would run the script again.  The
+        default is 0 (no process pool).
+
+    :param record_imports: If true, LiveImport records the modules each
+        module in the workspace actually imports as it executes, including
+        imports in functions and conditional blocks once they run, and uses
+        those recordings instead of analyzing source files.  Modules imported
+        before recording was enabled are analyzed as usual until they first
+        reload.  Since imports are only recorded when a module executes, a
+        modified module's new imports do not affect the order of the reloads
+        that execute it.  Recording is disabled by default.
+
+    :param ignore_typing: If true, LiveImport identifies imports that bind
+        names a module only uses in annotations that are not evaluated when
+        the module executes, such as under ``from __future__ import
+        annotations``, and does not reload the module just because a module
+        it imports that way reloads.  That avoids reloading large parts of
+        heavily annotated code bases, but modules that evaluate annotations
+        at runtime (as some serialization and validation libraries do) may
+        then use outdated types.  Imports in a package's ``__init__`` are
+        never ignored, since they are usually re-exports.  Identifying such
+        imports requires parsing entire modules, so `scan` has no effect, and
+        imports are not classified when recorded.  The option applies to
+        modules analyzed after it is enabled.  It is disabled by default.
+
+    :param isolate_failures: If true, when the reload of a module fails,
+        :func:`sync()` skips the modules that depend on it but continues
+        reloading the other modules it scheduled, so one broken module does
+        not keep unrelated modules outdated.  The :exc:`ModuleError` raised
+        at the end describes the first failure, and its `failures` attribute
+        lists an error for every module that failed.  Otherwise, the first
+        failure stops the sync.  Failure isolation is disabled by default.
+
+    .. note::
+        inotify does not report changes made to network file systems by other
+        hosts.  Do not enable watching if tracked source files are modified
+        that way.
+    """
+    global _WATCHER, _BACKGROUND, _SCANDIR, _FINGERPRINT, _SETTLE
+    global _THREADS, _POOL, _CACHE_FAILURES, _DISKCACHE, _SCAN
+    global _PROCESSES, _PROCESS_POOL, _RECORDER, _IGNORE_TYPING
+    global _ISOLATE_FAILURES
+
+    if settle is not None and not 0 <= settle <= _SETTLE_LIMIT:
+        raise ValueError(
+            f"settle must be a number from 0 to {_SETTLE_LIMIT:g} seconds")
+
+    if threads is not None and not (isinstance(threads,int) and threads >= 0):
+        raise ValueError("threads must be a non-negative integer")
+
+    if processes is not None and not (isinstance(processes,int) and
+                                      processes >= 0):
+        raise ValueError("processes must be a non-negative integer")
+
+    with _LOCK:
+        if isolate_failures is not None:
+            _ISOLATE_FAILURES = isolate_failures
+        if ignore_typing is not None:
+            _IGNORE_TYPING = ignore_typing
+        if record_imports is not None:
+            if not record_imports:
+                if _RECORDER is not None:
+                    _RECORDER.stop()
+                    _RECORDER = None
+            elif _RECORDER is None:
+                _RECORDER = _Recorder(_record_importer)
+        if processes is not None and processes != _PROCESSES:
+            if _PROCESS_POOL is not None:
+                _PROCESS_POOL.shutdown()
+                _PROCESS_POOL = None
+            _PROCESSES = processes
+        if scan is not None:
+            _SCAN = scan
+        if diskcache is not None:
+            if diskcache is False:
+                _DISKCACHE = None
+            elif diskcache is True:
+                _DISKCACHE = _DiskCache()
+            else:
+                _DISKCACHE = _DiskCache(diskcache)
+        if cache_failures is not None:
+            _CACHE_FAILURES = cache_failures
+            if not cache_failures:
+                for info in _MODULE_TABLE.values():
+                    info.failure = None
+        if settle is not None:
+            _SETTLE = settle
+        if threads is not None and threads != _THREADS:
+            if _POOL is not None:
+                _POOL.shutdown()
+                _POOL = None
+            _THREADS = threads
+            if threads > 1:
+                _POOL = ThreadPoolExecutor(
+                    threads, thread_name_prefix="liveimport-pool")
+        if scandir is not None:
+            _SCANDIR = scandir
+        if fingerprint is not None:
+            _FINGERPRINT = fingerprint
+        if watch is not None:
+            if not watch:
+                _stop_watching()
+            elif _WATCHER is None:
+                try:
+                    _WATCHER = _Watcher()
+                except OSError:
+                    _WATCHER = None
+                else:
+                    for info in _MODULE_TABLE.values():
+                        _watch(info)
+
+    #
+    # The background thread acquires _LOCK, so we must not hold it while
+    # waiting for the thread to stop.
+    #
+
+    if background is not None:
+        if not background:
+            if _BACKGROUND is not None:
+                _BACKGROUND.stop()
+                _BACKGROUND = None
+        elif _BACKGROUND is None:
+            _BACKGROUND = _Background()
+
+#
+# Restore the default configuration (for testing).
+#
+
+def _configure_defaults() -> None:
+    configure(watch=False, background=False, scandir=False,
+              fingerprint=False, settle=0.0, threads=0,
+              cache_failures=False, diskcache=False, scan=False,
+              processes=0, record_imports=False, ignore_typing=False,
+              isolate_failures=False)
+
+
 class ReloadEvent:
     """
     Describes a successful reload.  Attributes:
@@ -854,11 +2464,23 @@ class ModuleError(Exception):
         The issue LiveImport encountered.  This could be a source error, such
         as a :class:`SyntaxError`, or an exception raised while the module is
         executing during a reload.
+
+    .. attribute:: failures
+        :type: list[ModuleError]
+
+        An error for each module that failed, starting with this one.  Only
+        a sync with failure isolation enabled (see :func:`configure()`) can
+        report more than one.
     """
     def __init__(self, module:str, phase:str):
-        self.module = module
-        self.phase  = phase
+        self.module   = module
+        self.phase    = phase
+        self.failures = [ self ]
 
     def __str__(self) -> str:
-        return (f"{self.phase.capitalize()} of {self.module} failed: " +
-                str(self.__cause__))
\ No newline at end of file
+        result = (f"{self.phase.capitalize()} of {self.module} failed: " +
+                  str(self.__cause__))
+        if len(self.failures) > 1:
+            others = [ error.module for error in self.failures[1:] ]
+            result += f" (also failed: {', '.join(others)})"
+        return result
\ No newline at end of file
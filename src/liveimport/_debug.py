@@ -1,6 +1,9 @@
 import sys
 from typing import Any, TextIO
-from ._core import _MODULE_TABLE, _NAMESPACE_TABLE, _rebind_str
+from ._core import (
+    _MODULE_TABLE, _NAMESPACE_TABLE, _OUTDATED, _DIRTY, _UNCHECKED, _PENDING,
+    _rebind_str, _configure_defaults)
+from . import _core
 
 ##############################################################################
 #                              TEST AND DEBUG
@@ -13,7 +16,7 @@ from ._core import _MODULE_TABLE, _NAMESPACE_TABLE, _rebind_str
 def _dump(file:TextIO|None=None):
     for name, info in sorted(_MODULE_TABLE.items()):
         print(f"Module {name} parent={info.parent}"
-              f" mtime={info.mtime} file={info.file}"
+              f" stamp={info.stamp} file={info.file}"
               f" dependencies={info.dependencies}",
               f" attachedto={info.attachedto}", file=file)
     for id, info in sorted(_NAMESPACE_TABLE.items()):
@@ -88,12 +91,19 @@ def _hash_state() -> int:
     return hashcode
 
 #
-# Clear the module and namespace tables (for testing).
+# Clear the module and namespace tables and restore the default configuration
+# (for testing).
 #
 
 def _clear_all_state():
+    _configure_defaults()
     _MODULE_TABLE.clear()
     _NAMESPACE_TABLE.clear()
+    _OUTDATED.clear()
+    _DIRTY.clear()
+    _UNCHECKED.clear()
+    _PENDING.clear()
+    _core._GRAPH = None
 
 #
 # Verify (for testing and debugging)
@@ -102,6 +112,9 @@ def _clear_all_state():
 #    + all name and '*' rebinds are for tracked modules
 #    + all tracked modules are loaded
 #    + all tracked module names are correct
+#    + all outdated, dirty, unchecked, and pending modules are tracked
+#    + the cached dependency graph, if any, reflects tracked module
+#      dependencies
 #
 
 def _verify():
@@ -119,6 +132,34 @@ def _verify():
                 f"Module {modulename} attachedto {nsid} namespace missing")
             attachedto_union.add(nsid)
 
+    for modulename, info in (*_OUTDATED.items(), *_DIRTY.items(),
+                             *_UNCHECKED.items()):
+        assert _MODULE_TABLE.get(modulename) is info, (
+            f"Outdated, dirty, or unchecked module {modulename} "
+            f"is not tracked")
+
+    for modulename in _PENDING:
+        assert modulename in _MODULE_TABLE, (
+            f"Pending module {modulename} is not tracked")
+
+    if (graph := _core._GRAPH) is not None:
+        for position, info in enumerate(graph.modules):
+            assert info.position == position, (
+                f"Module {info.module.__name__} has the wrong graph position")
+            assert info.indexed is info.dependencies, (
+                f"Module {info.module.__name__} has unindexed dependencies")
+            assert ([ graph.modules[other] for other in
+                      graph.dependencies[position] ] ==
+                    [ otherinfo for otherinfo in info.tracked_dependencies()
+                      if otherinfo.next_stamp is not None ]), (
+                f"Module {info.module.__name__} has stale graph edges")
+            for other in graph.dependencies[position]:
+                assert position in graph.dependents[other], (
+                    f"Module {info.module.__name__} is not a dependent")
+        for modulename in _PENDING:
+            assert _MODULE_TABLE[modulename].position >= 0, (
+                f"Pending module {modulename} is not in the graph")
+
     for nsid, nsinfo in _NAMESPACE_TABLE.items():
         assert nsid in attachedto_union, (
             f"Namespace {nsid} has no attachments")
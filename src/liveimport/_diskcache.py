@@ -0,0 +1,139 @@
+from __future__ import annotations
+import os
+import sys
+import json
+import hashlib
+import tempfile
+from typing import Any
+
+
+##############################################################################
+#                          PERSISTENT ANALYSIS CACHE
+##############################################################################
+
+#
+# A _DiskCache persists the results of dependency analysis across processes
+# so that tracking modules after a kernel restart only parses source files
+# that changed.  There is one small JSON file per source file, named by a hash
+# of the source file's absolute path.  An entry is only used if it describes
+# exactly the same version of the source file (by stamp), the same parent
+# package (which determines how relative imports resolve), the same Python
+# implementation, and the same entry format.  Increase _VERSION whenever the
+# format or the meaning of analysis results changes.
+#
+# Entries are replaced atomically by writing a temporary file and renaming
+# it, so concurrent processes never see partial entries.  The worst a race
+# between processes can do is replace an entry with another valid entry.
+# The cache is only an optimization, so all I/O and format errors are
+# ignored.
+#
+
+_VERSION = 2
+
+#
+# Return the conventional per-user cache directory for the platform.
+#
+
+def _default_dir() -> str:
+    if sys.platform == 'win32':
+        base = (os.environ.get('LOCALAPPDATA') or
+                os.path.expanduser('~\\AppData\\Local'))
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Caches')
+    else:
+        base = (os.environ.get('XDG_CACHE_HOME') or
+                os.path.expanduser('~/.cache'))
+    return os.path.join(base,'liveimport')
+
+
+class _DiskCache:
+    __slots__ = "dir", "tag"
+
+    dir : str           # directory holding entries
+    tag : str           # identifies the Python implementation
+
+    def __init__(self, dir:str|os.PathLike|None=None):
+        if dir is None:
+            dir = _default_dir()
+        self.dir = os.path.join(os.path.abspath(dir), f"analysis-{_VERSION}")
+        self.tag = str(sys.implementation.cache_tag)
+
+    def _entry_file(self, file:str) -> str:
+        digest = hashlib.blake2b(os.fsencode(file),digest_size=16).hexdigest()
+        return os.path.join(self.dir, digest + ".json")
+
+    def _key(self, file:str, stamp:tuple[int,...],
+             parent:str) -> dict[str,Any]:
+        return { "version" : _VERSION,
+                 "python"  : self.tag,
+                 "file"    : file,
+                 "stamp"   : list(stamp),
+                 "parent"  : parent }
+
+    #
+    # Return the dependencies, those only needed for type checking (or None
+    # if not classified), and fingerprint (or None) recorded for a version of
+    # a source file, or None if there is no valid entry for that version.
+    #
+
+    def load(self, file:str, stamp:tuple[int,...], parent:str
+             ) -> tuple[list[str],list[str]|None,
+                        tuple[int,bytes]|None]|None:
+
+        file = os.path.abspath(file)
+
+        try:
+            with open(self._entry_file(file),'rb') as f:
+                entry = json.load(f)
+            if not isinstance(entry,dict):
+                return None
+            for name, value in self._key(file,stamp,parent).items():
+                if entry.get(name) != value:
+                    return None
+            dependencies = entry["dependencies"]
+            if not (isinstance(dependencies,list) and
+                    all(isinstance(name,str) for name in dependencies)):
+                return None
+            typing_only = entry.get("typing")
+            if not (typing_only is None or
+                    (isinstance(typing_only,list) and
+                     all(isinstance(name,str) for name in typing_only))):
+                return None
+            fingerprint = None
+            if (value := entry.get("fingerprint")) is not None:
+                fingerprint = (int(value[0]), bytes.fromhex(value[1]))
+        except (OSError, ValueError, LookupError, TypeError):
+            return None
+
+        return dependencies, typing_only, fingerprint
+
+    #
+    # Record the dependencies, those only needed for type checking (if
+    # classified), and fingerprint (if known) of a version of a source file.
+    #
+
+    def store(self, file:str, stamp:tuple[int,...], parent:str,
+              dependencies:list[str], typing_only:list[str]|None,
+              fingerprint:tuple[int,bytes]|None) -> None:
+
+        file = os.path.abspath(file)
+
+        entry = self._key(file,stamp,parent)
+        entry["dependencies"] = dependencies
+        if typing_only is not None:
+            entry["typing"] = typing_only
+        if fingerprint is not None:
+            entry["fingerprint"] = [ fingerprint[0], fingerprint[1].hex() ]
+
+        try:
+            os.makedirs(self.dir,exist_ok=True)
+            fd, temp = tempfile.mkstemp(dir=self.dir,prefix='.',suffix='.tmp')
+            try:
+                with os.fdopen(fd,'w') as f:
+                    json.dump(entry,f)
+                os.replace(temp,self._entry_file(file))
+            except BaseException:
+                os.unlink(temp)
+                raise
+        except OSError:
+            pass
@@ -0,0 +1,117 @@
+from __future__ import annotations
+from array import array
+from typing import Callable, Hashable, Iterable, TypeVar
+
+_N = TypeVar('_N', bound=Hashable)
+
+
+##############################################################################
+#                        STRONGLY CONNECTED COMPONENTS
+##############################################################################
+
+#
+# _strong_components() returns the strongly connected components of the
+# graph reachable from roots, where successors(node) lists the nodes a node
+# has edges to.  It is Tarjan's algorithm with an explicit stack instead of
+# recursion, so it handles arbitrarily long paths in time linear in the size
+# of the graph.
+#
+# Nodes and successors are visited in the order given, so the result is
+# deterministic.  Each component follows every component reachable from it,
+# and lists its members in the order their depth first search visits finish.
+# On acyclic graphs, every component has one member, and the components in
+# sequence are the post-order of a recursive depth first search from the
+# roots.  Within a cycle, that order ignores the edges back to nodes on the
+# search path.
+#
+
+def _strong_components(roots:Iterable[_N],
+                       successors:Callable[[_N],Iterable[_N]]
+                       ) -> list[list[_N]]:
+
+    components:list[list[_N]] = []
+    index:dict[_N,int] = dict()     # in order first visited
+    lowlink:dict[_N,int] = dict()   # least index reachable on the stack
+    finish:dict[_N,int] = dict()    # in order visits finish
+    depth:dict[_N,int] = dict()     # position in stack while on it
+    stack:list[_N] = []
+
+    for root in roots:
+        if root in index:
+            continue
+        index[root] = lowlink[root] = len(index)
+        depth[root] = len(stack)
+        stack.append(root)
+        path = [ (root, iter(successors(root))) ]
+        while path:
+            node, rest = path[-1]
+            for other in rest:
+                if other not in index:
+                    index[other] = lowlink[other] = len(index)
+                    depth[other] = len(stack)
+                    stack.append(other)
+                    path.append((other, iter(successors(other))))
+                    break
+                if other in depth and index[other] < lowlink[node]:
+                    lowlink[node] = index[other]
+            else:
+                path.pop()
+                finish[node] = len(finish)
+                low = lowlink[node]
+                if path and low < lowlink[parent := path[-1][0]]:
+                    lowlink[parent] = low
+                if low == index[node]:
+                    component = stack[depth[node]:]
+                    del stack[depth[node]:]
+                    for member in component:
+                        del depth[member]
+                    if len(component) > 1:
+                        component.sort(key=finish.__getitem__)
+                    components.append(component)
+
+    return components
+
+
+##############################################################################
+#                             COMPACT ADJACENCY
+##############################################################################
+
+#
+# An _Adjacency represents the edges of a graph whose nodes are numbered from
+# zero in two arrays, compressed sparse row style: the targets of the edges
+# from node i are targets[offsets[i]:offsets[i+1]].  That takes a few bytes
+# per edge rather than the dozens a list or dictionary entry takes, and
+# traversals compare integers rather than hashing names.
+#
+
+class _Adjacency:
+    __slots__ = "offsets", "targets"
+
+    offsets : array[int]   # node -> first index in targets, plus end
+    targets : array[int]   # edge targets, grouped by source node
+
+    def __init__(self, edges:Iterable[Iterable[int]]=()):
+        self.offsets = array('I',[ 0 ])
+        self.targets = array('I')
+        for nodes in edges:
+            self.targets.extend(nodes)
+            self.offsets.append(len(self.targets))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, node:int) -> array[int]:
+        return self.targets[self.offsets[node]:self.offsets[node+1]]
+
+    #
+    # Return the adjacency with every edge reversed.  Each node's sources are
+    # listed in increasing order.
+    #
+
+    def reverse(self) -> _Adjacency:
+        offsets, targets = self.offsets, self.targets
+        sources:list[list[int]] = [ [] for _ in range(len(self)) ]
+        for node in range(len(self)):
+            for target in targets[offsets[node]:offsets[node+1]]:
+                sources[target].append(node)
+        return _Adjacency(sources)
@@ -0,0 +1,133 @@
+from __future__ import annotations
+import builtins
+from typing import Any, Callable
+
+
+##############################################################################
+#                              IMPORT RECORDING
+##############################################################################
+
+#
+# A _Recorder replaces builtins.__import__ to record, for each importing
+# module, the names of the modules it actually imports.  Unlike dependency
+# analysis, that includes imports in functions and conditionals, but only
+# once they execute.  Since __import__ is called by every import statement
+# execution, including those for modules already loaded, a recording made
+# while a module executes lists all modules it imports at the top level.
+#
+# Names are recorded the same way dependency analysis reports them: an
+# import of A.B records "A.B", and "from A import B" records "A" and "A.B"
+# whether or not A.B is a module.  Relative imports are resolved against the
+# importer's package.
+#
+# The accept function decides which importers to record, given the
+# importer's name and file (or None).  Recording must never make an import
+# fail, so recording errors are ignored.  The recorder takes no locks, since
+# imports can run in any thread, including while a thread holding the
+# LiveImport lock waits for the import lock.
+#
+
+class _Recorder:
+    __slots__ = "records", "recorded", "accept", "original", "stopped"
+
+    records  : dict[str,dict[str,None]]       # importer -> imported names
+    recorded : dict[str,None]                 # importers changed since take()
+    accept   : Callable[[str,str|None],bool]  # importers to record
+    original : Callable[...,Any]              # replaced __import__
+    stopped  : bool
+
+    def __init__(self, accept:Callable[[str,str|None],bool]):
+        self.records  = dict()
+        self.recorded = dict()
+        self.accept   = accept
+        self.original = builtins.__import__
+        self.stopped  = False
+        builtins.__import__ = self.import_
+
+    #
+    # Restore the original __import__ if nothing replaced it since.
+    # Otherwise, whatever replaced it still calls us, so we just stop
+    # recording.
+    #
+
+    def stop(self) -> None:
+        self.stopped = True
+        if builtins.__import__ == self.import_:
+            builtins.__import__ = self.original
+
+    def import_(self, name:str, globals:Any=None, locals:Any=None,
+                fromlist:Any=(), level:int=0) -> Any:
+        module = self.original(name,globals,locals,fromlist,level)
+        if not self.stopped and globals is not None:
+            try:
+                self.record(name,globals,fromlist,level)
+            except Exception:
+                pass
+        return module
+
+    def record(self, name:str, globals:dict[str,Any], fromlist:Any,
+               level:int) -> None:
+
+        if not isinstance(importer := globals.get('__name__'),str):
+            return
+        if not self.accept(importer,globals.get('__file__')):
+            return
+
+        if level > 0:
+            package = globals.get('__package__')
+            if package is None:
+                package = (importer if '__path__' in globals else
+                           importer.rpartition('.')[0])
+            bits = package.rsplit('.',level-1)
+            if len(bits) < level or not bits[0]:
+                return
+            name = f"{bits[0]}.{name}" if name else bits[0]
+
+        names = [ name ]
+        if fromlist:
+            names.extend(f"{name}.{item}" for item in fromlist
+                         if item != '*')
+
+        if (record := self.records.get(importer)) is None:
+            record = self.records[importer] = dict()
+        for name in names:
+            if name not in record and name != importer:
+                record[name] = None
+                self.recorded[importer] = None
+
+    #
+    # Start a new recording for a module about to execute, returning the
+    # prior recording for restore() in case execution fails.
+    #
+
+    def begin(self, importer:str) -> dict[str,None]|None:
+        prior = self.records.get(importer)
+        self.records[importer] = dict()
+        self.recorded[importer] = None
+        return prior
+
+    def restore(self, importer:str, prior:dict[str,None]|None) -> None:
+        if prior is None:
+            self.records.pop(importer,None)
+        else:
+            self.records[importer] = prior
+        self.recorded.pop(importer,None)
+
+    #
+    # Return the recorded imports of an importer, or None if there is no
+    # recording.
+    #
+
+    def get(self, importer:str) -> list[str]|None:
+        record = self.records.get(importer)
+        return None if record is None else list(record)
+
+    #
+    # Return the importers whose recordings changed since the last call.
+    #
+
+    def take(self) -> list[str]:
+        result = list(self.recorded)
+        for importer in result:
+            self.recorded.pop(importer,None)
+        return result
@@ -0,0 +1,112 @@
+from __future__ import annotations
+import re
+import ast
+
+
+##############################################################################
+#                              IMPORT SCANNING
+##############################################################################
+
+#
+# _scan_imports() finds the top level import statements of a module's source
+# without parsing the entire module, which is much faster for large modules
+# dominated by code or data other than imports.  It returns the same Import
+# and ImportFrom nodes ast.parse() would include in the module body, or None
+# if the source is ambiguous, in which case callers should parse the entire
+# module instead.
+#
+# Top level import statements begin at the start of a line with "import" or
+# "from".  Such a line might instead be part of a string spanning lines, so we
+# lex strings and comments up to the last candidate line to exclude those.
+# A candidate inside brackets (which would have to be part of "yield from" or
+# "raise ... from") fails to parse as a statement, making the source
+# ambiguous.  We parse each candidate statement by itself, extending it to the
+# closing parenthesis of a parenthesized name list or past backslash
+# continuations.  Since we only parse import statements, syntax errors
+# elsewhere in the module go unnoticed.
+#
+# Imports following a semicolon on a line that doesn't start with import or
+# from, and source that is not UTF-8, are ambiguous.  (That includes
+# semicolons in strings, which are rare enough.)
+#
+
+_CANDIDATE = re.compile(rb'^(?:import|from)\b', re.MULTILINE)
+
+_AFTER_SEMICOLON = re.compile(rb';[ \t]*(?:import|from)\b')
+
+_LEXEME = re.compile(rb'''
+      [rRbBuUfF]{0,2}
+      (?: """ (?:\\.|[^\\])*? """
+        | \'\'\' (?:\\.|[^\\])*? \'\'\'
+        | " (?:\\.|[^"\\\n])* "
+        | \' (?:\\.|[^'\\\n])* \' )
+    | \#[^\n]*
+    | (?P<candidate> ^(?:import|from)\b )
+    ''', re.VERBOSE | re.MULTILINE | re.DOTALL)
+
+_CODING = re.compile(rb'^[ \t\f]*#.*?coding[:=][ \t]*([-\w.]+)')
+
+
+def _scan_imports(source:bytes) -> list[ast.Import|ast.ImportFrom]|None:
+
+    if source.startswith(b'\xef\xbb\xbf'):
+        source = source[3:]
+
+    #
+    # Check for an encoding declaration in the first two lines.
+    #
+
+    for line in source.split(b'\n',2)[:2]:
+        if (match := _CODING.match(line)) is not None:
+            if match.group(1).lower().replace(b'-',b'_') not in (
+                    b'utf_8', b'utf8'):
+                return None
+
+    candidates = [ match.start() for match in _CANDIDATE.finditer(source) ]
+
+    lines = set(candidates)
+    for match in _AFTER_SEMICOLON.finditer(source):
+        if source.rfind(b'\n',0,match.start()) + 1 not in lines:
+            return None
+
+    if not candidates:
+        return []
+
+    #
+    # Keep only candidates that are not in strings.
+    #
+
+    last = candidates[-1]
+    starts:list[int] = []
+
+    for match in _LEXEME.finditer(source):
+        start = match.start()
+        if start > last:
+            break
+        if match.lastgroup == 'candidate':
+            starts.append(start)
+
+    result:list[ast.Import|ast.ImportFrom] = []
+
+    for start in starts:
+        end = source.find(b'\n',start)
+        if end < 0: end = len(source)
+        paren = source.find(b'(',start,end)
+        if paren >= 0 and source.rfind(b'#',start,paren) < 0:
+            close = source.find(b')',paren)
+            if close < 0:
+                return None
+            end = source.find(b'\n',close)
+            if end < 0: end = len(source)
+        while source[start:end].rstrip(b'\r').endswith(b'\\'):
+            end = source.find(b'\n',end+1)
+            if end < 0: end = len(source)
+        try:
+            body = ast.parse(source[start:end].decode()).body
+        except (SyntaxError, UnicodeDecodeError, ValueError):
+            return None
+        for stmt in body:
+            if isinstance(stmt,(ast.Import,ast.ImportFrom)):
+                result.append(stmt)
+
+    return result
@@ -0,0 +1,200 @@
+from __future__ import annotations
+import os
+import sys
+import errno
+import select
+import struct
+from typing import Any
+
+
+##############################################################################
+#                              CHANGE WATCHING
+##############################################################################
+
+#
+# A _Watcher uses Linux inotify to learn which tracked source files may have
+# changed, so sync() can stat only those files instead of every tracked file.
+# We watch the parent directories of source files rather than the files
+# themselves because editors commonly save by writing a new file and renaming
+# it over the old one, which would silently end a watch on the old file.
+#
+# Keys are arbitrary objects (_ModuleInfo instances in practice) associated
+# with files.  changes() returns the keys of files that may have changed since
+# the prior call, or None if events were lost and the caller should assume
+# every file may have changed.
+#
+# We access inotify through ctypes to avoid a dependency.  _Watcher() raises
+# OSError if inotify is unavailable, and watch() raises OSError if the kernel
+# watch limit is exhausted.  Callers respond to either by falling back to
+# polling.
+#
+
+_IN_NONBLOCK    = 0o4000
+_IN_CLOEXEC     = 0o2000000
+
+_IN_MODIFY      = 0x00000002
+_IN_ATTRIB      = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM  = 0x00000040
+_IN_MOVED_TO    = 0x00000080
+_IN_CREATE      = 0x00000100
+_IN_DELETE      = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF   = 0x00000800
+_IN_Q_OVERFLOW  = 0x00004000
+_IN_IGNORED     = 0x00008000
+_IN_ONLYDIR     = 0x01000000
+
+_WATCH_MASK = (_IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE |
+               _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE |
+               _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+_LIBC:Any = None
+
+def _libc() -> Any:
+    global _LIBC
+    if _LIBC is None:
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS,"inotify requires Linux")
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.inotify_init1.argtypes = [ ctypes.c_int ]
+        libc.inotify_add_watch.argtypes = [
+            ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32 ]
+        libc.inotify_rm_watch.argtypes = [ ctypes.c_int, ctypes.c_int ]
+        _LIBC = libc
+    return _LIBC
+
+def _oserror() -> OSError:
+    import ctypes
+    code = ctypes.get_errno()
+    return OSError(code,os.strerror(code))
+
+
+class _Watcher:
+    __slots__ = "fd", "dirs", "wds", "orphans"
+
+    fd      : int                               # inotify file descriptor
+    dirs    : dict[str,dict[str,list[Any]]]     # dir -> name -> keys
+    wds     : dict[int,set[str]]                # watch descriptor -> dirs
+    orphans : dict[str,dict[str,list[Any]]]     # dirs whose watch was lost
+
+    def __init__(self):
+        libc = _libc()
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0: raise _oserror()
+        self.fd      = fd
+        self.dirs    = dict()
+        self.wds     = dict()
+        self.orphans = dict()
+
+    def fileno(self) -> int:
+        return self.fd
+
+    #
+    # Return true iff there are no unread events and no unwatched directories.
+    #
+
+    def idle(self) -> bool:
+        return (not self.orphans and
+                not select.select([ self.fd ], [], [], 0)[0])
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    #
+    # Watch a directory, returning False if it does not exist.  Note that
+    # inotify returns the same watch descriptor for multiple paths naming the
+    # same directory.
+    #
+
+    def _add_dir(self, dir:str) -> bool:
+        wd = _libc().inotify_add_watch(
+            self.fd, os.fsencode(dir or '.'), _WATCH_MASK)
+        if wd < 0:
+            ex = _oserror()
+            if ex.errno in (errno.ENOENT, errno.ENOTDIR): return False
+            raise ex
+        self.wds.setdefault(wd,set()).add(dir)
+        return True
+
+    #
+    # Associate key with file.  If file is a symbolic link, we also watch the
+    # directory of the link target so changes made through other paths are
+    # noticed.
+    #
+
+    def watch(self, file:str, key:Any) -> None:
+        paths = { file }
+        if os.path.islink(file):
+            paths.add(os.path.realpath(file))
+        for path in paths:
+            dir, name = os.path.split(path)
+            if (names := self.dirs.get(dir)) is None:
+                if (names := self.orphans.get(dir)) is None:
+                    names = dict()
+                    if self._add_dir(dir):
+                        self.dirs[dir] = names
+                    else:
+                        self.orphans[dir] = names
+            names.setdefault(name,[]).append(key)
+
+    #
+    # Stop watching the directories of a watch descriptor because they were
+    # removed or moved.  (A watch follows a moved directory, but we are
+    # interested in its former path.)
+    #
+
+    def _orphan(self, wd:int) -> None:
+        for dir in self.wds.pop(wd,()):
+            if (names := self.dirs.pop(dir,None)) is not None:
+                self.orphans[dir] = names
+
+    #
+    # Return the keys of files that may have changed, or None if events were
+    # lost.  Keys of files in directories we could not watch (because they
+    # were removed or moved, for example) are always included, and we retry
+    # watching those directories.
+    #
+
+    def changes(self) -> list[Any]|None:
+
+        result:list[Any] = []
+        lost = False
+
+        while True:
+            try:
+                buffer = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(buffer,offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(buffer[offset:offset+length].rstrip(b'\0'))
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    lost = True
+                elif mask & _IN_IGNORED:
+                    self._orphan(wd)
+                elif mask & _IN_MOVE_SELF:
+                    _libc().inotify_rm_watch(self.fd, wd)
+                    self._orphan(wd)
+                elif name:
+                    for dir in self.wds.get(wd,()):
+                        if (names := self.dirs.get(dir)) is not None:
+                            result.extend(names.get(name,()))
+
+        for dir in list(self.orphans):
+            names = self.orphans[dir]
+            for keys in names.values():
+                result.extend(keys)
+            if self._add_dir(dir):
+                del self.orphans[dir]
+                self.dirs[dir] = names
+
+        return None if lost else result
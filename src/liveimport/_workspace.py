@@ -1,4 +1,8 @@
 import os
+import site
+import sys
+from collections.abc import Iterable
+from fnmatch import fnmatchcase
 from os import PathLike
 from pathlib import Path
 
@@ -13,38 +17,96 @@ def _absolute(path:str|PathLike) -> Path:
 
 
 #
-# The workspace is a possibly empty list of directory paths.  We use Path
-# objects so we can use is_relative_to(), and we normalize using _absolute()
-# instead of resolve() because we don't want to follow symbolic links -- most
-# likely what a user expects.
+# The workspace is a possibly empty list of directory paths.  We normalize
+# using _absolute() instead of resolve() because we don't want to follow
+# symbolic links -- most likely what a user expects.
+#
+# Source files under a workspace directory are excluded if a directory between
+# them has a name matching one of the _EXCLUDE glob patterns, or if they are
+# under an _EXCLUDE_ENVIRONMENT directory nested in the workspace directory.
+# The latter are the installation and site-packages directories of the running
+# Python, so a virtual environment inside a project directory is not tracked.
+#
+# Since _in_workspace() is called repeatedly for the same files, it compares
+# strings instead of Path objects.  _PREFIXES holds each workspace directory as
+# a case normalized string ending with a separator, paired with the
+# environment directories nested in it, and _VERDICTS maps absolute file paths
+# to prior results.  workspace() updates both.
 #
 
+_DEFAULT_EXCLUDE = ("__pycache__", "site-packages", "dist-packages")
+
+def _environment() -> list[str]:
+    dirs = [ sys.prefix, sys.exec_prefix, sys.base_prefix ]
+    try:
+        dirs.extend(site.getsitepackages())
+    except AttributeError:
+        pass
+    try:
+        dirs.append(site.getusersitepackages())
+    except AttributeError:
+        pass
+    return [ os.path.join(os.path.normcase(os.path.abspath(dir)),'')
+             for dir in dirs ]
+
+
+_Prefix = tuple[str,tuple[str,...]]
+
+def _prefixes(workspace:list[Path]) -> tuple[_Prefix,...]:
+    environment = _environment() if _EXCLUDE_ENVIRONMENT else []
+    result:list[_Prefix] = []
+    for dirpath in workspace:
+        prefix = os.path.join(os.path.normcase(dirpath),'')
+        nested = tuple(dir for dir in environment
+                       if dir.startswith(prefix) and dir != prefix)
+        result.append((prefix, nested))
+    return tuple(result)
+
 if "_WORKSPACE" not in globals():
     _WORKSPACE:list[Path] = [ _absolute(".") ]
+    _EXCLUDE:tuple[str,...] = _DEFAULT_EXCLUDE
+    _EXCLUDE_ENVIRONMENT:bool = True
+    _PREFIXES:tuple[_Prefix,...] = _prefixes(_WORKSPACE)
+    _VERDICTS:dict[str,bool] = dict()
 
 #
-# Return true iff the named file is in the workspace.
+# Return true iff the named file is in the workspace.  Results for relative
+# paths are not kept since they depend on the current directory.
 #
 
 def _in_workspace(file:str) -> bool:
 
-    filepath = _absolute(file)
+    if (verdict := _VERDICTS.get(file)) is not None:
+        return verdict
+
+    path = os.path.normcase(os.path.abspath(file))
+    verdict = False
 
-    for dirpath in _WORKSPACE:
-        if filepath.is_relative_to(dirpath):
-            return True
+    for prefix, nested in _PREFIXES:
+        if not path.startswith(prefix): continue
+        if nested and path.startswith(nested): continue
+        names = path[len(prefix):].split(os.sep)[:-1]
+        if any(fnmatchcase(name,pattern)
+               for name in names for pattern in _EXCLUDE): continue
+        verdict = True
+        break
 
-    return False
+    if os.path.isabs(file):
+        _VERDICTS[file] = verdict
 
+    return verdict
 
-def workspace(*directories:str|PathLike) -> None:
+
+def workspace(*directories:str|PathLike,
+              exclude:Iterable[str]|None=None,
+              exclude_environment:bool=True) -> None:
     """
     Define the workspace, a set of directories.
 
     LiveImport tracks modules that either are imported by a registered import
     statement, or are imported by a tracked module and have a source file in
     the workspace.  A source file is in the workspace if and only if it's under
-    a workspace directory.
+    a workspace directory and not excluded.
 
     The default workspace is the current working directory when the LiveImport
     module is imported.  Thus, when LiveImport is used in a notebook, the
@@ -53,8 +115,21 @@ def workspace(*directories:str|PathLike) -> None:
     :param directories: Zero or more path strings or path-like objects.  Each
         path must identify an existing directory.
 
+    :param exclude: Glob patterns (as for :mod:`fnmatch`) for the names of
+        directories to exclude from the workspace, such as ``".venv"`` or
+        ``"build"``.  A source file is excluded if any directory between a
+        workspace directory and the file matches a pattern.  By default,
+        ``__pycache__``, ``site-packages``, and ``dist-packages`` directories
+        are excluded.  If patterns are given, they replace those.
+
+    :param exclude_environment: If true (the default), exclude the
+        installation and site-packages directories of the running Python
+        when they are inside a workspace directory, whatever the `exclude`
+        patterns, so a virtual environment inside a project directory is
+        not tracked.
+
     :raises ValueError: One of the specified paths does not exist or
-        exists but is not a directory.
+        exists but is not a directory, or exclude is a string.
 
     Example: After calling
 
@@ -74,13 +149,25 @@ def workspace(*directories:str|PathLike) -> None:
     the workspace is empty, so only modules referenced by registered imports
     will be tracked.
 
+    If you call
+
+      .. code:: python
+
+        liveimport.workspace(".", exclude=["__pycache__", ".venv", "build"])
+
+    the workspace is the current working directory, excluding any source files
+    under directories named ``.venv`` or ``build``.
+
     .. note::
         Changing the workspace does not alter tracking decisions LiveImport has
         already made.  It only affects future decisions.  If you want a
         non-default workspace, its best to change it before registering any
         imports.
     """
-    global _WORKSPACE
+    global _EXCLUDE, _EXCLUDE_ENVIRONMENT, _PREFIXES
+
+    if isinstance(exclude,str):
+        raise ValueError("exclude must be a collection of patterns")
 
     workspace:list[Path] = []
 
@@ -96,8 +183,16 @@ def workspace(*directories:str|PathLike) -> None:
 
         workspace.append(path)
 
-    _WORKSPACE[:] = workspace
-
     # Local import to break circular import dependency
-    from ._core import _track_new_indirects
-    _track_new_indirects()
+    from ._core import _LOCK, _track_new_indirects
+
+    with _LOCK:
+        _WORKSPACE[:] = workspace
+        if exclude is None:
+            _EXCLUDE = _DEFAULT_EXCLUDE
+        else:
+            _EXCLUDE = tuple(os.path.normcase(pattern) for pattern in exclude)
+        _EXCLUDE_ENVIRONMENT = exclude_environment
+        _PREFIXES = _prefixes(workspace)
+        _VERDICTS.clear()
+        _track_new_indirects(everything=True)
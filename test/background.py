@@ -0,0 +1,264 @@
+#
+# Tests of background change detection.
+#
+
+import os
+import sys
+import time
+import liveimport
+import liveimport._core
+from setup import *
+from setup_imports import *
+
+
+_CAN_WATCH = sys.platform.startswith("linux")
+
+#
+# Wait for the background thread to analyze a module's current source.
+#
+
+def _await_analysis(modulename:str, timeout:float=5.0):
+    info = liveimport._MODULE_TABLE[modulename]
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with liveimport._core._LOCK:
+            if (info.next_stamp is not None and
+                    info.next_stamp != info.stamp and
+                    info.analyzed_stamp == info.next_stamp):
+                return
+        time.sleep(0.01)
+    raise RuntimeError(f"Background thread did not analyze {modulename}")
+
+
+def _test_analysis(watch:bool):
+
+    save_interval = liveimport._core._BACKGROUND_INTERVAL
+    liveimport._core._BACKGROUND_INTERVAL = 0.05
+
+    try:
+        liveimport.configure(watch=watch, background=True)
+        liveimport.register(globals(),"import mod1")
+        liveimport.sync()
+
+        mod1_tag = get_tag("mod1")
+
+        with revised_module("mod1",imports=["import mod2"]):
+            _await_analysis("mod1")
+            assert "mod2" in liveimport._MODULE_TABLE["mod1"].dependencies
+            reload_clear()
+            liveimport.sync(observer=reload_observe)
+            reload_expect("mod1")
+            expect_tag("mod1",next_tag(mod1_tag))
+            assert is_tracked("mod2")
+    finally:
+        liveimport._core._BACKGROUND_INTERVAL = save_interval
+
+
+def test_background_polling():
+    """
+    Without watching, the background thread should analyze modified modules
+    before the next sync.
+    """
+    _test_analysis(watch=False)
+
+
+def test_background_watching():
+    """
+    With watching, the background thread should analyze modified modules
+    before the next sync.
+    """
+    _test_analysis(watch=True)
+
+
+def test_background_immediate():
+    """
+    Modifications should be seen by a sync even if the background thread has
+    not yet checked for them.
+    """
+    liveimport.configure(background=True)
+    liveimport.register(globals(),"import mod1")
+    mod1_tag = get_tag("mod1")
+
+    touch_module("mod1",0)
+    liveimport.sync()
+    expect_tag("mod1",next_tag(mod1_tag))
+
+
+def test_background_unchanged():
+    """
+    With background detection and watching, a sync when nothing has changed
+    should not check any files.
+    """
+    if not _CAN_WATCH: return
+
+    liveimport.configure(watch=True, background=True)
+    liveimport.register(globals(),"import mod1, mod6")
+    liveimport.sync()
+
+    def fake_stat(x):
+        raise OSError()
+
+    try:
+        liveimport._core.stat = fake_stat
+        liveimport.sync()
+        liveimport.sync()
+    finally:
+        liveimport._core.stat = os.stat
+
+    mod1_tag = get_tag("mod1")
+    touch_module("mod1",0)
+    liveimport.sync()
+    expect_tag("mod1",next_tag(mod1_tag))
+
+
+def test_background_attach_outdated():
+    """
+    With background detection and watching, attaching a module modified while
+    it was not attached should make the next sync reload it.
+    """
+    if not _CAN_WATCH: return
+
+    liveimport.configure(watch=True, background=True)
+    namespace:dict = dict(mod1=sys.modules["mod1"])
+    liveimport.register(namespace,"import mod1")
+    liveimport.register(namespace,"",clear=True)
+    liveimport.sync()
+
+    mod1_tag = get_tag("mod1")
+    touch_module("mod1",0)
+    liveimport.sync()
+    expect_tag("mod1",mod1_tag)
+
+    liveimport.register(namespace,"import mod1")
+    liveimport.sync()
+    expect_tag("mod1",next_tag(mod1_tag))
+
+
+def test_background_unwatched():
+    """
+    If watching stops, the background thread should carry on by polling.
+    """
+    if not _CAN_WATCH: return
+
+    save_interval = liveimport._core._BACKGROUND_INTERVAL
+    liveimport._core._BACKGROUND_INTERVAL = 0.05
+
+    try:
+        liveimport.configure(watch=True, background=True)
+        liveimport.register(globals(),"import mod1")
+        liveimport.configure(watch=False)
+        assert liveimport._core._WATCHER is None
+
+        mod1_tag = get_tag("mod1")
+        touch_module("mod1",0)
+        _await_analysis("mod1")
+        liveimport.sync()
+        expect_tag("mod1",next_tag(mod1_tag))
+    finally:
+        liveimport._core._BACKGROUND_INTERVAL = save_interval
+
+
+def test_background_new_import():
+    """
+    A new import of a modified module analyzed by the background thread
+    should be tracked once the module reloads, even if imports are
+    registered in between.
+    """
+    save_interval = liveimport._core._BACKGROUND_INTERVAL
+    liveimport._core._BACKGROUND_INTERVAL = 0.05
+
+    try:
+        liveimport.configure(background=True)
+        liveimport.register(globals(),"import mod1")
+
+        with (created_module("newmod","x = 1"),
+              revised_module("mod1",imports=["import newmod"],sleep=0)):
+            _await_analysis("mod1")
+            liveimport.register(globals(),"import mod6")
+            liveimport.sync()
+            assert is_tracked("newmod")
+            touch_module("newmod")
+            reload_clear()
+            liveimport.sync(observer=reload_observe)
+            reload_expect("newmod","mod1")
+        liveimport._clear_all_state()
+    finally:
+        liveimport._core._BACKGROUND_INTERVAL = save_interval
+
+
+def test_background_error():
+    """
+    Analysis errors found by the background thread should be raised by the
+    next sync.
+    """
+    save_interval = liveimport._core._BACKGROUND_INTERVAL
+    liveimport._core._BACKGROUND_INTERVAL = 0.05
+
+    try:
+        liveimport.configure(background=True)
+        liveimport.register(globals(),"import mod1")
+
+        with revised_module("mod1",postscript="not valid python",sleep=0.2):
+            try:
+                liveimport.sync()
+                error = None
+            except liveimport.ModuleError as ex:
+                error = ex
+            assert error is not None and error.phase == "analysis"
+
+        liveimport.sync()
+    finally:
+        liveimport._core._BACKGROUND_INTERVAL = save_interval
+
+
+def test_background_failure():
+    """
+    The background thread should not repeat a failed analysis until the
+    module changes again, but the next sync should.
+    """
+    save_interval = liveimport._core._BACKGROUND_INTERVAL
+    liveimport._core._BACKGROUND_INTERVAL = 0.05
+    save_analyze = liveimport._core._ModuleInfo.analyze_dependencies
+    count = 0
+
+    def counting_analyze(self, source):
+        nonlocal count
+        count += 1
+        return save_analyze(self, source)
+
+    try:
+        liveimport.configure(background=True)
+        liveimport.register(globals(),"import mod1")
+        liveimport._core._ModuleInfo.analyze_dependencies = counting_analyze
+
+        with revised_module("mod1",postscript="not valid python"):
+            deadline = time.monotonic() + 5
+            while count == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            time.sleep(0.3)
+            assert count == 1
+            try:
+                liveimport.sync()
+                error = None
+            except liveimport.ModuleError as ex:
+                error = ex
+            assert error is not None and error.phase == "analysis"
+            assert count == 2
+
+        liveimport.sync()
+    finally:
+        liveimport._core._ModuleInfo.analyze_dependencies = save_analyze
+        liveimport._core._BACKGROUND_INTERVAL = save_interval
+
+
+def test_background_stop():
+    """
+    Stopping background detection should stop the thread.
+    """
+    liveimport.configure(watch=True, background=True)
+    background = liveimport._core._BACKGROUND
+    assert background is not None
+    liveimport.configure(watch=False)
+    liveimport.configure(background=False)
+    assert liveimport._core._BACKGROUND is None
+    assert not background.thread.is_alive()
@@ -23,10 +23,10 @@ from setup_imports import *
 # modules in alphabetical order, and direct=False, which only registers "import
 # B".
 #
-# There is a cycle A->C->E->A.  With direct mode, because imports from E are
-# registered after those from A and C, arc E->A should be effectively ignored.
-# With indirect mode (we register only "import B"), the arc from A->C should be
-# ignored.
+# There is a cycle A->C->E->A, so if any of A, C, and E reload, all three
+# should.  With direct mode, because imports from E are registered after those
+# from A and C, arc E->A should be ignored when ordering them.  With indirect
+# mode (we register only "import B"), the arc from A->C should be ignored.
 #
 # The primary thing we test in this module are which modules are reloaded and
 # reload order, as reported through the recorder option of sync().  That is
@@ -79,25 +79,25 @@ def _define(direct:bool, touch:str, expect:str):
     globals()[name] = fn
 
 
-_define(True,"A","A")
+_define(True,"A","E C A B")
 _define(True,"B","B")
-_define(True,"C","C A B")
+_define(True,"C","E C A B")
 _define(True,"D","D B")
 _define(True,"E","E C A B")
-_define(True,"F","F C A D B")
+_define(True,"F","F E C A D B")
 _define(True,"G","G B")
 _define(True,"B G","G B")
-_define(True,"D F G","F C A D G B")
-_define(True,"A B F","F C A D B")
+_define(True,"D F G","F E C A D G B")
+_define(True,"A B F","F E C A D B")
 
 _define(False,"A","A E C B")
 _define(False,"B","B")
-_define(False,"C","C B")
+_define(False,"C","A E C B")
 _define(False,"D","D B")
-_define(False,"E","E C B")
-_define(False,"F","F C D B")
+_define(False,"E","A E C B")
+_define(False,"F","F A E C D B")
 _define(False,"G","G B")
-_define(False,"D F","F C D B")
+_define(False,"D F","F A E C D B")
 
 
 def test_add_dependency():
@@ -126,3 +126,80 @@ def test_remove_dependency():
         reload_clear()
         liveimport.sync(observer=reload_observe)
         reload_expect("A","E","C","B") #type:ignore
+
+
+def test_tracked_dependencies():
+    """
+    The tracked dependencies of a module should include only tracked modules,
+    and should include modules tracked later.
+    """
+    liveimport.register(globals(),"import B")
+
+    info = liveimport._MODULE_TABLE["D"]
+    assert "F.*" in info.dependencies and "math.nan" in info.dependencies
+    assert [ other.module.__name__
+             for other in info.tracked_dependencies() ] == [ "F" ]
+
+    liveimport.workspace()
+    liveimport.register(globals(),"from mod3 import *")
+    info = liveimport._MODULE_TABLE["mod3"]
+    assert info.tracked_dependencies() == []
+
+    liveimport.register(globals(),"import pkg.subpkg.ssmod2")
+    assert [ other.module.__name__ for other in
+             info.tracked_dependencies() ] == [ "pkg.subpkg.ssmod2" ]
+
+
+def test_affected():
+    """
+    Scheduling should only consider modified modules and the modules that
+    transitively depend on them.
+    """
+    liveimport.register(globals(),"import A, B, C, D, E, F, G")
+
+    def affected():
+        modules = liveimport._core._graph().modules
+        return [ modules[position].module.__name__
+                 for position in liveimport._core._affected() ]
+
+    touch_module("G")
+    liveimport._core._detect_changes()
+    assert affected() == [ "G", "B" ]
+
+    touch_module("E")
+    liveimport._core._detect_changes()
+    assert affected() == [ "E", "C", "A", "G", "B" ]
+
+    reload_clear()
+    liveimport.sync(observer=reload_observe)
+    reload_expect("G","E","C","A","B") #type:ignore
+
+
+def test_cached_graph():
+    """
+    The dependency graph should be reused until dependencies change.
+    """
+    liveimport.register(globals(),"import B")
+
+    touch_module("G")
+    liveimport.sync()
+    graph = liveimport._core._GRAPH
+    assert graph is not None
+
+    touch_module("F")
+    reload_clear()
+    liveimport.sync(observer=reload_observe)
+    reload_expect("F","A","E","C","D","B") #type:ignore
+    assert liveimport._core._GRAPH is graph
+
+    liveimport.register(globals(),"import A")
+    assert liveimport._core._GRAPH is None
+
+    with revised_module("G",imports=["import F"]):
+        reload_clear()
+        liveimport.sync(observer=reload_observe)
+        reload_expect("G","B") #type:ignore
+        touch_module("F")
+        reload_clear()
+        liveimport.sync(observer=reload_observe)
+        reload_expect("F","A","E","C","D","G","B") #type:ignore
@@ -0,0 +1,204 @@
+#
+# Tests of the persistent dependency analysis cache.  The cache directory is a
+# separate temporary directory so that the module hierarchy is unaffected.
+#
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+from contextlib import contextmanager
+import liveimport
+from liveimport._core import _ModuleInfo
+from liveimport._diskcache import _DiskCache, _VERSION, _default_dir
+from setup import *
+from setup_imports import *
+
+
+#
+# Count analyses within a dynamic scope, yielding a one element list holding
+# the count.
+#
+
+@contextmanager
+def _counted_analysis():
+    save_analyze = _ModuleInfo.analyze_dependencies
+    count = [ 0 ]
+
+    def counting_analyze(self, source):
+        count[0] += 1
+        save_analyze(self, source)
+
+    _ModuleInfo.analyze_dependencies = counting_analyze
+    try:
+        yield count
+    finally:
+        _ModuleInfo.analyze_dependencies = save_analyze
+
+#
+# Simulate a kernel restart by forgetting all tracked modules, then register
+# a statement again using a disk cache, returning the number of analyses.
+#
+
+def _restart_register(statement:str, cachedir:str, fingerprint:bool=False,
+                      ignore_typing:bool=False):
+    liveimport._clear_all_state()
+    liveimport.workspace(root())
+    liveimport.configure(diskcache=cachedir, fingerprint=fingerprint,
+                         ignore_typing=ignore_typing)
+    with _counted_analysis() as count:
+        liveimport.register(globals(),statement)
+    return count[0]
+
+
+def test_diskcache_reuse():
+    """
+    After a restart, tracking modules with unchanged source files should use
+    cached analyses, and the cached dependencies should match.
+    """
+    cachedir = tempfile.mkdtemp()
+    try:
+        statement = "from mod3 import *"
+        assert _restart_register(statement,cachedir) > 0
+        expected = { name: sorted(info.dependencies)
+                     for name, info in liveimport._MODULE_TABLE.items() }
+
+        assert _restart_register(statement,cachedir) == 0
+        actual = { name: sorted(info.dependencies)
+                   for name, info in liveimport._MODULE_TABLE.items() }
+        assert actual == expected
+
+        touch_module("mod3")
+        assert _restart_register(statement,cachedir) == 1
+    finally:
+        shutil.rmtree(cachedir)
+
+
+def test_diskcache_modified():
+    """
+    Analyses of modified modules during syncs should be cached.
+    """
+    cachedir = tempfile.mkdtemp()
+    try:
+        liveimport.configure(diskcache=cachedir)
+        liveimport.register(globals(),"import mod1")
+        with revised_module("mod1",imports=["import mod6"]):
+            liveimport.sync()
+            assert _restart_register("import mod1",cachedir) == 0
+            assert "mod6" in liveimport._MODULE_TABLE["mod1"].dependencies
+    finally:
+        shutil.rmtree(cachedir)
+
+
+def test_diskcache_fingerprint():
+    """
+    Cache entries without fingerprints should not be used when fingerprinting,
+    and entries with them should be.
+    """
+    cachedir = tempfile.mkdtemp()
+    try:
+        assert _restart_register("import mod1",cachedir) == 1
+        assert _restart_register("import mod1",cachedir,True) == 1
+        assert _restart_register("import mod1",cachedir,True) == 0
+        fingerprint = liveimport._MODULE_TABLE["mod1"].fingerprint
+        assert fingerprint is not None
+
+        touch_module("mod1")
+        liveimport.sync()
+        assert liveimport._MODULE_TABLE["mod1"].fingerprint == fingerprint
+    finally:
+        shutil.rmtree(cachedir)
+
+
+def test_diskcache_typing():
+    """
+    Cache entries without classifications of dependencies only needed for
+    type checking should not be used when ignoring those, and entries with
+    them should be.
+    """
+    cachedir = tempfile.mkdtemp()
+    try:
+        assert _restart_register("import mod1",cachedir) == 1
+        assert _restart_register("import mod1",cachedir,
+                                 ignore_typing=True) == 1
+        assert _restart_register("import mod1",cachedir,
+                                 ignore_typing=True) == 0
+        assert _restart_register("import mod1",cachedir) == 0
+    finally:
+        shutil.rmtree(cachedir)
+
+
+def test_diskcache_invalid():
+    """
+    Invalid cache entries and unusable cache directories should be ignored.
+    """
+    cachedir = tempfile.mkdtemp()
+    try:
+        assert _restart_register("import mod1",cachedir) == 1
+
+        cache = _DiskCache(cachedir)
+        for entry in os.listdir(cache.dir):
+            with open(os.path.join(cache.dir,entry),'w') as f:
+                f.write("[ not valid")
+        assert _restart_register("import mod1",cachedir) == 1
+
+        for entry in os.listdir(cache.dir):
+            with open(os.path.join(cache.dir,entry),'w') as f:
+                f.write(f'{{ "version": {_VERSION} }}')
+        assert _restart_register("import mod1",cachedir) == 1
+        assert _restart_register("import mod1",cachedir) == 0
+
+        [ entry ] = [ os.path.join(cache.dir,entry)
+                      for entry in os.listdir(cache.dir) ]
+        with open(entry) as f:
+            valid = json.load(f)
+        for invalid in ([ valid ], dict(valid,dependencies="mod6"),
+                        dict(valid,typing=[ 1 ])):
+            with open(entry,'w') as f:
+                json.dump(invalid,f)
+            assert _restart_register("import mod1",cachedir) == 1
+
+        os.unlink(entry)
+        os.mkdir(entry)
+        assert _restart_register("import mod1",cachedir) == 1
+        assert os.listdir(cache.dir) == [ os.path.basename(entry) ]
+
+        notadir = os.path.join(cachedir,"notadir")
+        with open(notadir,'w'):
+            pass
+        assert _restart_register("import mod1",notadir) == 1
+        assert _restart_register("import mod1",notadir) == 1
+    finally:
+        shutil.rmtree(cachedir)
+
+
+def test_diskcache_default():
+    """
+    The default cache directory should follow the conventions of the
+    platform.
+    """
+    cachedir = tempfile.mkdtemp()
+    save_platform, save_environ = sys.platform, dict(os.environ)
+    try:
+        os.environ["XDG_CACHE_HOME"] = cachedir
+        liveimport.configure(diskcache=True)
+        liveimport.register(globals(),"import mod1")
+        assert os.listdir(os.path.join(cachedir,"liveimport"))
+
+        home = os.path.expanduser("~")
+        os.environ.pop("XDG_CACHE_HOME")
+        assert _default_dir() == os.path.join(home,".cache","liveimport")
+
+        sys.platform = "darwin"
+        assert (_default_dir() ==
+                os.path.join(home,"Library","Caches","liveimport"))
+
+        sys.platform = "win32"
+        os.environ["LOCALAPPDATA"] = cachedir
+        assert _default_dir() == os.path.join(cachedir,"liveimport")
+    finally:
+        sys.platform = save_platform
+        os.environ.clear()
+        os.environ.update(save_environ)
+        shutil.rmtree(cachedir)
@@ -0,0 +1,125 @@
+#
+# Tests of caching analysis and reload failures.
+#
+
+import builtins
+import liveimport
+from liveimport._core import _ModuleInfo
+from setup import *
+from setup_imports import *
+
+
+_COUNTING_FAILURE = ("import builtins\n"
+                     "builtins._failcache_count += 1\n"
+                     "1/0")
+
+def _sync_error() -> liveimport.ModuleError|None:
+    try:
+        liveimport.sync()
+    except liveimport.ModuleError as ex:
+        return ex
+    return None
+
+
+def _test_reload_failure(cache:bool):
+
+    liveimport.configure(cache_failures=cache)
+    liveimport.register(globals(),"import mod1")
+    builtins._failcache_count = 0
+
+    try:
+        with revised_module("mod1",postscript=_COUNTING_FAILURE):
+            for _ in range(3):
+                error = _sync_error()
+                assert error is not None and error.phase == "reload"
+                assert isinstance(error.__cause__,ZeroDivisionError)
+            assert builtins._failcache_count == (1 if cache else 3)
+            failure = liveimport._MODULE_TABLE["mod1"].failure
+            assert (failure is not None) == cache
+
+            touch_module("mod1")
+            assert _sync_error() is not None
+            assert builtins._failcache_count == (2 if cache else 4)
+
+        assert _sync_error() is None
+    finally:
+        del builtins._failcache_count
+
+
+def test_reload_failure_cached():
+    """
+    With failure caching, a failed reload should not be repeated until the
+    module changes.
+    """
+    _test_reload_failure(cache=True)
+
+
+def test_reload_failure_uncached():
+    """
+    Without failure caching, a failed reload should be repeated by every sync.
+    """
+    _test_reload_failure(cache=False)
+
+
+def test_reload_failure_dependency():
+    """
+    With failure caching, a failed reload should be repeated after a module it
+    depends on reloads.
+    """
+    liveimport.configure(cache_failures=True)
+    liveimport.register(globals(),"import mod1, mod6")
+
+    with revised_module("mod1",imports=["import mod6"],postscript="mod6.y"):
+        error = _sync_error()
+        assert error is not None and error.module == "mod1"
+        assert _sync_error() is not None
+        with revised_module("mod6",postscript="y=1"):
+            reload_clear()
+            liveimport.sync(observer=reload_observe)
+            reload_expect("mod6","mod1")
+            assert liveimport._MODULE_TABLE["mod1"].failure is None
+
+
+def test_failure_cache_disabled():
+    """
+    Disabling failure caching should discard recorded failures, so their
+    exceptions and tracebacks are not kept alive.
+    """
+    liveimport.configure(cache_failures=True)
+    liveimport.register(globals(),"import mod1")
+
+    with revised_module("mod1",postscript="1/0"):
+        assert _sync_error() is not None
+        assert liveimport._MODULE_TABLE["mod1"].failure is not None
+        liveimport.configure(cache_failures=False)
+        assert liveimport._MODULE_TABLE["mod1"].failure is None
+
+
+def test_analysis_failure_cached():
+    """
+    With failure caching, a failed analysis should not be repeated until the
+    module changes.
+    """
+    save_analyze = _ModuleInfo.analyze_dependencies
+    count = 0
+
+    def counting_analyze(self, source):
+        nonlocal count
+        count += 1
+        save_analyze(self, source)
+
+    liveimport.configure(cache_failures=True)
+    liveimport.register(globals(),"import mod1")
+
+    try:
+        _ModuleInfo.analyze_dependencies = counting_analyze
+        with revised_module("mod1",postscript="not valid python"):
+            for _ in range(3):
+                error = _sync_error()
+                assert error is not None and error.phase == "analysis"
+                assert isinstance(error.__cause__,SyntaxError)
+            assert count == 1
+        assert _sync_error() is None
+        assert count == 2
+    finally:
+        _ModuleInfo.analyze_dependencies = save_analyze
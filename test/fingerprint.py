@@ -0,0 +1,153 @@
+#
+# Tests of source fingerprinting.
+#
+
+import liveimport
+from setup import *
+from setup_imports import *
+
+
+def test_touched():
+    """
+    With fingerprinting, modules whose modification times change but whose
+    content does not should not reload, and neither should their dependents.
+    """
+    liveimport.configure(fingerprint=True)
+    liveimport.register(globals(),"import A, B, C, D, E, F, G")
+
+    F_tag = get_tag("F")
+    D_tag = get_tag("D")
+
+    touch_module("F")
+    restore_module("D")
+
+    reload_clear()
+    liveimport.sync(observer=reload_observe)
+    reload_expect()
+
+    reload_clear()
+    liveimport.sync(observer=reload_observe)
+    reload_expect()
+
+    expect_tag("F",F_tag)
+    expect_tag("D",D_tag)
+
+
+def test_modified():
+    """
+    With fingerprinting, modules whose content changes should reload, as
+    should modules reverted to content different from the version last
+    loaded.
+    """
+    liveimport.configure(fingerprint=True)
+    liveimport.register(globals(),"import mod1")
+
+    mod1_tag = get_tag("mod1")
+
+    with revised_module("mod1",postscript="y=1"):
+        reload_clear()
+        liveimport.sync(observer=reload_observe)
+        reload_expect("mod1")
+        expect_tag("mod1",next_tag(mod1_tag))
+
+    reload_clear()
+    liveimport.sync(observer=reload_observe)
+    reload_expect("mod1")
+    expect_tag("mod1",next_tag(next_tag(mod1_tag)))
+
+
+def test_reverted_before_sync():
+    """
+    With fingerprinting, a module modified then reverted to the version last
+    loaded before a sync should not reload.
+    """
+    liveimport.configure(fingerprint=True)
+    liveimport.register(globals(),"import mod1")
+
+    mod1_tag = get_tag("mod1")
+
+    with revised_module("mod1",postscript="y=1"):
+        pass
+
+    reload_clear()
+    liveimport.sync(observer=reload_observe)
+    reload_expect()
+    expect_tag("mod1",mod1_tag)
+
+
+def test_reverted_after_failure():
+    """
+    With fingerprinting, a module that failed to reload, then was reverted to
+    the version last loaded should not reload.  It should reload as a
+    dependent afterward, and then have unchanged content.
+    """
+    liveimport.configure(fingerprint=True)
+    liveimport.register(globals(),"from mod3 import *")
+
+    mod3_tag = get_tag("mod3")
+
+    with revised_module("pkg.subpkg.ssmod2",postscript="1/0"):
+        try:
+            liveimport.sync()
+            error = None
+        except liveimport.ModuleError as ex:
+            error = ex
+        assert error is not None and error.module == "pkg.subpkg.ssmod2"
+
+    reload_clear()
+    liveimport.sync(observer=reload_observe)
+    reload_expect()
+
+    with revised_module("pkg.subpkg.ssmod1",postscript="y=1"):
+        reload_clear()
+        liveimport.sync(observer=reload_observe)
+        reload_expect("pkg.subpkg.ssmod1","pkg.subpkg.ssmod2","mod3")
+        expect_tag("mod3",next_tag(mod3_tag))
+
+        touch_module("pkg.subpkg.ssmod2")
+
+        reload_clear()
+        liveimport.sync(observer=reload_observe)
+        reload_expect()
+
+
+def test_enabled_late():
+    """
+    Enabling fingerprinting after tracking should be safe.
+    """
+    liveimport.register(globals(),"import mod1")
+    liveimport.configure(fingerprint=True)
+
+    mod1_tag = get_tag("mod1")
+
+    touch_module("mod1")
+    liveimport.sync()
+    expect_tag("mod1",next_tag(mod1_tag))
+
+    touch_module("mod1")
+    liveimport.sync()
+    expect_tag("mod1",next_tag(mod1_tag))
+
+
+def test_reverted_after_analysis():
+    """
+    With fingerprinting, a module reverted to the version last loaded after
+    its modified version was analyzed should not reload, and should again
+    depend on the modules the loaded version imports.
+    """
+    liveimport.configure(fingerprint=True)
+    liveimport.register(globals(),"import B")
+
+    with revised_module("B",imports=["import C"]):
+        assert [ event.module for event in liveimport.plan() ] == [ "B" ]
+        assert "D" not in liveimport._MODULE_TABLE["B"].dependencies
+
+    reload_clear()
+    liveimport.sync(observer=reload_observe)
+    reload_expect()
+    assert "D" in liveimport._MODULE_TABLE["B"].dependencies
+
+    with revised_module("D",postscript="y=1"):
+        reload_clear()
+        liveimport.sync(observer=reload_observe)
+        reload_expect("D","B")
@@ -0,0 +1,148 @@
+#
+# Tests of the graph algorithms and representation used to order reloads.
+#
+
+import random
+from liveimport._graph import _strong_components, _Adjacency
+from setup import *
+from setup_imports import *
+
+
+#
+# Return the post-order of a recursive depth first search from roots,
+# ignoring edges to visited nodes.  This is how reload order was computed
+# before strongly connected components, and it remains the reload order for
+# acyclic dependency graphs.
+#
+
+def _recursive_order(roots:list[int], graph:dict[int,list[int]]) -> list[int]:
+    order:list[int] = []
+    visited:set[int] = set()
+
+    def visit(node:int):
+        visited.add(node)
+        for other in graph[node]:
+            if other not in visited:
+                visit(other)
+        order.append(node)
+
+    for node in roots:
+        if node not in visited:
+            visit(node)
+    return order
+
+
+#
+# Return a random acyclic graph of n nodes with edges only to lower numbered
+# nodes, with node numbers shuffled so traversal order is not just numeric.
+#
+
+def _random_acyclic(rng:random.Random, n:int) -> dict[int,list[int]]:
+    labels = list(range(n))
+    rng.shuffle(labels)
+    graph:dict[int,list[int]] = { label: [] for label in labels }
+    for i in range(1,n):
+        for j in rng.sample(range(i),min(i,rng.randrange(4))):
+            graph[labels[i]].append(labels[j])
+    return graph
+
+
+def test_acyclic_order():
+    """
+    On acyclic graphs, every component should have one member, and the
+    components should be in the order of a recursive depth first search.
+    """
+    rng = random.Random(1)
+    for n in (1, 2, 5, 20, 100, 500):
+        for _ in range(20):
+            graph = _random_acyclic(rng,n)
+            roots = rng.sample(list(graph),rng.randrange(1,n+1))
+            components = _strong_components(roots,graph.__getitem__)
+            assert all(len(component) == 1 for component in components)
+            assert ([ component[0] for component in components ] ==
+                    _recursive_order(roots,graph))
+
+
+def test_cycle_order():
+    """
+    Cycles should form one component, ordered by ignoring edges back to the
+    search path, after the components they depend on.
+    """
+    graph = { 'A': ['C'], 'B': ['C', 'D', 'G'], 'C': ['E', 'F'],
+              'D': ['F'], 'E': ['A'], 'F': [], 'G': [] }
+
+    assert (_strong_components("ABCDEFG",graph.__getitem__) ==
+            [ ['F'], ['E', 'C', 'A'], ['D'], ['G'], ['B'] ])
+
+    assert (_strong_components("B",graph.__getitem__) ==
+            [ ['F'], ['A', 'E', 'C'], ['D'], ['G'], ['B'] ])
+
+    graph = { 1: [2], 2: [3, 4], 3: [1], 4: [5], 5: [4, 6], 6: [] }
+    assert (_strong_components([1],graph.__getitem__) ==
+            [ [6], [5, 4], [3, 2, 1] ])
+
+
+def test_random_components():
+    """
+    Every node reachable from the roots should be in exactly one component,
+    the nodes of each component should reach each other, and every edge
+    should lead to the same or an earlier component.
+    """
+    rng = random.Random(2)
+    for n in (10, 50, 200):
+        for _ in range(10):
+            graph = { node: rng.sample(range(n),rng.randrange(3))
+                      for node in range(n) }
+            components = _strong_components(range(n),graph.__getitem__)
+            which = { node: k for k, component in enumerate(components)
+                      for node in component }
+            assert sorted(which) == list(range(n))
+            for node, others in graph.items():
+                for other in others:
+                    assert which[other] <= which[node]
+            for component in components:
+                members = set(component)
+                reached = { component[0] }
+                pending = [ component[0] ]
+                while pending:
+                    for other in graph[pending.pop()]:
+                        if other in members and other not in reached:
+                            reached.add(other)
+                            pending.append(other)
+                assert reached == members
+
+
+def test_deep_graphs():
+    """
+    Long dependency chains and cycles should not be limited by the recursion
+    limit.
+    """
+    n = 100000
+
+    chain = { node: [ node - 1 ] if node > 0 else [] for node in range(n) }
+    components = _strong_components([n-1],chain.__getitem__)
+    assert components == [ [node] for node in range(n) ]
+
+    cycle = { node: [ (node + 1) % n ] for node in range(n) }
+    components = _strong_components([0],cycle.__getitem__)
+    assert components == [ list(range(n-1,-1,-1)) ]
+
+
+def test_adjacency():
+    """
+    An adjacency should list the edges it was built from in order, and its
+    reverse should list the sources of each node in increasing order.
+    """
+    rng = random.Random(3)
+    for n in (0, 1, 10, 100):
+        edges = [ rng.sample(range(n),rng.randrange(min(n,5)+1))
+                  for _ in range(n) ]
+        adjacency = _Adjacency(edges)
+        assert len(adjacency) == n
+        assert [ list(adjacency[node]) for node in range(n) ] == edges
+
+        reverse = adjacency.reverse()
+        assert len(reverse) == n
+        for node in range(n):
+            assert list(reverse[node]) == [ source for source in range(n)
+                                            if node in edges[source] ]
@@ -0,0 +1,143 @@
+#
+# Tests of incrementally tracking indirectly imported modules.
+#
+
+import sys
+from contextlib import contextmanager
+import liveimport
+import liveimport._core
+from setup import *
+from setup_imports import *
+
+
+#
+# Record the modules whose dependencies each _track_new_indirects() call
+# checks first within a dynamic scope, yielding the list of records.
+#
+
+@contextmanager
+def _checked():
+    save_track = liveimport._core._track_new_indirects
+    records:list[list[str]] = []
+
+    def recording_track(everything:bool=False):
+        records.append(list(liveimport._MODULE_TABLE) if everything else
+                       list(liveimport._core._UNCHECKED))
+        save_track(everything)
+
+    liveimport._core._track_new_indirects = recording_track
+    try:
+        yield records
+    finally:
+        liveimport._core._track_new_indirects = save_track
+
+
+def test_incremental_sync():
+    """
+    A sync should only check the dependencies of modified modules for new
+    indirect imports.
+    """
+    liveimport.register(globals(),"""
+    import B
+    from mod3 import *
+    """)
+    assert is_tracked("pkg.subpkg.ssmod2")
+    assert not liveimport._core._UNCHECKED
+
+    with _checked() as records:
+        touch_module("F")
+        liveimport.sync()
+
+    assert records == [ ["F"] ]
+
+
+def test_incremental_register():
+    """
+    Registering an import should only check the dependencies of newly
+    tracked modules.
+    """
+    liveimport.register(globals(),"import B")
+
+    with _checked() as records:
+        liveimport.register(globals(),"import mod6")
+
+    assert records == [ ["mod6"] ]
+    assert is_tracked("A") and is_tracked("pkg.smod1")
+    assert is_tracked("altpkg.amod1")
+
+
+def test_incremental_new_dependency():
+    """
+    A modified module's new dependencies should be tracked, and so should
+    their dependencies.
+    """
+    liveimport.register(globals(),"import mod1")
+
+    with revised_module("mod1",imports=["import mod3"]):
+        liveimport.sync()
+        assert is_tracked("mod3")
+        assert is_tracked("pkg.subpkg.ssmod2")
+        assert is_tracked("pkg.smod4")
+
+
+def test_incremental_workspace():
+    """
+    Changing the workspace should check the dependencies of all tracked
+    modules.
+    """
+    liveimport.workspace()
+    liveimport.register(globals(),"import B")
+    assert not is_tracked("C")
+
+    liveimport.workspace(root())
+    assert is_tracked("C") and is_tracked("E") and is_tracked("A")
+
+
+#
+# Check that newmod, a new import of mod1 analyzed before mod1 reloads, is
+# tracked once mod1 reloads, and that modifying it reloads mod1.  Tests
+# forget all state afterward since newmod is then no longer loaded.
+#
+
+def _check_newmod():
+    liveimport.sync()
+    assert is_tracked("newmod")
+    touch_module("newmod")
+    reload_clear()
+    liveimport.sync(observer=reload_observe)
+    reload_expect("newmod","mod1")
+
+
+def test_incremental_scoped():
+    """
+    A new import of a modified module a limited sync left outdated should be
+    tracked once the module reloads.
+    """
+    namespace_mod1:dict = dict(mod1=sys.modules["mod1"])
+    namespace_mod2:dict = dict(mod2=sys.modules["mod2"])
+    liveimport.register(namespace_mod1,"import mod1")
+    liveimport.register(namespace_mod2,"import mod2")
+
+    with (created_module("newmod","x = 1"),
+          revised_module("mod1",imports=["import newmod"])):
+        touch_module("mod2")
+        liveimport.sync(namespace=namespace_mod2)
+        _check_newmod()
+
+    liveimport._clear_all_state()
+
+
+def test_incremental_planned():
+    """
+    A new import of a modified module analyzed by plan() should be tracked
+    once the module reloads, even if imports are registered in between.
+    """
+    liveimport.register(globals(),"import mod1")
+
+    with (created_module("newmod","x = 1"),
+          revised_module("mod1",imports=["import newmod"])):
+        assert [ event.module for event in liveimport.plan() ] == [ "mod1" ]
+        liveimport.register(globals(),"import mod6")
+        _check_newmod()
+
+    liveimport._clear_all_state()
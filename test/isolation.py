@@ -0,0 +1,104 @@
+#
+# Tests of isolating reload failures.
+#
+
+import liveimport
+from setup import *
+from setup_imports import *
+
+
+#
+# Sync, returning the names of the modules reloaded and the ModuleError
+# raised, if any.
+#
+
+def _sync() -> tuple[list[str],liveimport.ModuleError|None]:
+    reload_clear()
+    try:
+        liveimport.sync(observer=reload_observe)
+        error = None
+    except liveimport.ModuleError as ex:
+        error = ex
+    return [ event.module for event in reload_list ], error
+
+
+def test_failure_stops_sync():
+    """
+    Without failure isolation, the first failed reload should stop the sync.
+    """
+    liveimport.register(globals(),"import B")
+
+    with revised_module("D",postscript="raise RuntimeError('fail')"):
+        touch_module("G")
+        reloaded, error = _sync()
+        assert error is not None and error.module == "D"
+        assert error.failures == [ error ]
+        assert "G" not in reloaded
+
+    reloaded, error = _sync()
+    assert error is None
+    assert reloaded == [ "D", "G", "B" ]
+
+
+def test_failure_isolated():
+    """
+    With failure isolation, a failed reload should only block the modules
+    depending on the failed module.
+    """
+    liveimport.configure(isolate_failures=True)
+    liveimport.register(globals(),"import B")
+
+    with revised_module("D",postscript="raise RuntimeError('fail')"):
+        touch_module("G")
+        reloaded, error = _sync()
+        assert error is not None and error.module == "D"
+        assert error.phase == "reload"
+        assert isinstance(error.__cause__,RuntimeError)
+        assert error.failures == [ error ]
+        assert reloaded == [ "G" ]
+
+    reloaded, error = _sync()
+    assert error is None
+    assert reloaded == [ "D", "B" ]
+
+
+def test_failures_collected():
+    """
+    With failure isolation, every failed reload should be reported, and
+    modules in an import cycle with a failed module should reload again with
+    it.
+    """
+    liveimport.configure(isolate_failures=True)
+    liveimport.register(globals(),"import B")
+
+    with (revised_module("C",postscript="raise RuntimeError('fail C')"),
+          revised_module("G",postscript="raise ValueError('fail G')")):
+        touch_module("F")
+        reloaded, error = _sync()
+        assert error is not None
+        assert [ failure.module for failure in error.failures ] == [ "C", "G" ]
+        assert isinstance(error.failures[1].__cause__,ValueError)
+        assert reloaded == [ "F", "A", "E", "D" ]
+        assert "also failed: G" in str(error)
+
+    reloaded, error = _sync()
+    assert error is None
+    assert reloaded == [ "A", "E", "C", "G", "B" ]
+
+
+def test_failure_typing():
+    """
+    With failure isolation, a module only needing a failed module for type
+    checking should still reload if dependencies only needed for type
+    checking are ignored.
+    """
+    liveimport.configure(isolate_failures=True, ignore_typing=True)
+    liveimport.register(globals(),"import B")
+
+    with revised_module("B",postscript="def f(x:'G.Thing') -> None: pass"):
+        liveimport.sync()
+        with revised_module("G",postscript="raise RuntimeError('fail')"):
+            touch_module("B")
+            reloaded, error = _sync()
+            assert error is not None and error.module == "G"
+            assert reloaded == [ "B" ]
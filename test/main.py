@@ -19,6 +19,24 @@ import obscurities
 import order
 import relative
 import workspace
+import watch
+import background
+import scandir
+import fingerprint
+import settle
+import threads
+import failcache
+import diskcache
+import scan
+import parsed
+import processes
+import indirects
+import record
+import typingonly
+import graph
+import plan
+import scoped
+import isolation
 import bootstrap
 import integration
 
@@ -124,6 +142,24 @@ def main():
     cases.extend(_get_cases(plaindir))
     cases.extend(_get_cases(relative))
     cases.extend(_get_cases(workspace))
+    cases.extend(_get_cases(watch))
+    cases.extend(_get_cases(background))
+    cases.extend(_get_cases(scandir))
+    cases.extend(_get_cases(fingerprint))
+    cases.extend(_get_cases(settle))
+    cases.extend(_get_cases(threads))
+    cases.extend(_get_cases(failcache))
+    cases.extend(_get_cases(diskcache))
+    cases.extend(_get_cases(scan))
+    cases.extend(_get_cases(parsed))
+    cases.extend(_get_cases(processes))
+    cases.extend(_get_cases(indirects))
+    cases.extend(_get_cases(record))
+    cases.extend(_get_cases(typingonly))
+    cases.extend(_get_cases(graph))
+    cases.extend(_get_cases(plan))
+    cases.extend(_get_cases(scoped))
+    cases.extend(_get_cases(isolation))
     cases.extend(_get_cases(bootstrap))
     cases.extend(_get_cases(integration))
 
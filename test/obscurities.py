@@ -144,19 +144,19 @@ def test_unknown_extension():
     liveimport.register(globals(),"import untethered_unknown_extension")
 
 
-def test_getmtime_failure():
+def test_stat_failure():
     """
-    sync() should raise the exception thrown by os.getmtime() when checking for
-    modifications if the reason getmtime() fails is not because the file is
+    sync() should raise the exception thrown by os.stat() when checking for
+    modifications if the reason stat() fails is not because the file is
     missing.
     """
-    def fake_getmtime(x):
+    def fake_stat(x):
         raise OSError()
 
     liveimport.register(globals(),"import mod1")
 
     try:
-        liveimport._core.getmtime = fake_getmtime
+        liveimport._core.stat = fake_stat
         try:
             liveimport.sync()
             error = None
@@ -164,4 +164,47 @@ def test_getmtime_failure():
             error = ex
         assert error is not None
     finally:
-        liveimport._core.getmtime = os.path.getmtime
+        liveimport._core.stat = os.stat
+
+
+def test_same_mtime_modified():
+    """
+    sync() should reload a module modified without changing its modification
+    time, provided its size changed.
+    """
+    liveimport.register(globals(),"import mod1")
+    mod1_tag = get_tag("mod1")
+
+    file = liveimport._MODULE_TABLE["mod1"].file
+    st = os.stat(file)
+
+    with revised_module("mod1",postscript="y=1"):
+        os.utime(file,ns=(st.st_atime_ns,st.st_mtime_ns))
+        reload_clear()
+        liveimport.sync(observer=reload_observe)
+        reload_expect("mod1")
+        expect_tag("mod1",next_tag(mod1_tag))
+
+
+def test_same_mtime_replaced():
+    """
+    sync() should reload a module whose source file is replaced by renaming a
+    file with the same modification time and size.
+    """
+    liveimport.register(globals(),"import mod1")
+    mod1_tag = get_tag("mod1")
+
+    file = liveimport._MODULE_TABLE["mod1"].file
+    st = os.stat(file)
+
+    with open(file,'rb') as f:
+        source = f.read()
+    with open(file + ".new",'wb') as f:
+        f.write(source)
+    os.utime(file + ".new",ns=(st.st_atime_ns,st.st_mtime_ns))
+    os.replace(file + ".new",file)
+
+    reload_clear()
+    liveimport.sync(observer=reload_observe)
+    reload_expect("mod1")
+    expect_tag("mod1",next_tag(mod1_tag))
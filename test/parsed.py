@@ -0,0 +1,106 @@
+#
+# Tests of compiling reloaded modules from syntax trees parsed by analysis.
+#
+
+import os
+import sys
+import ast
+import importlib.util
+from importlib.machinery import SourceFileLoader
+import liveimport
+from liveimport._core import _ParsedLoader, _ParsedFinder
+from setup import *
+from setup_imports import *
+
+
+#
+# Count compilations from syntax trees within a dynamic scope, yielding a one
+# element list holding the count.
+#
+
+class _counted_compiles:
+
+    def __enter__(self):
+        self.save = _ParsedLoader.source_to_code
+        self.count = [ 0 ]
+        save, count = self.save, self.count
+
+        def counting(loader, data, path, *, _optimize=-1):
+            if loader.parsed is not None and data == loader.parsed[0]:
+                count[0] += 1
+            return save(loader, data, path, _optimize=_optimize)
+
+        _ParsedLoader.source_to_code = counting  #type:ignore
+        return self.count
+
+    def __exit__(self, *args):
+        _ParsedLoader.source_to_code = self.save  #type:ignore
+
+
+def test_parsed_modified():
+    """
+    Modified modules should reload from the syntax trees parsed by analysis,
+    leaving standard loaders and no finder behind, and writing bytecode.
+    """
+    liveimport.register(globals(),"import mod1; from mod3 import *")
+    mod1_tag = get_tag("mod1")
+    meta_path = list(sys.meta_path)
+
+    with _counted_compiles() as count:
+        with revised_module("mod1",postscript="y=1"):
+            touch_module("pkg.subpkg.ssmod2")
+            reload_clear()
+            liveimport.sync(observer=reload_observe)
+            reload_expect("mod1","pkg.subpkg.ssmod2","mod3")
+
+    assert count[0] == 2
+    assert sys.meta_path == meta_path
+    expect_tag("mod1",next_tag(mod1_tag))
+    assert sys.modules["mod1"].y == 1
+
+    for name in ("mod1", "pkg.subpkg.ssmod2", "mod3"):
+        module = sys.modules[name]
+        assert type(module.__loader__) is SourceFileLoader
+        assert type(module.__spec__.loader) is SourceFileLoader
+
+    if not sys.dont_write_bytecode:
+        file = liveimport._MODULE_TABLE["mod1"].file
+        cached = importlib.util.cache_from_source(file)
+        assert os.path.getmtime(cached) >= os.path.getmtime(file)
+
+
+def test_parsed_stale():
+    """
+    A loader given a syntax tree should compile the source it reads rather
+    than the tree if the source differs from the parsed source.
+    """
+    def run(loader:_ParsedLoader, source:bytes):
+        namespace:dict = dict()
+        exec(loader.source_to_code(source,"stale.py"),namespace)
+        return namespace["y"]
+
+    parsed = (b"y=1", ast.parse(b"y=1"))
+    assert run(_ParsedLoader("stale","stale.py",parsed),b"y=2") == 2
+    assert run(_ParsedLoader("stale","stale.py",parsed),b"y=1") == 1
+
+
+def test_parsed_finder():
+    """
+    A finder given a syntax tree should only find the module it was given
+    the tree for, using the other finders, and skip those that cannot find
+    specs.
+    """
+    liveimport.register(globals(),"import mod1")
+    parsed = (b"y=1", ast.parse(b"y=1"))
+    finder = _ParsedFinder(liveimport._MODULE_TABLE["mod1"],parsed)
+    assert finder.find_spec("mod2",None) is None
+
+    meta_path = list(sys.meta_path)
+    try:
+        sys.meta_path[:] = [ finder, object() ]
+        assert finder.find_spec("mod1",None) is None
+        sys.meta_path[:] = [ finder, object(), *meta_path ]
+        spec = finder.find_spec("mod1",None)
+        assert isinstance(spec.loader,_ParsedLoader)
+    finally:
+        sys.meta_path[:] = meta_path
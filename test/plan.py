@@ -0,0 +1,152 @@
+#
+# Tests of planning reloads without performing them.
+#
+
+import os
+import sys
+import time
+import liveimport
+import liveimport._core
+from setup import *
+from setup_imports import *
+
+
+#
+# Return the module, reason, and after list of each event.
+#
+
+def _summary(events:list[liveimport.ReloadEvent]):
+    return [ (event.module, event.reason, event.after) for event in events ]
+
+
+def test_plan_nothing():
+    """
+    Planning when no module changed should return no reloads.
+    """
+    liveimport.register(globals(),"import A, B, C, D, E, F, G")
+    assert liveimport.plan() == []
+
+
+def test_plan_matches_sync():
+    """
+    A plan should list the reloads the next sync performs, in order, with the
+    same reasons and after lists.
+    """
+    liveimport.register(globals(),"import B")
+
+    touch_module("F")
+    touch_module("G")
+    planned = liveimport.plan()
+
+    assert _summary(planned) == [
+        ("F", "modified", []),
+        ("A", "dependent", ["C"]),
+        ("E", "dependent", ["A"]),
+        ("C", "dependent", ["E", "F"]),
+        ("D", "dependent", ["F"]),
+        ("G", "modified", []),
+        ("B", "dependent", ["C", "D", "G"]) ]
+
+    reload_clear()
+    liveimport.sync(observer=reload_observe)
+    assert _summary(reload_list) == _summary(planned)
+    assert ([ event.mtime for event in reload_list ] ==
+            [ event.mtime for event in planned ])
+
+
+def test_plan_reloads_nothing():
+    """
+    Planning should neither reload modules nor consider them up to date, so
+    planning twice gives the same result.
+    """
+    liveimport.register(globals(),"import mod1")
+    tag = get_tag("mod1")
+    stamp = liveimport._MODULE_TABLE["mod1"].stamp
+
+    touch_module("mod1")
+    first = liveimport.plan()
+    assert _summary(first) == [ ("mod1", "modified", []) ]
+    assert _summary(liveimport.plan()) == _summary(first)
+    expect_tag("mod1",tag)
+    assert liveimport._MODULE_TABLE["mod1"].stamp == stamp
+
+    liveimport.sync()
+    expect_tag("mod1",next_tag(tag))
+    assert liveimport.plan() == []
+
+
+def test_plan_new_dependency():
+    """
+    A plan should reflect dependencies added by modified modules.
+    """
+    liveimport.register(globals(),"import A, B, C, D, E, F, G")
+
+    with revised_module("G",imports=["import F"]):
+        liveimport.sync()
+        touch_module("F")
+        assert ([ event.module for event in liveimport.plan() ] ==
+                [ "F", "E", "C", "A", "D", "G", "B" ])
+
+
+def test_plan_fingerprint_unchanged():
+    """
+    When fingerprinting, planning should report no reload of a module whose
+    content is unchanged without marking the module up to date.
+    """
+    liveimport.configure(fingerprint=True)
+    liveimport.register(globals(),"import B")
+    info = liveimport._MODULE_TABLE["D"]
+    stamp = info.stamp
+
+    touch_module("D")
+    assert liveimport.plan() == []
+    assert info.stamp == stamp
+    assert "D" in liveimport._core._OUTDATED
+
+    with revised_module("F",postscript="y=1"):
+        assert ([ (event.module, event.reason)
+                  for event in liveimport.plan() ] ==
+                [ ("F", "modified"), ("A", "dependent"), ("E", "dependent"),
+                  ("C", "dependent"), ("D", "dependent"),
+                  ("B", "dependent") ])
+        assert info.stamp == stamp
+
+    reload_clear()
+    liveimport.sync(observer=reload_observe)
+    assert reload_list == []
+    assert info.stamp != stamp
+    assert "D" not in liveimport._core._OUTDATED
+
+
+def test_plan_no_settle():
+    """
+    Planning should not wait for modified source files to settle.
+    """
+    liveimport.configure(settle=5)
+    liveimport.register(globals(),"import mod1")
+
+    touch_module("mod1",0)
+    start = time.monotonic()
+    assert _summary(liveimport.plan()) == [ ("mod1", "modified", []) ]
+    assert time.monotonic() - start < 2
+
+
+def test_plan_unchanged():
+    """
+    With background detection and watching, planning when nothing has changed
+    since a sync should not check any files.
+    """
+    if not sys.platform.startswith("linux"): return
+
+    liveimport.configure(watch=True, background=True)
+    liveimport.register(globals(),"import mod1")
+    liveimport.sync()
+
+    def fake_stat(x):
+        raise OSError()
+
+    try:
+        liveimport._core.stat = fake_stat
+        assert liveimport.plan() == []
+    finally:
+        liveimport._core.stat = os.stat
@@ -0,0 +1,150 @@
+#
+# Tests of analyzing newly tracked modules concurrently.
+#
+
+import os
+import sys
+import liveimport
+import liveimport._core
+from setup import *
+from setup_imports import *
+
+
+_STATEMENT = """
+    from mod3 import *
+    import A, B, C, D, E, F, G
+    from altpkg import amod1
+    from subdir1 import mod7
+    """
+
+#
+# Register _STATEMENT using the given configuration after forgetting all
+# tracked modules, and return the resulting tracked modules and their
+# dependencies in order, and any ModuleError raised.  If reset is false,
+# keep the current configuration, including any worker processes.  Worker
+# processes are only used when the main module has no source file, so unless
+# script is true, we pretend that is so, as in a notebook.
+#
+
+def _track(reset:bool=True, script:bool=False, **options):
+    if reset:
+        liveimport._clear_all_state()
+        liveimport.workspace(root())
+    else:
+        for table in (liveimport._core._MODULE_TABLE,
+                      liveimport._core._NAMESPACE_TABLE,
+                      liveimport._core._OUTDATED, liveimport._core._DIRTY,
+                      liveimport._core._UNCHECKED):
+            table.clear()
+        liveimport._core._GRAPH = None
+    liveimport.configure(**options)
+    main = sys.modules["__main__"]
+    save_file = main.__file__
+    save_min = liveimport._core._PARALLEL_MIN
+    liveimport._core._PARALLEL_MIN = 1
+    if not script:
+        del main.__file__
+    try:
+        liveimport.register(globals(),_STATEMENT)
+        error = None
+    except liveimport.ModuleError as ex:
+        error = ex
+    finally:
+        main.__file__ = save_file
+        liveimport._core._PARALLEL_MIN = save_min
+    table = [ (name, info.dependencies, info.fingerprint)
+              for name, info in liveimport._MODULE_TABLE.items() ]
+    return table, error
+
+
+def test_concurrent_agrees():
+    """
+    Analyzing newly tracked modules using processes or threads should track
+    the same modules in the same order with the same dependencies.
+    """
+    serial, error = _track()
+    assert error is None and len(serial) > 10
+
+    for options in (dict(processes=2), dict(threads=2),
+                    dict(processes=2, fingerprint=True)):
+        expected, _ = _track(fingerprint=options.get("fingerprint",False))
+        actual, error = _track(**options)
+        assert error is None
+        assert actual == expected, options
+
+
+def test_concurrent_failure():
+    """
+    If analyzing a newly tracked module concurrently fails, the usual error
+    should be raised, and the same modules should be tracked as when
+    analyzing sequentially.
+    """
+    with revised_module("pkg.subpkg.ssmod2",postscript="not valid python"):
+        serial, serial_error = _track()
+        threaded, threaded_error = _track(threads=2)
+
+    _track(processes=2)
+    assert liveimport._core._PROCESS_POOL is not None
+
+    with revised_module("pkg.subpkg.ssmod2",postscript="not valid python"):
+        actual, error = _track(reset=False)
+
+    assert serial_error is not None
+    for error in (threaded_error, error):
+        assert error is not None
+        assert error.module == serial_error.module == "pkg.subpkg.ssmod2"
+        assert error.phase == "analysis"
+    assert threaded == actual == serial
+
+
+def test_concurrent_broken():
+    """
+    If the worker processes die, analysis should fall back to this process,
+    and later cohorts should start new worker processes.
+    """
+    expected, _ = _track()
+    _track(processes=2)
+    pool = liveimport._core._PROCESS_POOL
+    assert pool is not None
+
+    try:
+        pool.submit(os._exit,1).result()
+    except Exception:
+        pass
+
+    actual, error = _track(reset=False)
+    assert error is None and actual == expected
+    assert liveimport._core._PROCESS_POOL is not pool
+
+
+def test_concurrent_small():
+    """
+    Small cohorts should not start worker processes.
+    """
+    liveimport.configure(processes=2)
+    liveimport.register(globals(),"import mod1")
+    assert liveimport._core._PROCESS_POOL is None
+
+
+def test_concurrent_invalid():
+    """
+    configure() should reject invalid process counts.
+    """
+    for processes in (-1, 2.5):
+        try:
+            liveimport.configure(processes=processes)
+            error = None
+        except ValueError as ex:
+            error = ex
+        assert error is not None
+
+
+def test_concurrent_script():
+    """
+    Worker processes should not start when the main module has a source file,
+    since they would run it again.
+    """
+    expected, _ = _track()
+    actual, error = _track(script=True,processes=2)
+    assert error is None and actual == expected
+    assert liveimport._core._PROCESS_POOL is None
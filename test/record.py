@@ -0,0 +1,199 @@
+#
+# Tests of recording imports instead of analyzing source files.
+#
+
+import os
+import builtins
+import importlib
+import sys
+import liveimport
+import liveimport._core
+from liveimport._core import _ModuleInfo
+from liveimport._record import _Recorder
+from setup import *
+from setup_imports import *
+
+
+#
+# Return the number of dependency analyses fn() performs.
+#
+
+def _count_analyses(fn) -> int:
+    save_analyze = _ModuleInfo.analyze_dependencies
+    count = [ 0 ]
+
+    def counting_analyze(self, source):
+        count[0] += 1
+        return save_analyze(self, source)
+
+    _ModuleInfo.analyze_dependencies = counting_analyze
+    try:
+        fn()
+    finally:
+        _ModuleInfo.analyze_dependencies = save_analyze
+    return count[0]
+
+
+def test_record_matches_analysis():
+    """
+    The recorded imports of a module should match its analyzed dependencies,
+    and tracking a module with recorded imports should not analyze it.
+    """
+    liveimport.register(globals(),"import C")
+    analyzed = set(liveimport._MODULE_TABLE["C"].dependencies)
+
+    liveimport._clear_all_state()
+    liveimport.workspace(root())
+    liveimport.configure(record_imports=True)
+    importlib.reload(sys.modules["C"])
+
+    count = _count_analyses(
+        lambda: liveimport.register(globals(),"import C"))
+    assert count == len(liveimport._MODULE_TABLE) - 1
+    assert set(liveimport._MODULE_TABLE["C"].dependencies) == analyzed
+
+
+def test_record_relative():
+    """
+    Recorded relative imports should resolve against the importer's package,
+    matching analyzed dependencies.
+    """
+    liveimport.register(globals(),"import pkg.subpkg.ssmod2")
+    analyzed = set(liveimport._MODULE_TABLE["pkg.subpkg.ssmod2"].dependencies)
+
+    liveimport._clear_all_state()
+    liveimport.workspace(root())
+    liveimport.configure(record_imports=True)
+    importlib.reload(sys.modules["pkg.subpkg.ssmod2"])
+    recorder = liveimport._core._RECORDER
+    assert recorder is not None
+    assert set(recorder.get("pkg.subpkg.ssmod2") or ()) == analyzed
+
+    liveimport.register(globals(),"import pkg.subpkg.ssmod2")
+    recorded = liveimport._MODULE_TABLE["pkg.subpkg.ssmod2"].dependencies
+    assert set(recorded) == analyzed
+
+
+def test_record_names():
+    """
+    Recording should resolve relative imports without __package__, ignore
+    relative imports escaping the top level package and importers without
+    names, and never make an import fail.
+    """
+    def accept(importer, file):
+        if importer == "bad":
+            raise RuntimeError("not accepted")
+        return True
+
+    recorder = _Recorder(accept)
+    try:
+        recorder.record("x",{ "__name__": 1 },(),0)
+        recorder.record("x",{ "__name__": "p.q.m" },(),1)
+        recorder.record("",{ "__name__": "p.q.m" },("y", "*"),1)
+        recorder.record("x",{ "__name__": "p.q.m" },(),3)
+        recorder.record("x",{ "__name__": "p.q", "__path__": [] },(),1)
+        assert recorder.get("p.q.m") == [ "p.q.x", "p.q", "p.q.y" ]
+        assert recorder.get("p.q") == [ "p.q.x" ]
+
+        assert recorder.import_("os",{ "__name__": "bad" }) is os
+        assert recorder.get("bad") is None
+
+        assert recorder.begin("p.r") is None
+        recorder.restore("p.r",None)
+        assert recorder.get("p.r") is None
+    finally:
+        recorder.stop()
+
+
+def test_record_fingerprint():
+    """
+    When fingerprinting, modules with recorded imports should be fingerprinted
+    when tracked, so unchanged content does not reload.
+    """
+    liveimport.configure(record_imports=True, fingerprint=True)
+    importlib.reload(sys.modules["mod1"])
+
+    assert _count_analyses(
+        lambda: liveimport.register(globals(),"import mod1")) == 0
+    assert liveimport._MODULE_TABLE["mod1"].fingerprint is not None
+
+    touch_module("mod1")
+    reload_clear()
+    liveimport.sync(observer=reload_observe)
+    reload_expect()
+
+
+def test_record_reload():
+    """
+    Reloading a module should record its imports, and later changes should
+    not be analyzed.
+    """
+    liveimport.configure(record_imports=True)
+    liveimport.register(globals(),"import mod1")
+
+    with revised_module("mod1",imports=["import mod6"]):
+        liveimport.sync()
+        assert is_tracked("mod6")
+        assert "mod6" in liveimport._MODULE_TABLE["mod1"].dependencies
+
+        touch_module("mod1")
+        reload_clear()
+        assert _count_analyses(
+            lambda: liveimport.sync(observer=reload_observe)) == 0
+        reload_expect("mod1")
+
+
+def test_record_lazy():
+    """
+    Imports in functions should be recorded when the functions run, and the
+    modules they import should then be tracked.
+    """
+    liveimport.configure(record_imports=True)
+    liveimport.register(globals(),"import mod1")
+
+    with revised_module("mod1",postscript="def lazy():\n    import mod6\n"):
+        liveimport.sync()
+        assert not is_tracked("mod6")
+        sys.modules["mod1"].lazy()
+        liveimport.sync()
+        assert is_tracked("mod6")
+        assert is_tracked("altpkg.amod1")
+
+        touch_module("mod6")
+        reload_clear()
+        liveimport.sync(observer=reload_observe)
+        reload_expect("mod6","mod1")
+
+
+def test_record_failure():
+    """
+    A failed reload should not replace a module's recorded imports.
+    """
+    liveimport.configure(record_imports=True)
+    liveimport.register(globals(),"import mod1")
+
+    with revised_module("mod1",imports=["import mod6"]):
+        liveimport.sync()
+
+    with revised_module("mod1",imports=["import mod6"],
+                        postscript="raise RuntimeError('fail')"):
+        try:
+            liveimport.sync()
+            error = None
+        except liveimport.ModuleError as ex:
+            error = ex
+        assert error is not None and error.phase == "reload"
+        assert "mod6" in liveimport._MODULE_TABLE["mod1"].dependencies
+
+    liveimport.sync()
+
+
+def test_record_disable():
+    """
+    Disabling recording should restore the original __import__.
+    """
+    original = builtins.__import__
+    liveimport.configure(record_imports=True)
+    assert builtins.__import__ is not original
+    liveimport.configure(record_imports=False)
+    assert builtins.__import__ is original
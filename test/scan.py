@@ -0,0 +1,150 @@
+#
+# Tests of scanning for import statements.
+#
+
+import ast
+import textwrap
+import liveimport
+from liveimport._scan import _scan_imports
+from setup import *
+from setup_imports import *
+
+
+#
+# Return the top level imports of source as found by parsing the entire
+# source, and as found by scanning.
+#
+
+def _both(source:str) -> tuple[list[str],list[str]|None]:
+    encoded = textwrap.dedent(source).encode()
+    parsed = [ ast.dump(stmt) for stmt in ast.parse(encoded).body
+               if isinstance(stmt,(ast.Import,ast.ImportFrom)) ]
+    scanned = _scan_imports(encoded)
+    return parsed, (None if scanned is None else
+                    [ ast.dump(stmt) for stmt in scanned ])
+
+
+def test_scan_agrees():
+    """
+    Scanning should find the same top level imports as parsing, ignoring
+    import statements in strings, comments, and nested blocks.
+    """
+    sources = [
+        """
+        '''Docstring
+        import not_a_module
+        '''
+        import os, sys as system
+        from . import sibling
+        from ..parent import (a,
+            b as c,   # comment
+        )
+        from x import \\
+            y
+        # import not_a_module
+        x = "import not_a_module"
+        y = f'''
+        from not_a_module import z
+        '''
+        if x:
+            import not_top_level
+        def f():
+            from not_top_level import g
+        import last; import also_last
+        """,
+        """
+        x = 1
+        """,
+        """
+        r'''\\\\''' ; import_thing = 1
+        from_thing = 2
+        import a.b.c
+        """,
+        "\ufeffimport os\nimport sys\n",
+    ]
+
+    for source in sources:
+        parsed, scanned = _both(source)
+        assert scanned == parsed, source
+
+
+def test_scan_ambiguous():
+    """
+    Scanning should report ambiguous sources rather than guess.
+    """
+    sources = [
+        """
+        x = 1; import hidden
+        """,
+        """
+        def g():
+            x = (yield
+        from f())
+        """,
+        """
+        # -*- coding: latin-1 -*-
+        import os
+        """,
+        """
+        import os; x = "("
+        """,
+    ]
+
+    for source in sources:
+        parsed, scanned = _both(source)
+        assert scanned is None, source
+
+
+def test_scan_modules():
+    """
+    Scanning should find the same dependencies as parsing for every module
+    in the test hierarchy.
+    """
+    liveimport.register(globals(),"""
+    import mod1, mod6, A, B, C, D, E, F, G
+    from mod3 import *
+    from altpkg import amod1
+    from subdir1 import mod7
+    """)
+
+    for info in liveimport._MODULE_TABLE.values():
+        if info.file is None: continue
+        with open(info.file,'rb') as f:
+            source = f.read()
+        parsed = set(info.dependencies)
+        liveimport.configure(scan=True)
+        try:
+            info.analyze_dependencies(source)
+        finally:
+            liveimport.configure(scan=False)
+        assert set(info.dependencies) == parsed
+        info.dependencies = list(parsed)
+
+
+def test_scan_sync():
+    """
+    With scanning, new imports should be tracked, and syntax errors outside
+    import statements should be reported when reloading.
+    """
+    liveimport.configure(scan=True)
+    liveimport.register(globals(),"import mod1")
+
+    with revised_module("mod1",imports=["import mod6"]):
+        liveimport.sync()
+        assert is_tracked("mod6")
+
+    with revised_module("mod1",postscript="not valid python"):
+        try:
+            liveimport.sync()
+            error = None
+        except liveimport.ModuleError as ex:
+            error = ex
+        assert error is not None and error.phase == "reload"
+
+    with revised_module("mod1",imports=["import (mod6"]):
+        try:
+            liveimport.sync()
+            error = None
+        except liveimport.ModuleError as ex:
+            error = ex
+        assert error is not None and error.phase == "analysis"
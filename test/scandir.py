@@ -0,0 +1,119 @@
+#
+# Tests of checking modification times using directory reads.
+#
+
+import os
+import liveimport
+from liveimport._core import _stamps
+from setup import *
+from setup_imports import *
+
+
+def test_scandir_agrees():
+    """
+    Modification times found using directory reads should agree with those
+    found by checking files individually, including for missing files.
+    """
+    liveimport.register(globals(),"""
+    import mod1, mod6
+    from mod2 import mod2_public1
+    from altpkg import amod1
+    """)
+
+    files = [ info.file for info in liveimport._MODULE_TABLE.values() ]
+    files.append(root() + "/does_not_exist.py")
+    files.append(root() + "/no_such_dir/does_not_exist.py")
+    files.append(root() + "/no_such_dir/also_does_not_exist.py")
+    files.append(root() + "/mod1.py/not_a_dir.py")
+    files.append(root() + "/mod1.py/also_not_a_dir.py")
+    files.append(None)
+
+    assert _stamps(files,True) == _stamps(files,False)
+
+
+def test_scandir_vanished():
+    """
+    A source file that vanishes between reading its directory and checking it
+    should be checked individually.
+    """
+    liveimport.register(globals(),"import mod1, mod6")
+    files = [ info.file for info in liveimport._MODULE_TABLE.values() ]
+
+    class VanishedEntry:
+        def __init__(self, entry):
+            self.name = entry.name
+        def stat(self):
+            raise FileNotFoundError()
+
+    class VanishedScandir:
+        def __init__(self, dir):
+            with save_scandir(dir) as entries:
+                self.entries = [ VanishedEntry(entry) for entry in entries ]
+        def __enter__(self):
+            return self.entries
+        def __exit__(self, *args):
+            pass
+
+    save_scandir = os.scandir
+    try:
+        os.scandir = VanishedScandir
+        stamps = _stamps(files,True)
+    finally:
+        os.scandir = save_scandir
+
+    assert stamps == _stamps(files,False)
+    assert None not in stamps
+
+
+def test_scandir_modified():
+    """
+    With directory reads, modified modules should reload and missing modules
+    should be bypassed.
+    """
+    liveimport.configure(scandir=True)
+    liveimport.register(globals(),"""
+    import mod1
+    from mod2 import mod2_public1
+    """)
+
+    mod1_tag = get_tag("mod1")
+    mod2_tag = get_tag("mod2")
+
+    touch_module("mod1")
+    touch_module("mod2")
+
+    with deleted_module("mod1"):
+        reload_clear()
+        liveimport.sync(observer=reload_observe)
+        reload_expect("mod2")
+
+    reload_clear()
+    liveimport.sync(observer=reload_observe)
+    reload_expect("mod1")
+
+    expect_tag("mod1",next_tag(mod1_tag))
+    expect_tag("mod2",next_tag(mod2_tag))
+
+
+def test_scandir_failure():
+    """
+    With directory reads, sync() should raise the exception thrown when
+    checking a source file if the reason is not that the file is missing.
+    """
+    def fake_scandir(x):
+        raise PermissionError()
+
+    liveimport.configure(scandir=True)
+    liveimport.register(globals(),"import mod1, mod6")
+
+    save_scandir = os.scandir
+    try:
+        os.scandir = fake_scandir
+        try:
+            liveimport.sync()
+            error = None
+        except OSError as ex:
+            error = ex
+        assert error is not None
+    finally:
+        os.scandir = save_scandir
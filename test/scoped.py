@@ -0,0 +1,183 @@
+#
+# Tests of syncs limited to a namespace or to given modules.
+#
+
+import sys
+import liveimport
+import liveimport._core
+from setup import *
+from setup_imports import *
+
+
+#
+# Return the module, reason, and after list of each event.
+#
+
+def _summary(events:list[liveimport.ReloadEvent]):
+    return [ (event.module, event.reason, event.after) for event in events ]
+
+
+def test_scoped_namespace():
+    """
+    A sync limited to a namespace should only reload the modules that
+    namespace imports and their dependencies, leaving modules depending on
+    reloaded modules for a later sync.
+    """
+    namespace_A:dict = dict(A=sys.modules["A"])
+    namespace_D:dict = dict(D=sys.modules["D"])
+    liveimport.register(namespace_A,"import A")
+    liveimport.register(namespace_D,"import D")
+
+    touch_module("F")
+    reload_clear()
+    liveimport.sync(observer=reload_observe,namespace=namespace_D)
+    assert _summary(reload_list) == [
+        ("F", "modified", []),
+        ("D", "dependent", ["F"]) ]
+    assert namespace_D["D"] is sys.modules["D"]
+
+    planned = [ ("E", "dependent", ["A"]),
+                ("C", "dependent", ["E", "F"]),
+                ("A", "dependent", ["C"]) ]
+    assert _summary(liveimport.plan(namespace=namespace_D)) == []
+    assert _summary(liveimport.plan(namespace=namespace_A)) == planned
+    assert _summary(liveimport.plan()) == planned
+
+    reload_clear()
+    liveimport.sync(observer=reload_observe)
+    assert _summary(reload_list) == planned
+    assert not liveimport._core._PENDING
+
+    reload_clear()
+    liveimport.sync(observer=reload_observe)
+    assert reload_list == []
+
+
+def test_scoped_modules():
+    """
+    A sync limited to modules should leave other modified modules outdated.
+    """
+    liveimport.register(globals(),"import B")
+
+    touch_module("F")
+    touch_module("G")
+    reload_clear()
+    liveimport.sync(observer=reload_observe,modules=["G"])
+    assert _summary(reload_list) == [ ("G", "modified", []) ]
+
+    reload_clear()
+    liveimport.sync(observer=reload_observe,modules=["D"])
+    assert _summary(reload_list) == [
+        ("F", "modified", []),
+        ("D", "dependent", ["F"]) ]
+
+    reload_clear()
+    liveimport.sync(observer=reload_observe,modules=["B"])
+    assert _summary(reload_list) == [
+        ("A", "dependent", ["C"]),
+        ("E", "dependent", ["A"]),
+        ("C", "dependent", ["E", "F"]),
+        ("B", "dependent", ["C", "D", "G"]) ]
+    assert not liveimport._core._PENDING
+
+
+def test_scoped_detached():
+    """
+    Modules a limited sync left pending should be forgotten once no namespace
+    imports them, directly or indirectly.
+    """
+    namespace_A:dict = dict(A=sys.modules["A"])
+    namespace_D:dict = dict(D=sys.modules["D"])
+    liveimport.register(namespace_A,"import A")
+    liveimport.register(namespace_D,"import D")
+
+    touch_module("F")
+    liveimport.sync(namespace=namespace_D)
+    assert list(liveimport._core._PENDING) == [ "C" ]
+    liveimport._verify()
+
+    liveimport.register(namespace_A,"",clear=True)
+    reload_clear()
+    liveimport.sync(observer=reload_observe)
+    assert reload_list == []
+    assert not liveimport._core._PENDING
+
+
+def test_scoped_overlapping():
+    """
+    Limiting a sync to modules that depend on each other should reload each
+    of them once.
+    """
+    liveimport.register(globals(),"import B")
+
+    touch_module("F")
+    reload_clear()
+    liveimport.sync(observer=reload_observe,modules=["F","D"])
+    assert _summary(reload_list) == [
+        ("F", "modified", []),
+        ("D", "dependent", ["F"]) ]
+
+
+def test_scoped_typing():
+    """
+    A module only needing a module a limited sync reloads for type checking
+    should not be left pending if such dependencies are ignored.
+    """
+    liveimport.configure(ignore_typing=True)
+    liveimport.register(globals(),"import B")
+
+    with revised_module("B",postscript="def f(x:'G.Thing') -> None: pass"):
+        liveimport.sync()
+        touch_module("G")
+        reload_clear()
+        liveimport.sync(observer=reload_observe,modules=["G"])
+        assert _summary(reload_list) == [ ("G", "modified", []) ]
+        assert not liveimport._core._PENDING
+
+
+def test_scoped_broken():
+    """
+    A sync limited to a namespace should neither analyze nor fail on modified
+    modules outside its scope.
+    """
+    namespace_1:dict = dict(mod1=sys.modules["mod1"])
+    namespace_2:dict = dict(mod2=sys.modules["mod2"])
+    liveimport.register(namespace_1,"import mod1")
+    liveimport.register(namespace_2,"import mod2")
+    mod1_tag = get_tag("mod1")
+
+    with (revised_module("mod1",postscript="not valid python"),
+          revised_module("mod2",postscript="y=1")):
+        reload_clear()
+        liveimport.sync(observer=reload_observe,namespace=namespace_2)
+        assert _summary(reload_list) == [ ("mod2", "modified", []) ]
+        assert sys.modules["mod2"].y == 1
+        assert liveimport.plan(namespace=namespace_2) == []
+        assert "mod1" in liveimport._core._OUTDATED
+
+        try:
+            liveimport.sync()
+            error = None
+        except liveimport.ModuleError as ex:
+            error = ex
+        assert error is not None and error.module == "mod1"
+        assert error.phase == "analysis"
+
+    liveimport.sync()
+    expect_tag("mod1",next_tag(mod1_tag))
+
+
+def test_scoped_untracked():
+    """
+    Limiting a sync to modules that are not tracked, or to a string rather
+    than module names, should fail.
+    """
+    liveimport.register(globals(),"import mod1")
+
+    for modules in ([ "mod1", "does_not_exist" ], "mod1"):
+        try:
+            liveimport.sync(modules=modules)
+            error = None
+        except ValueError as ex:
+            error = ex
+        assert error is not None
@@ -0,0 +1,107 @@
+#
+# Tests of waiting for modified source files to settle.
+#
+
+import os
+import time
+import threading
+import liveimport
+import liveimport._core
+from setup import *
+from setup_imports import *
+
+
+def test_settle_wait():
+    """
+    With a settle window, sync() should wait until a modified module has gone
+    unmodified for the window before reloading it.
+    """
+    liveimport.configure(settle=0.3)
+    liveimport.register(globals(),"import mod1")
+    mod1_tag = get_tag("mod1")
+
+    touch_module("mod1",0)
+
+    start = time.monotonic()
+    liveimport.sync()
+    elapsed = time.monotonic() - start
+
+    assert elapsed >= 0.2
+    expect_tag("mod1",next_tag(mod1_tag))
+
+    start = time.monotonic()
+    liveimport.sync()
+    assert time.monotonic() - start < 0.2
+
+
+def test_settle_storm():
+    """
+    With a settle window, sync() should not analyze or reload a module until a
+    series of rapid writes is complete.
+    """
+    liveimport.configure(settle=0.3)
+    liveimport.register(globals(),"import mod1; from mod2 import *")
+    mod1_tag = get_tag("mod1")
+    mod2_tag = get_tag("mod2")
+
+    def storm():
+        modify_module("mod2",0.1,postscript="not valid python")
+        modify_module("mod2",0.1,postscript="y=2")
+        restore_module("mod1",0)
+
+    modify_module("mod1",0,postscript="not valid python")
+    thread = threading.Thread(target=storm)
+    thread.start()
+
+    try:
+        reload_clear()
+        liveimport.sync(observer=reload_observe)
+        reload_expect("mod1","mod2")
+        expect_tag("mod1",next_tag(mod1_tag))
+        expect_tag("mod2",next_tag(mod2_tag))
+    finally:
+        thread.join()
+        restore_module("mod2")
+
+
+def test_settle_limit():
+    """
+    sync() should stop waiting for modified modules to settle after a limit,
+    and should not wait for modules with modification times in the future.
+    """
+    liveimport.configure(settle=5)
+    save_limit = liveimport._core._SETTLE_LIMIT
+    liveimport._core._SETTLE_LIMIT = 0.1
+
+    try:
+        liveimport.register(globals(),"import mod1, mod6")
+        mod1_tag = get_tag("mod1")
+        mod6_tag = get_tag("mod6")
+
+        touch_module("mod1",0)
+        future = time.time() + 60
+        os.utime(liveimport._MODULE_TABLE["mod6"].file,(future,future))
+
+        start = time.monotonic()
+        liveimport.sync()
+        assert time.monotonic() - start < 1
+
+        expect_tag("mod1",next_tag(mod1_tag))
+        expect_tag("mod6",next_tag(mod6_tag))
+    finally:
+        liveimport._core._SETTLE_LIMIT = save_limit
+
+
+def test_settle_invalid():
+    """
+    configure() should reject a negative settle window, and one longer than
+    the limit on the total wait.
+    """
+    for settle in (-1, 6):
+        try:
+            liveimport.configure(settle=settle)
+            error = None
+        except ValueError as ex:
+            error = ex
+        assert error is not None
+    assert liveimport._core._SETTLE == 0
@@ -20,7 +20,7 @@ from liveimport import _is_tracked as is_tracked
 
 __all__ = [
     "modify_module", "restore_module", "revised_module",
-    "deleted_module",
+    "deleted_module", "created_module",
     "touch_module",
     "is_registered_fn", "is_tracked", "hash_state",
     "get_tag", "next_tag", "expect_tag",
@@ -366,6 +366,28 @@ def deleted_module(modulename:str):
     yield
     _undelete_module(modulename)
 
+#
+# Create a top level module that is not part of the hierarchy, as in
+#
+#       with created_module("newmod","x = 1"):
+#           ... make sure a new import of newmod is handled correctly ...
+#
+# On scope exit, the source file is removed and the module is forgotten.
+#
+
+@contextmanager
+def created_module(modulename:str, source:str=""):
+    assert _ROOT is not None
+    filename = os.path.join(_ROOT, modulename + ".py")
+    with open(filename,"w") as f:
+        f.write(textwrap.dedent(source))
+    importlib.invalidate_caches()
+    try:
+        yield
+    finally:
+        os.remove(filename)
+        sys.modules.pop(modulename,None)
+
 #
 # Change a module's modification time to the current time, sleeping for the
 # specified number of seconds afterward.
@@ -0,0 +1,103 @@
+#
+# Tests of checking and reading source files using a thread pool.
+#
+
+import os
+import liveimport
+import liveimport._core
+from concurrent.futures import ThreadPoolExecutor
+from liveimport._core import _stamps
+from setup import *
+from setup_imports import *
+
+
+def test_threads_agree():
+    """
+    Stamps found using a thread pool should agree with those found serially,
+    with and without directory reads.
+    """
+    liveimport.register(globals(),"""
+    import mod1, mod6
+    from mod2 import mod2_public1
+    from altpkg import amod1
+    """)
+
+    files = [ info.file for info in liveimport._MODULE_TABLE.values() ]
+    files.append(root() + "/does_not_exist.py")
+    files.append(None)
+
+    with ThreadPoolExecutor(3) as pool:
+        for batch in (False, True):
+            assert _stamps(files,batch,pool) == _stamps(files,batch)
+
+
+def test_threads_modified():
+    """
+    With a thread pool, modified modules and their dependents should reload
+    in the same order as without one.
+    """
+    liveimport.register(globals(),"import mod1, A, B, C, D, E, F, G")
+
+    def reload_order():
+        touch_module("mod1")
+        touch_module("F")
+        touch_module("G")
+        reload_clear()
+        liveimport.sync(observer=reload_observe)
+        return [ event.module for event in reload_list ]
+
+    serial = reload_order()
+    liveimport.configure(threads=4)
+    assert reload_order() == serial
+    assert "mod1" in serial and "F" in serial and "G" in serial
+
+    with revised_module("mod1",imports=["import mod2"]):
+        liveimport.sync()
+        assert is_tracked("mod2")
+
+
+def test_threads_failure():
+    """
+    With a thread pool, sync() should raise exceptions thrown when checking
+    source files.
+    """
+    def fake_stat(x):
+        raise PermissionError()
+
+    liveimport.configure(threads=2)
+    liveimport.register(globals(),"import mod1, mod6")
+
+    try:
+        liveimport._core.stat = fake_stat
+        try:
+            liveimport.sync()
+            error = None
+        except OSError as ex:
+            error = ex
+        assert error is not None
+    finally:
+        liveimport._core.stat = os.stat
+
+
+def test_threads_reconfigure():
+    """
+    Reconfiguring the number of threads should replace the pool, and
+    configure() should reject invalid thread counts.
+    """
+    liveimport.configure(threads=2)
+    pool = liveimport._core._POOL
+    assert pool is not None
+
+    liveimport.configure(threads=2)
+    assert liveimport._core._POOL is pool
+
+    liveimport.configure(threads=1)
+    assert liveimport._core._POOL is None
+
+    for threads in (-1, 2.5):
+        try:
+            liveimport.configure(threads=threads)
+            error = None
+        except ValueError as ex:
+            error = ex
+        assert error is not None
@@ -0,0 +1,118 @@
+#
+# Tests of ignoring dependencies only needed for type checking.
+#
+
+import textwrap
+import liveimport
+from liveimport._core import _analyze
+from setup import *
+from setup_imports import *
+
+
+#
+# Return the dependencies of source only needed for type checking.
+#
+
+def _typing_only(source:str, file:str="pkg/mod.py") -> list[str]|None:
+    _, typing_only, _ = _analyze(textwrap.dedent(source).encode(),
+                                 "pkg",file,False,True)
+    return typing_only
+
+
+def test_typing_analysis():
+    """
+    Imports of names only used in unevaluated annotations should be
+    classified as only needed for type checking.
+    """
+    assert _typing_only("""
+        from __future__ import annotations
+        import a, b, c.d
+        from e import E, F
+        from . import g
+        def f(x:a.X, y:"E") -> c.d.Y:
+            v:g.Z = b.run(x)
+            return F(v)
+        """) == [ "a", "c.d", "e.E", "pkg", "pkg.g" ]
+
+    assert _typing_only("""
+        import a, b
+        from e import E
+        def f(x:a.X, y:"E") -> None:
+            v:b.Y = 1
+        class K:
+            w:b.Z
+        """) == [ "e", "e.E" ]
+
+    assert _typing_only("""
+        import a, b
+        from e import E
+        __all__ = [ "E" ]
+        def f(x:"a.X") -> None:
+            pass
+        """) == [ "a" ]
+
+    assert _typing_only("""
+        import a, b, c, d, e
+        @a.register
+        def f(x:"not valid (", y=b.DEFAULT, *, z:"c.Z", w=None) -> None:
+            g = lambda: d.run()
+        """) == [ "c" ]
+
+
+def test_typing_reexports():
+    """
+    Names a package re-exports should not be classified as only needed for
+    type checking, whether the package's __init__ imports them or a module
+    lists them in __all__.
+    """
+    source = """
+        from __future__ import annotations
+        from .impl import Foo
+        def make() -> Foo:
+            pass
+        """
+    assert _typing_only(source) == [ "pkg.impl", "pkg.impl.Foo" ]
+    assert _typing_only(source,"pkg/__init__.py") == []
+
+    assert _typing_only("""
+        from __future__ import annotations
+        from .impl import Foo, Bar
+        __all__:list[str] = [ "make" ]
+        __all__ += [ "Foo" ]
+        def make(x:Bar) -> Foo:
+            pass
+        """) == [ "pkg.impl.Bar" ]
+
+
+def _touch_G(ignore_typing:bool, postscript:str, *expected:str):
+    liveimport.configure(ignore_typing=ignore_typing)
+    liveimport.register(globals(),"import B")
+    with revised_module("B",postscript=postscript):
+        liveimport.sync()
+        touch_module("G")
+        reload_clear()
+        liveimport.sync(observer=reload_observe)
+        reload_expect(*expected)
+
+
+def test_typing_ignored():
+    """
+    A module that only needs a reloaded module for type checking should not
+    reload.
+    """
+    _touch_G(True,"def f(x:'G.Thing') -> 'G.Thing': return x","G")
+
+
+def test_typing_not_ignored():
+    """
+    Without ignoring dependencies only needed for type checking, a module
+    using a reloaded module only for type checking should reload.
+    """
+    _touch_G(False,"def f(x:'G.Thing') -> 'G.Thing': return x","G","B")
+
+
+def test_typing_evaluated():
+    """
+    A module using a reloaded module in evaluated annotations should reload.
+    """
+    _touch_G(True,"def f(x:G.x) -> G.x: return x","G","B")
@@ -0,0 +1,302 @@
+#
+# Tests of change detection using a watcher.  Where watching is unavailable
+# (anywhere but Linux), configure(watch=True) reverts to polling, so the
+# behavioral tests apply everywhere.
+#
+
+import os
+import sys
+import tempfile
+import liveimport
+import liveimport._core
+import liveimport._watch
+from liveimport._watch import _Watcher
+from setup import *
+from setup_imports import *
+
+
+_CAN_WATCH = sys.platform.startswith("linux")
+
+
+def test_watch_modified():
+    """
+    With watching enabled, modified modules and their dependents should
+    reload.
+    """
+    liveimport.configure(watch=True)
+    liveimport.register(globals(),"import mod1; from mod3 import *")
+
+    assert (liveimport._core._WATCHER is not None) == _CAN_WATCH
+
+    mod1_tag    = get_tag("mod1")
+    mod3_tag    = get_tag("mod3")
+    ssmod2_tag  = get_tag("pkg.subpkg.ssmod2")
+
+    liveimport.sync()
+
+    touch_module("mod1")
+    touch_module("pkg.subpkg.ssmod2")
+
+    reload_clear()
+    liveimport.sync(observer=reload_observe)
+    reload_expect("mod1","pkg.subpkg.ssmod2","mod3")
+
+    expect_tag("mod1",next_tag(mod1_tag))
+    expect_tag("mod3",next_tag(mod3_tag))
+    expect_tag("pkg.subpkg.ssmod2",next_tag(ssmod2_tag))
+
+    reload_clear()
+    liveimport.sync(observer=reload_observe)
+    reload_expect()
+
+
+def test_watch_enabled_late():
+    """
+    Modifications made before watching is enabled should not be missed.
+    """
+    liveimport.register(globals(),"import mod1")
+    mod1_tag = get_tag("mod1")
+
+    touch_module("mod1")
+    liveimport.configure(watch=True)
+    liveimport.sync()
+
+    expect_tag("mod1",next_tag(mod1_tag))
+
+
+def test_watch_clean_sync():
+    """
+    With watching enabled, a sync with no changes should not check
+    modification times.
+    """
+    if not _CAN_WATCH: return
+
+    liveimport.configure(watch=True)
+    liveimport.register(globals(),"import mod1, mod6")
+    liveimport.sync()
+
+    def fake_stat(x):
+        raise OSError()
+
+    try:
+        liveimport._core.stat = fake_stat
+        liveimport.sync()
+    finally:
+        liveimport._core.stat = os.stat
+
+
+def test_watch_deleted():
+    """
+    Deleting and restoring a watched module should behave as without watching.
+    """
+    liveimport.configure(watch=True)
+    liveimport.register(globals(),"import mod1")
+    mod1_tag = get_tag("mod1")
+
+    touch_module("mod1")
+
+    with deleted_module("mod1"):
+        reload_clear()
+        liveimport.sync(observer=reload_observe)
+        reload_expect()
+
+    reload_clear()
+    liveimport.sync(observer=reload_observe)
+    reload_expect("mod1")
+    expect_tag("mod1",next_tag(mod1_tag))
+
+
+def test_watch_moved_dir():
+    """
+    Moving away and restoring a watched directory should not lose
+    modifications.
+    """
+    liveimport.configure(watch=True)
+    liveimport.register(globals(),"from altpkg import amod1")
+    amod1_tag = get_tag("altpkg.amod1")
+
+    dir = root() + "/altpkg"
+    os.rename(dir, dir + ".MOVED")
+    try:
+        liveimport.sync()
+    finally:
+        os.rename(dir + ".MOVED", dir)
+
+    liveimport.sync()
+    touch_module("altpkg.amod1")
+    liveimport.sync()
+
+    expect_tag("altpkg.amod1",next_tag(amod1_tag))
+
+
+def test_watch_limit():
+    """
+    If the watch limit is exhausted, LiveImport should revert to polling.
+    """
+    def fake_watch(self, file, key):
+        raise OSError(28,"No space left on device")
+
+    save_watch = _Watcher.watch
+    try:
+        _Watcher.watch = fake_watch
+        liveimport.configure(watch=True)
+        liveimport.register(globals(),"import mod1")
+    finally:
+        _Watcher.watch = save_watch
+
+    assert liveimport._core._WATCHER is None
+
+    mod1_tag = get_tag("mod1")
+    touch_module("mod1")
+    liveimport.sync()
+    expect_tag("mod1",next_tag(mod1_tag))
+
+
+def test_watch_overflow():
+    """
+    If the watcher loses events, LiveImport should check every module.
+    """
+    if not _CAN_WATCH: return
+
+    liveimport.configure(watch=True)
+    liveimport.register(globals(),"import mod1")
+    liveimport.sync()
+    mod1_tag = get_tag("mod1")
+
+    watcher = liveimport._core._WATCHER
+    assert watcher is not None
+
+    touch_module("mod1")
+    watcher.changes()  # Discard the event
+
+    save_changes = _Watcher.changes
+    try:
+        _Watcher.changes = lambda self: None
+        liveimport.sync()
+    finally:
+        _Watcher.changes = save_changes
+
+    expect_tag("mod1",next_tag(mod1_tag))
+
+
+def test_watch_disable():
+    """
+    Disabling watching should revert to polling.
+    """
+    liveimport.configure(watch=True)
+    liveimport.register(globals(),"import mod1")
+    liveimport.configure(watch=False)
+
+    assert liveimport._core._WATCHER is None
+
+    mod1_tag = get_tag("mod1")
+    touch_module("mod1")
+    liveimport.sync()
+    expect_tag("mod1",next_tag(mod1_tag))
+
+
+def test_watch_unavailable():
+    """
+    Where watching is unavailable, LiveImport should poll.
+    """
+    save_libc, save_platform = liveimport._watch._LIBC, sys.platform
+    try:
+        liveimport._watch._LIBC = None
+        sys.platform = "unwatchable"
+        liveimport.configure(watch=True)
+    finally:
+        liveimport._watch._LIBC, sys.platform = save_libc, save_platform
+
+    assert liveimport._core._WATCHER is None
+
+    liveimport.register(globals(),"import mod1")
+    mod1_tag = get_tag("mod1")
+    touch_module("mod1")
+    liveimport.sync()
+    expect_tag("mod1",next_tag(mod1_tag))
+
+
+def test_watch_failure():
+    """
+    If reading changes from the watcher fails, LiveImport should revert to
+    polling.
+    """
+    if not _CAN_WATCH: return
+
+    liveimport.configure(watch=True)
+    liveimport.register(globals(),"import mod1")
+    liveimport.sync()
+    mod1_tag = get_tag("mod1")
+
+    def fake_changes(self):
+        raise OSError(9,"Bad file descriptor")
+
+    touch_module("mod1")
+    save_changes = _Watcher.changes
+    try:
+        _Watcher.changes = fake_changes
+        liveimport.sync()
+    finally:
+        _Watcher.changes = save_changes
+
+    assert liveimport._core._WATCHER is None
+    expect_tag("mod1",next_tag(mod1_tag))
+
+
+def test_watcher_paths():
+    """
+    A watcher should report changes made through symbolic links, always
+    report files in directories it cannot watch, and raise errors other than
+    missing directories.
+    """
+    if not _CAN_WATCH: return
+
+    watcher = _Watcher()
+    try:
+        with (tempfile.TemporaryDirectory() as dir1,
+              tempfile.TemporaryDirectory() as dir2):
+            target = os.path.join(dir1,"target.py")
+            link   = os.path.join(dir2,"link.py")
+            open(target,"w").close()
+            os.symlink(target,link)
+
+            missing = os.path.join(dir2,"missing","mod.py")
+            watcher.watch(link,"link")
+            watcher.watch(missing,"missing")
+            assert watcher.changes() == [ "missing" ]
+
+            os.utime(target)
+            assert sorted(watcher.changes()) == [ "link", "missing" ]
+
+            try:
+                watcher.watch(os.path.join(dir2,"x"*300,"mod.py"),"long")
+                error = None
+            except OSError as ex:
+                error = ex
+            assert error is not None
+    finally:
+        watcher.close()
+
+
+def test_watcher_overflow():
+    """
+    A watcher should report lost events when its event queue overflows.
+    """
+    if not _CAN_WATCH: return
+
+    watcher = _Watcher()
+    try:
+        with tempfile.TemporaryDirectory() as dir:
+            files = [ os.path.join(dir,name) for name in ("a.py", "b.py") ]
+            for file in files:
+                open(file,"w").close()
+                watcher.watch(file,file)
+            with open("/proc/sys/fs/inotify/max_queued_events") as f:
+                limit = int(f.read())
+            for _ in range(limit // 2 + 1):
+                for file in files:
+                    os.utime(file)
+            assert watcher.changes() is None
+            assert watcher.changes() == []
+    finally:
+        watcher.close()
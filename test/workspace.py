@@ -2,6 +2,8 @@
 # Workspace tests.
 #
 
+import sys
+import site
 from os import PathLike
 from pathlib import Path
 
@@ -18,15 +20,19 @@ is_registered = is_registered_fn(globals())
 # imported modules cause reloads.  _test() registers "import mod6" and nothing
 # else.  Module mod6 imports A, pkg.smod1 and altpkg.amod1.  The public tests
 # then choose a worksapce configuration and specify which of A, smod1, and
-# amod1 are in the workspace.
+# amod1 are in the workspace.  A is in import cycle A->C->E->A, so when it
+# reloads, so do C and E.
 #
 
 def _test(directories:list[str|PathLike],
           includes_A=True,
           includes_smod1=True,
-          includes_amod1=True):
+          includes_amod1=True,
+          exclude:list[str]|None=None,
+          exclude_environment=True):
 
-    liveimport.workspace(*directories)
+    liveimport.workspace(*directories,exclude=exclude,
+                         exclude_environment=exclude_environment)
     liveimport.register(globals(),"import mod6")
 
     assert is_registered("mod6")
@@ -43,7 +49,7 @@ def _test(directories:list[str|PathLike],
     touch_module("altpkg.amod1")
 
     expected_list = []
-    if includes_A    : expected_list.append('A')
+    if includes_A    : expected_list.extend(('E','C','A'))
     if includes_smod1: expected_list.append('pkg.smod1')
     if includes_amod1: expected_list.append('altpkg.amod1')
     if len(expected_list) > 0: expected_list.append('mod6')
@@ -193,4 +199,131 @@ def test_path_subdirs():
     _test([Path(root()+"/pkg"),Path(root()+"/altpkg")],
           includes_A=False,
           includes_smod1=True,
-          includes_amod1=True)
\ No newline at end of file
+          includes_amod1=True)
+
+def test_membership():
+    """
+    A file is in the workspace only if it is under a workspace directory,
+    not merely if its path starts with a workspace directory's path, and
+    changing the workspace should change prior results.
+    """
+    from liveimport._workspace import _in_workspace
+
+    liveimport.workspace(root()+"/pkg")
+
+    assert _in_workspace(root()+"/pkg/smod1.py")
+    assert _in_workspace(root()+"/pkg/subpkg/ssmod1.py")
+    assert _in_workspace(root()+"/pkg/../pkg/smod1.py")
+    assert not _in_workspace(root()+"/pkgx/smod1.py")
+    assert not _in_workspace(root()+"/altpkg/amod1.py")
+
+    liveimport.workspace(root()+"/altpkg")
+
+    assert not _in_workspace(root()+"/pkg/smod1.py")
+    assert _in_workspace(root()+"/altpkg/amod1.py")
+
+    liveimport.workspace("/")
+
+    assert _in_workspace(root()+"/pkg/smod1.py")
+
+
+def test_exclude():
+    """
+    Directories with names matching exclusion patterns should be excluded.
+    """
+    _test([root()],
+          includes_A=True,
+          includes_smod1=False,
+          includes_amod1=True,
+          exclude=["pkg"])
+
+
+def test_exclude_glob():
+    """
+    Exclusion patterns are glob patterns.
+    """
+    _test([root()],
+          includes_A=True,
+          includes_smod1=False,
+          includes_amod1=False,
+          exclude=["*pkg"])
+
+
+def test_exclude_nested():
+    """
+    Exclusion patterns should only apply below workspace directories.
+    """
+    _test([root()+"/pkg",root()+"/altpkg"],
+          includes_A=False,
+          includes_smod1=True,
+          includes_amod1=True,
+          exclude=["pkg"])
+
+
+def test_exclude_environment():
+    """
+    By default, the Python installation directory should be excluded if it is
+    inside a workspace directory, even if patterns are given, unless that is
+    turned off.
+    """
+    save_prefix = sys.prefix
+    sys.prefix = root()+"/altpkg"
+    try:
+        _test([root()],
+              includes_A=True,
+              includes_smod1=True,
+              includes_amod1=False)
+        liveimport._clear_all_state()
+        _test([root()],
+              includes_A=True,
+              includes_smod1=True,
+              includes_amod1=False,
+              exclude=[])
+        liveimport._clear_all_state()
+        _test([root()],
+              includes_A=True,
+              includes_smod1=True,
+              includes_amod1=True,
+              exclude_environment=False)
+    finally:
+        sys.prefix = save_prefix
+
+
+def test_exclude_environment_without_site():
+    """
+    Where site.getsitepackages() is unavailable, as in some virtual
+    environments, the Python installation directory and the user site
+    directory should still be excluded.
+    """
+    save_prefix, save_getsitepackages = sys.prefix, site.getsitepackages
+    save_getusersitepackages = site.getusersitepackages
+    del site.getsitepackages, site.getusersitepackages
+    try:
+        sys.prefix = root()+"/altpkg"
+        _test([root()],
+              includes_A=True,
+              includes_smod1=True,
+              includes_amod1=False)
+
+        sys.prefix = save_prefix
+        site.getusersitepackages = lambda: root()+"/altpkg"
+        _test([root()],
+              includes_A=True,
+              includes_smod1=True,
+              includes_amod1=False)
+    finally:
+        sys.prefix, site.getsitepackages = save_prefix, save_getsitepackages
+        site.getusersitepackages = save_getusersitepackages
+
+
+def test_exclude_string():
+    """
+    Exclusion patterns must be given as a collection, not a string.
+    """
+    try:
+        liveimport.workspace(root(),exclude=".venv")
+        error = None
+    except ValueError as ex:
+        error = ex
+
+    assert error is not None